@@ -5,16 +5,20 @@ import sys
 # Force Qt to use X11 backend instead of Wayland
 os.environ["QT_QPA_PLATFORM"] = "xcb"
 
-from src.installer import PolarisInstaller
-
 
 def main():
     # Ensure we're in the correct directory
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
-    
+
+    # Headless installs never import Qt
+    if "--headless" in sys.argv[1:]:
+        from src.installation import main as install_main
+        return install_main(sys.argv[1:])
+
     # Create and run the installer application
+    from src.installer import PolarisInstaller
     app = PolarisInstaller()
-    app.run()
+    return app.run()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
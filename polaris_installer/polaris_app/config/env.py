@@ -9,3 +9,18 @@ if os.name == "nt":
     VENV_PYTHON = os.path.join(INSTALL_DIR, "venv", "Scripts", "python.exe")
     VENV_PIP = os.path.join(INSTALL_DIR, "venv", "Scripts", "pip.exe")
     VENV_BIN = os.path.join(INSTALL_DIR, "venv", "Scripts")
+
+# Host telemetry sampling; capacity is the number of samples kept per metric
+TELEMETRY_INTERVAL = float(os.environ.get("POLARIS_TELEMETRY_INTERVAL", "1.0"))
+TELEMETRY_CAPACITY = int(os.environ.get("POLARIS_TELEMETRY_CAPACITY", "3600"))
+
+# Comma-separated public IP providers (HTTP URLs or stun:host:port); built-in list when unset
+PUBLIC_IP_PROVIDERS = [provider.strip() for provider in os.environ.get("POLARIS_PUBLIC_IP_PROVIDERS", "").split(",")
+                       if provider.strip()] or None
+
+# Cached metagraphs are re-synced once they are estimated to be this many blocks old
+METAGRAPH_MAX_AGE_BLOCKS = int(os.environ.get("POLARIS_METAGRAPH_MAX_AGE_BLOCKS", "100"))
+
+# Resource heartbeat endpoint; publishing is disabled when unset
+HEARTBEAT_URL = os.environ.get("POLARIS_HEARTBEAT_URL")
+HEARTBEAT_INTERVAL = float(os.environ.get("POLARIS_HEARTBEAT_INTERVAL", "60"))
@@ -0,0 +1,292 @@
+"""
+Resource heartbeat publisher for Polaris Miner Node
+
+The full resource document is sent once; after that every heartbeat only
+carries a JSON Patch (RFC 6902) of the fields that changed since the last
+accepted message. Messages go over one keep-alive HTTP connection and are
+spooled to disk while the endpoint is unreachable, then replayed in order.
+"""
+import json
+import os
+import threading
+import uuid
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+POLARIS_HOME = Path.home() / '.polaris'
+SPOOL_FILE = POLARIS_HOME / 'heartbeat_spool.jsonl'
+NODE_ID_FILE = POLARIS_HOME / 'node_id'
+
+DEFAULT_INTERVAL = 60
+REQUEST_TIMEOUT = 10
+MAX_SPOOLED = 1000
+# Sequence numbers are reserved on disk in blocks so the counter is not rewritten every heartbeat
+SEQUENCE_BLOCK = 100
+
+
+def _escape(key):
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token):
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def json_diff(old, new, path=""):
+    """JSON Patch operations that turn old into new"""
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(json_diff(old[key], value, child))
+        return ops
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        ops = []
+        for index, (old_item, new_item) in enumerate(zip(old, new)):
+            ops.extend(json_diff(old_item, new_item, f"{path}/{index}"))
+        return ops
+    if old == new and type(old) is type(new):
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(document, ops):
+    """Apply operations produced by json_diff to a copy of document"""
+    document = json.loads(json.dumps(document))
+    for op in ops:
+        if op["path"] == "":
+            document = op["value"]
+            continue
+        tokens = [_unescape(token) for token in op["path"].split("/")[1:]]
+        parent = document
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        key = int(tokens[-1]) if isinstance(parent, list) else tokens[-1]
+        if op["op"] == "remove":
+            del parent[key]
+        else:
+            parent[key] = op["value"]
+    return document
+
+
+def load_node_id(path=NODE_ID_FILE):
+    """Stable identifier for this node, created on first use"""
+    path = Path(path)
+    try:
+        return path.read_text().strip()
+    except OSError:
+        node_id = str(uuid.uuid4())
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(node_id)
+        return node_id
+
+
+class HeartbeatPublisher:
+    """
+    Publishes the resource document to a heartbeat endpoint. validator, when
+    given, is called with every document before it is queued and should raise
+    when the document must not be published.
+    """
+
+    def __init__(self, url, document_provider, node_id=None, interval=DEFAULT_INTERVAL,
+                 spool_path=SPOOL_FILE, session=None, timeout=REQUEST_TIMEOUT, max_spooled=MAX_SPOOLED,
+                 validator=None):
+        self.url = url
+        self.document_provider = document_provider
+        self.validator = validator
+        self.node_id = node_id or load_node_id()
+        self.interval = interval
+        self.spool_path = Path(spool_path) if spool_path else None
+        self.timeout = timeout
+        self.max_spooled = max_spooled
+        self.session = session or self._create_session()
+        self.lock = threading.Lock()
+        self.published = None
+        self.resync = False
+        self.rejected = False
+        self.spool = deque(self._load_spool())
+        self.saved_seqs = [message["seq"] for message in self.spool]
+        # Sequence numbers keep increasing across restarts so replayed messages never collide with new ones
+        self.reserved_sequence = self._load_sequence()
+        self.sequence = max([self.reserved_sequence] + self.saved_seqs)
+        self.running = False
+        self.stopped = threading.Event()
+        self.thread = None
+        self.callbacks = {
+            "on_log": None,
+            "on_status_change": None
+        }
+
+    def register_callback(self, event, callback):
+        """Register a callback for the specified event"""
+        if event in self.callbacks:
+            self.callbacks[event] = callback
+
+    def _log(self, message):
+        if self.callbacks["on_log"]:
+            timestamp = datetime.now().strftime("%H:%M:%S")
+            self.callbacks["on_log"](f"[{timestamp}] {message}")
+
+    def _update_status(self, status):
+        if self.callbacks["on_status_change"]:
+            self.callbacks["on_status_change"](status)
+
+    def _create_session(self):
+        # One pooled connection that stays open between heartbeats
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=0)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _load_spool(self):
+        if not self.spool_path:
+            return []
+        try:
+            with open(self.spool_path, "r") as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except (OSError, json.JSONDecodeError):
+            return []
+
+    def _load_sequence(self):
+        if not self.spool_path:
+            return 0
+        try:
+            return int(self.spool_path.with_suffix(".seq").read_text())
+        except (OSError, ValueError):
+            return 0
+
+    def _save_spool(self):
+        """Write the spool and the reserved sequence number, each only when it changed"""
+        if not self.spool_path:
+            return
+        # Messages never change once queued, so their sequence numbers identify the spool contents
+        seqs = [message["seq"] for message in self.spool]
+        if seqs != self.saved_seqs:
+            self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.spool_path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                for message in self.spool:
+                    f.write(json.dumps(message) + "\n")
+            os.replace(tmp_path, self.spool_path)
+            self.saved_seqs = seqs
+        if self.sequence >= self.reserved_sequence:
+            self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+            self.reserved_sequence = self.sequence + SEQUENCE_BLOCK
+            self.spool_path.with_suffix(".seq").write_text(str(self.reserved_sequence))
+
+    def _next_message(self, document):
+        self.sequence += 1
+        if self.published is None:
+            return {"node_id": self.node_id, "seq": self.sequence, "type": "full", "document": document}
+        return {"node_id": self.node_id, "seq": self.sequence, "base_seq": self.sequence - 1,
+                "type": "patch", "patch": json_diff(self.published, document)}
+
+    def _send(self, message):
+        """True when the message is done with (accepted or dropped), False when it should be retried later"""
+        try:
+            response = self.session.post(self.url, json=message, timeout=self.timeout)
+        except requests.RequestException:
+            return False
+        if 200 <= response.status_code < 300:
+            return True
+        if response.status_code < 500 and message["type"] == "patch":
+            # The endpoint does not hold the document this patch applies to; start over with a full one
+            self._log(f"Heartbeat endpoint rejected a patch ({response.status_code}), resending the full document")
+            self.resync = True
+            return True
+        if response.status_code < 500 and response.status_code != 409:
+            # Resending the same document cannot succeed; drop it instead of retrying forever
+            self._log(f"Heartbeat endpoint rejected the full document ({response.status_code}), dropping it")
+            self.rejected = True
+            return True
+        self._log(f"Heartbeat endpoint returned {response.status_code}")
+        return False
+
+    def _enqueue(self, document):
+        self.spool.append(self._next_message(document))
+        # Patches chain on each other, so later ones are diffed against this even before it is delivered
+        self.published = document
+
+    def _flush(self):
+        while self.spool and not (self.resync or self.rejected):
+            if not self._send(self.spool[0]):
+                return
+            self.spool.popleft()
+
+    def _reset(self):
+        self.spool.clear()
+        self.published = None
+
+    def publish_once(self):
+        """Send spooled messages and then the current document. Returns True when everything was delivered"""
+        with self.lock:
+            document = self.document_provider()
+            if self.validator:
+                self.validator(document)
+            self._enqueue(document)
+            self._flush()
+
+            if self.resync:
+                self.resync = False
+                self._reset()
+                self._enqueue(document)
+                self._flush()
+            if self.rejected:
+                # Everything queued after the dropped document patches it; the next heartbeat starts over
+                self.rejected = False
+                self._reset()
+                self._save_spool()
+                self._update_status("Rejected")
+                return False
+            if len(self.spool) > self.max_spooled:
+                # Too far behind to replay; the next heartbeat carries the full document
+                self._reset()
+            self._save_spool()
+
+            if self.spool:
+                self._update_status("Offline")
+                self._log(f"Heartbeat endpoint unreachable, {len(self.spool)} message(s) spooled")
+                return False
+            self._update_status("Online")
+            return True
+
+    def _run(self):
+        while not self.stopped.is_set():
+            try:
+                self.publish_once()
+            except Exception as e:
+                self._log(f"Heartbeat failed: {str(e)}")
+            self.stopped.wait(self.interval)
+
+    def start(self):
+        """Start publishing on a background thread"""
+        if self.running:
+            return False
+        self.running = True
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self._run)
+        self.thread.daemon = True
+        self.thread.start()
+        return True
+
+    def stop(self):
+        """Stop publishing"""
+        if not self.running:
+            return False
+        self.running = False
+        self.stopped.set()
+        if self.thread:
+            self.thread.join(timeout=5)
+            self.thread = None
+        return True
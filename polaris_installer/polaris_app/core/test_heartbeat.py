@@ -0,0 +1,197 @@
+"""
+Tests for heartbeat JSON Patch encoding, spooling and resync, using an
+injected session in place of the HTTP transport.
+"""
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import requests
+
+from core.heartbeat import HeartbeatPublisher, apply_patch, json_diff
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeSession:
+    """Records posted messages and answers with queued status codes (None raises), then 200"""
+
+    def __init__(self, statuses=()):
+        self.statuses = list(statuses)
+        self.messages = []
+
+    def post(self, url, json=None, timeout=None):
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status is None:
+            raise requests.ConnectionError("endpoint unreachable")
+        self.messages.append(json)
+        return FakeResponse(status)
+
+
+class JsonPatchTest(unittest.TestCase):
+    def assertRoundTrip(self, old, new):
+        self.assertEqual(apply_patch(old, json_diff(old, new)), new)
+
+    def test_equal_documents_have_no_operations(self):
+        self.assertEqual(json_diff({"a": [1, {"b": 2}]}, {"a": [1, {"b": 2}]}), [])
+
+    def test_changed_nested_value_is_one_replace(self):
+        old = {"compute_resources": [{"ram": "16 GB", "cpu": {"cores": 8}}]}
+        new = {"compute_resources": [{"ram": "32 GB", "cpu": {"cores": 8}}]}
+        self.assertEqual(json_diff(old, new),
+                         [{"op": "replace", "path": "/compute_resources/0/ram", "value": "32 GB"}])
+        self.assertRoundTrip(old, new)
+
+    def test_added_and_removed_keys(self):
+        old = {"keep": 1, "drop": 2}
+        new = {"keep": 1, "new": 3}
+        self.assertEqual(json_diff(old, new), [{"op": "remove", "path": "/drop"},
+                                               {"op": "add", "path": "/new", "value": 3}])
+        self.assertRoundTrip(old, new)
+
+    def test_keys_are_escaped(self):
+        old = {"a/b": 1, "c~d": 1}
+        new = {"a/b": 2, "c~d": 2}
+        self.assertEqual([op["path"] for op in json_diff(old, new)], ["/a~1b", "/c~0d"])
+        self.assertRoundTrip(old, new)
+
+    def test_resized_list_is_replaced_whole(self):
+        self.assertEqual(json_diff({"ports": ["22"]}, {"ports": ["22", "80"]}),
+                         [{"op": "replace", "path": "/ports", "value": ["22", "80"]}])
+
+    def test_type_change_is_a_replace(self):
+        self.assertEqual(json_diff({"cores": 1}, {"cores": 1.0}),
+                         [{"op": "replace", "path": "/cores", "value": 1.0}])
+
+    def test_apply_patch_leaves_the_input_alone(self):
+        old = {"a": {"b": 1}}
+        apply_patch(old, [{"op": "replace", "path": "/a/b", "value": 2}])
+        self.assertEqual(old, {"a": {"b": 1}})
+
+
+class HeartbeatPublisherTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.spool_path = Path(self.directory.name) / "spool.jsonl"
+        self.document = {"hostname": "node", "ram": "16 GB"}
+
+    def publisher(self, session, **kwargs):
+        return HeartbeatPublisher("http://heartbeat.invalid", lambda: dict(self.document), node_id="node-1",
+                                  spool_path=self.spool_path, session=session, **kwargs)
+
+    def test_full_document_then_patches(self):
+        session = FakeSession()
+        publisher = self.publisher(session)
+        self.assertTrue(publisher.publish_once())
+        self.document["ram"] = "32 GB"
+        self.assertTrue(publisher.publish_once())
+
+        full, patch = session.messages
+        self.assertEqual((full["type"], full["document"]), ("full", {"hostname": "node", "ram": "16 GB"}))
+        self.assertEqual((patch["type"], patch["base_seq"]), ("patch", full["seq"]))
+        self.assertEqual(apply_patch(full["document"], patch["patch"]), self.document)
+
+    def test_unreachable_endpoint_spools_and_replays_in_order(self):
+        session = FakeSession([None, None])
+        publisher = self.publisher(session)
+        self.assertFalse(publisher.publish_once())
+        self.document["ram"] = "32 GB"
+        self.assertFalse(publisher.publish_once())
+        self.assertEqual(len(publisher.spool), 2)
+
+        self.assertTrue(publisher.publish_once())
+        self.assertEqual([message["type"] for message in session.messages], ["full", "patch", "patch"])
+        seqs = [message["seq"] for message in session.messages]
+        self.assertEqual(seqs, sorted(seqs))
+        self.assertEqual(len(publisher.spool), 0)
+
+    def test_server_errors_are_retried(self):
+        session = FakeSession([503])
+        publisher = self.publisher(session)
+        self.assertFalse(publisher.publish_once())
+        self.assertTrue(publisher.publish_once())
+        self.assertEqual(session.messages[-2]["type"], "full")
+        self.assertEqual(session.messages[-2]["seq"], session.messages[0]["seq"])
+
+    def test_rejected_patch_resyncs_with_a_full_document(self):
+        session = FakeSession([200, 409])
+        publisher = self.publisher(session)
+        publisher.publish_once()
+        self.document["ram"] = "32 GB"
+        self.assertTrue(publisher.publish_once())
+        self.assertEqual([message["type"] for message in session.messages], ["full", "patch", "full"])
+        self.assertEqual(session.messages[-1]["document"], self.document)
+
+    def test_rejected_full_document_is_dropped(self):
+        session = FakeSession([422])
+        publisher = self.publisher(session)
+        self.assertFalse(publisher.publish_once())
+        self.assertEqual(len(publisher.spool), 0)
+        # Nothing was accepted, so the next heartbeat starts over with a full document
+        self.assertTrue(publisher.publish_once())
+        self.assertEqual([message["type"] for message in session.messages], ["full", "full"])
+
+    def test_conflicting_full_document_is_retried(self):
+        session = FakeSession([409])
+        publisher = self.publisher(session)
+        self.assertFalse(publisher.publish_once())
+        self.assertEqual(len(publisher.spool), 1)
+
+    def test_spool_and_sequence_survive_a_restart(self):
+        publisher = self.publisher(FakeSession([None]))
+        publisher.publish_once()
+        spooled = json.loads(self.spool_path.read_text())
+
+        session = FakeSession()
+        restarted = self.publisher(session)
+        self.assertEqual(list(restarted.spool), [spooled])
+        self.assertTrue(restarted.publish_once())
+        self.assertEqual(session.messages[0], spooled)
+        self.assertGreater(session.messages[-1]["seq"], spooled["seq"])
+
+    def test_sequence_never_repeats_after_a_restart(self):
+        session = FakeSession()
+        publisher = self.publisher(session)
+        publisher.publish_once()
+        publisher.publish_once()
+        restarted = self.publisher(session)
+        restarted.publish_once()
+        seqs = [message["seq"] for message in session.messages]
+        self.assertEqual(len(set(seqs)), len(seqs))
+        self.assertEqual(session.messages[-1]["type"], "full")
+
+    def test_unchanged_spool_is_not_rewritten(self):
+        publisher = self.publisher(FakeSession())
+        publisher.publish_once()
+        self.assertFalse(self.spool_path.exists())
+        seq_file = self.spool_path.with_suffix(".seq")
+        written = seq_file.stat().st_mtime_ns
+        for _ in range(5):
+            publisher.publish_once()
+        self.assertFalse(self.spool_path.exists())
+        self.assertEqual(seq_file.stat().st_mtime_ns, written)
+
+    def test_spool_overflow_starts_over(self):
+        publisher = self.publisher(FakeSession([None] * 3), max_spooled=2)
+        for _ in range(3):
+            publisher.publish_once()
+        self.assertEqual(len(publisher.spool), 0)
+        self.assertIsNone(publisher.published)
+
+    def test_invalid_document_is_not_queued(self):
+        def reject(document):
+            raise ValueError("missing compute_resources")
+        session = FakeSession()
+        publisher = self.publisher(session, validator=reject)
+        with self.assertRaises(ValueError):
+            publisher.publish_once()
+        self.assertEqual((session.messages, len(publisher.spool)), ([], 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
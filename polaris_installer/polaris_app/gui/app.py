@@ -1,13 +1,33 @@
 # gui/app.py
 from PySide6.QtWidgets import QMainWindow, QTabWidget
+from PySide6.QtCore import QTimer
 from PySide6.QtGui import QIcon
 import os
+import threading
+
+from config.env import HEARTBEAT_INTERVAL, HEARTBEAT_URL, TELEMETRY_CAPACITY, TELEMETRY_INTERVAL
+from core.heartbeat import HeartbeatPublisher
+from gui.utils.info_cache import get_system_info_cache
+from gui.utils.models import validate_host
+from gui.utils.telemetry import get_sampler
 
 # Import views
 from gui.views.dashboard import DashboardView
 from gui.views.settings import SettingsView
 from gui.views.about import AboutView
 
+# Give the window time to paint before the bittensor import competes for the GIL
+BITTENSOR_WARM_UP_DELAY_MS = 500
+
+def _warm_up_bittensor():
+    # bittensor_utils itself is imported here too, keeping it off the UI thread
+    from gui.utils.bittensor_utils import BITTENSOR_AVAILABLE, load_bittensor
+    if BITTENSOR_AVAILABLE:
+        try:
+            load_bittensor()
+        except Exception:
+            pass
+
 class PolarisApp(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -23,4 +43,24 @@ class PolarisApp(QMainWindow):
         
         # Create the dashboard as the central widget (no tabs in this version)
         self.dashboard = DashboardView()
-        self.setCentralWidget(self.dashboard)
\ No newline at end of file
+        self.setCentralWidget(self.dashboard)
+        
+        # Sample host telemetry for as long as the app runs
+        self.telemetry = get_sampler(TELEMETRY_INTERVAL, TELEMETRY_CAPACITY).start()
+        
+        # Publish the resource document when a heartbeat endpoint is configured
+        self.heartbeat = None
+        if HEARTBEAT_URL:
+            self.heartbeat = HeartbeatPublisher(HEARTBEAT_URL, lambda: get_system_info_cache().get()[0],
+                                                interval=HEARTBEAT_INTERVAL, validator=validate_host)
+            self.heartbeat.start()
+
+        self.bittensor_warm_up_scheduled = False
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.bittensor_warm_up_scheduled:
+            # The subnet step needs bittensor; load it in the background once the window is up
+            self.bittensor_warm_up_scheduled = True
+            QTimer.singleShot(BITTENSOR_WARM_UP_DELAY_MS,
+                              lambda: threading.Thread(target=_warm_up_bittensor, daemon=True).start())
\ No newline at end of file
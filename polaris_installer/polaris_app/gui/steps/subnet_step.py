@@ -2,17 +2,21 @@ import os
 import sys
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
-    QGroupBox, QScrollArea, QSizePolicy, QPushButton, QMessageBox, QProgressBar
+    QGroupBox, QScrollArea, QSizePolicy, QPushButton, QMessageBox, QProgressBar, QComboBox
 )
 from PySide6.QtCore import Qt, QRegularExpression, QTimer, QThread, Signal
 from PySide6.QtGui import QRegularExpressionValidator, QColor
 
 from gui.utils.bittensor_utils import (
     start_bittensor_miner, stop_bittensor_miner, 
-    is_bittensor_running, get_uid_from_hotkey, 
+    is_bittensor_running, get_hotkey_address, resolve_uids,
     BITTENSOR_AVAILABLE
 )
 
+# (label, network) choices; mainnet runs on the fixed Polaris subnet
+NETWORKS = [("Mainnet (finney)", "finney"), ("Testnet (test)", "test")]
+MAINNET_NETUID = "49"
+
 class MinerThread(QThread):
     """Thread for executing miner operations without blocking the UI"""
     result_signal = Signal(dict)
@@ -42,6 +46,20 @@ class MinerThread(QThread):
             elif self.operation == "check_miner_status":
                 is_running = is_bittensor_running()
                 result = {"success": True, "is_running": is_running}
+
+            elif self.operation == "verify_registration":
+                success, address = get_hotkey_address(self.params.get("wallet_name"),
+                                                      self.params.get("hotkey", "default"))
+                if not success:
+                    result = {"success": False, "error": address}
+                else:
+                    target = (self.params.get("network", "finney"), self.params.get("netuid", 49), address)
+                    for resolved in resolve_uids([target]):
+                        if resolved["uid"] is not None:
+                            result = dict(resolved, success=True)
+                        else:
+                            result = {"success": False,
+                                      "error": resolved.get("error", "Hotkey not registered on subnet")}
                 
         except Exception as e:
             result = {"success": False, "message": f"Operation error: {str(e)}"}
@@ -52,6 +70,7 @@ class SubnetStep(QWidget):
     def __init__(self):
         super().__init__()
         self.data = {}
+        self.network = "finney"
 
         # Main layout
         main_layout = QVBoxLayout(self)
@@ -149,11 +168,16 @@ class SubnetStep(QWidget):
         form_layout.addWidget(warning_label)
         
         # Other fields
+        self.network_input = QComboBox()
+        for label, network in NETWORKS:
+            self.network_input.addItem(label, network)
+        self.network_input.currentIndexChanged.connect(self.network_changed)
+
         self.uid_input = QLineEdit()
         self.uid_input.setPlaceholderText("e.g., 49")
         self.uid_input.setStyleSheet(input_style)
         self.uid_input.setValidator(numeric_validator)
-        self.uid_input.setText("49")  # Set default to mainnet
+        self.uid_input.setText(MAINNET_NETUID)  # Set default to mainnet
         self.uid_input.setReadOnly(True)
         self.uid_input.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
 
@@ -164,6 +188,8 @@ class SubnetStep(QWidget):
         self.miner_uid_input.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
 
         # Add remaining fields to form
+        form_layout.addWidget(QLabel("Network:"))
+        form_layout.addWidget(self.network_input)
         form_layout.addWidget(QLabel("Subnet UID:"))
         form_layout.addWidget(self.uid_input)
         form_layout.addWidget(QLabel("Miner UID:"))
@@ -242,43 +268,53 @@ class SubnetStep(QWidget):
         hotkey = self.hotkey_input.text().strip()
         netuid = self.uid_input.text().strip()
         
-        if not coldkey or not hotkey:
-            QMessageBox.warning(self, "Verification Error", "Please enter both coldkey and hotkey names.")
+        if not coldkey or not hotkey or not netuid:
+            QMessageBox.warning(self, "Verification Error", "Please enter the coldkey and hotkey names and the subnet UID.")
+            return
+
+        if not BITTENSOR_AVAILABLE:
+            self.verify_status.setText("Bittensor not installed. Please install it first.")
+            self.verify_status.setStyleSheet("color: red;")
             return
             
         self.verify_status.setText("Verifying registration... Please wait.")
         self.verify_status.setStyleSheet("color: #666;")
         
-        # Create and start the thread
-        self.thread = MinerThread("check_miner_status")
-        self.thread.result_signal.connect(self.handle_verification_result)
-        self.thread.start()
+        # Look up the UID on a worker thread; the metagraph may need syncing
+        params = {"wallet_name": coldkey, "hotkey": hotkey, "netuid": int(netuid), "network": self.network}
+        self.verify_thread = MinerThread("verify_registration", params)
+        self.verify_thread.result_signal.connect(self.handle_verification_result)
+        self.verify_thread.start()
         
     def handle_verification_result(self, result):
         """Handle verification result"""
-        if not BITTENSOR_AVAILABLE:
-            self.verify_status.setText("Bittensor not installed. Please install it first.")
-            self.verify_status.setStyleSheet("color: red;")
-            return
-            
-        # Get the hotkey's UID
-        success, data = get_uid_from_hotkey(
-            self.hotkey_input.text().strip(), 
-            int(self.uid_input.text().strip()),
-            "finney"
-        )
-        
-        if success:
-            uid = data.get("uid")
+        if result["success"]:
+            uid = result.get("uid")
+            uids = result.get("uids") or [uid]
             self.miner_uid_input.setText(str(uid))
-            self.verify_status.setText(f"Registration verified! Miner UID: {uid}")
+            if len(uids) > 1:
+                self.verify_status.setText(f"Registration verified! Miner UIDs: {', '.join(map(str, uids))}")
+            else:
+                self.verify_status.setText(f"Registration verified! Miner UID: {uid}")
             self.verify_status.setStyleSheet("color: green; font-weight: bold;")
             self.start_button.setEnabled(True)
         else:
-            self.verify_status.setText(f"Verification failed: {data.get('error', 'Hotkey not registered on subnet')}")
+            self.verify_status.setText(f"Verification failed: {result.get('error', 'Hotkey not registered on subnet')}")
             self.verify_status.setStyleSheet("color: red;")
             self.start_button.setEnabled(False)
     
+    def network_changed(self, index):
+        """Switch networks; the subnet is fixed on mainnet and free to choose on testnet"""
+        self.network = self.network_input.itemData(index)
+        mainnet = self.network == "finney"
+        self.uid_input.setReadOnly(mainnet)
+        if mainnet:
+            self.uid_input.setText(MAINNET_NETUID)
+        # A verification on the other network does not carry over
+        self.miner_uid_input.clear()
+        self.verify_status.setText("")
+        self.start_button.setEnabled(False)
+
     def check_miner_status(self):
         """Check if the miner is running"""
         self.thread = MinerThread("check_miner_status")
@@ -335,7 +371,7 @@ class SubnetStep(QWidget):
                 "wallet_name": coldkey,
                 "hotkey": hotkey,
                 "netuid": int(netuid),
-                "network": "finney"
+                "network": self.network
             }
             
             self.thread = MinerThread("start_miner", params)
@@ -400,5 +436,5 @@ class SubnetStep(QWidget):
             "hotkey": self.hotkey_input.text().strip(),
             "netuid": self.uid_input.text().strip(),
             "miner_uid": self.miner_uid_input.text().strip(),
-            "network": "finney"  # Always mainnet
+            "network": self.network
         }
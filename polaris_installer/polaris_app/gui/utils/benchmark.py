@@ -0,0 +1,266 @@
+"""
+Hardware capability benchmark for the compute_resources spec.
+
+Measures CPU floating point throughput, memory bandwidth, disk sequential
+throughput and random read IOPS, and loopback TCP throughput. The compute
+kernels are NumPy-vectorized so the numbers reflect the hardware rather
+than the interpreter. Results are stored in ~/.polaris/benchmark.json
+together with a hardware fingerprint and reused until the fingerprint
+changes.
+"""
+import hashlib
+import json
+import os
+import platform
+import socket
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import psutil
+
+from gui.utils.gpu_inventory import get_gpu_inventory
+from gui.utils.storage import stored_data_dir
+
+BENCHMARK_VERSION = 1
+BENCHMARK_FILE = Path.home() / '.polaris' / 'benchmark.json'
+
+MATRIX_SIZE = 1024
+MEMORY_BUFFER_BYTES = 256 * 1024 * 1024
+DISK_FILE_BYTES = 256 * 1024 * 1024
+DISK_BLOCK_BYTES = 1024 * 1024
+RANDOM_READ_BYTES = 4096
+RANDOM_READ_SECONDS = 1.0
+NETWORK_BYTES = 512 * 1024 * 1024
+NETWORK_CHUNK_BYTES = 1024 * 1024
+# Repeat short kernels until at least this much time has passed
+MIN_KERNEL_SECONDS = 0.5
+
+
+def _cpu_model():
+    try:
+        with open("/proc/cpuinfo", "r") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+
+def benchmark_dir():
+    """
+    Directory on the volume miner data lives on, or the home directory
+    before one was chosen. Never the temp dir: it is often tmpfs, which
+    would measure RAM instead of the disk.
+    """
+    data_dir = stored_data_dir()
+    # The data directory may not exist yet; its parent always does
+    return data_dir.parent if data_dir is not None else Path.home()
+
+
+_fingerprints = {}
+
+
+def hardware_fingerprint(directory=None):
+    """
+    Hash of the hardware the benchmark depends on; changes when any of it
+    does. Computed once per process and directory, since it waits for the
+    GPU inventory.
+    """
+    directory = str(directory or benchmark_dir())
+    if directory not in _fingerprints:
+        _fingerprints[directory] = _compute_fingerprint(directory)
+    return _fingerprints[directory]
+
+
+def _compute_fingerprint(directory):
+    identity = {
+        "cpu": _cpu_model(),
+        "cores": psutil.cpu_count(logical=False),
+        "threads": psutil.cpu_count(logical=True),
+        "memory": psutil.virtual_memory().total,
+        "gpus": [(gpu["pci_bus_id"], gpu["model"]) for gpu in get_gpu_inventory().get()],
+        "disk": os.stat(directory).st_dev,
+        "version": BENCHMARK_VERSION,
+    }
+    return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()
+
+
+def _timed(kernel):
+    """Run kernel until MIN_KERNEL_SECONDS have passed; returns (runs, seconds)"""
+    runs = 0
+    started = time.perf_counter()
+    while True:
+        kernel()
+        runs += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= MIN_KERNEL_SECONDS:
+            return runs, elapsed
+
+
+def benchmark_cpu(size=MATRIX_SIZE):
+    """Double precision matrix multiply throughput in GFLOP/s"""
+    rng = np.random.default_rng(0)
+    a = rng.random((size, size))
+    b = rng.random((size, size))
+    out = np.empty((size, size))
+    runs, elapsed = _timed(lambda: np.matmul(a, b, out=out))
+    return {"gflops": round(2 * size ** 3 * runs / elapsed / 1e9, 2)}
+
+
+def benchmark_memory(nbytes=MEMORY_BUFFER_BYTES):
+    """Copy bandwidth in GB/s, counting both the read and the write"""
+    source = np.ones(nbytes // 8, dtype=np.float64)
+    target = np.empty_like(source)
+    runs, elapsed = _timed(lambda: np.copyto(target, source))
+    return {"copy_gbps": round(2 * source.nbytes * runs / elapsed / 1e9, 2)}
+
+
+def _drop_cache(fd):
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def _read_at(fd, offset):
+    if hasattr(os, "pread"):
+        return os.pread(fd, RANDOM_READ_BYTES, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, RANDOM_READ_BYTES)
+
+
+def benchmark_disk(directory=None, nbytes=DISK_FILE_BYTES):
+    """
+    Sequential write/read throughput in MB/s and 4 KiB random read IOPS on
+    the volume holding directory (benchmark_dir() by default). The page
+    cache is dropped for the test file where the platform allows it.
+    """
+    directory = directory or benchmark_dir()
+    block = np.random.default_rng(0).integers(0, 256, DISK_BLOCK_BYTES, dtype=np.uint8).tobytes()
+    blocks = max(nbytes // DISK_BLOCK_BYTES, 1)
+    fd, path = tempfile.mkstemp(prefix="polaris-bench-", dir=directory)
+    try:
+        started = time.perf_counter()
+        for _ in range(blocks):
+            os.write(fd, block)
+        os.fsync(fd)
+        write_seconds = time.perf_counter() - started
+
+        _drop_cache(fd)
+        os.lseek(fd, 0, os.SEEK_SET)
+        started = time.perf_counter()
+        while os.read(fd, DISK_BLOCK_BYTES):
+            pass
+        read_seconds = time.perf_counter() - started
+
+        _drop_cache(fd)
+        offsets = np.random.default_rng(1).integers(0, blocks * DISK_BLOCK_BYTES // RANDOM_READ_BYTES,
+                                                     1 << 16) * RANDOM_READ_BYTES
+        reads = 0
+        started = time.perf_counter()
+        deadline = started + RANDOM_READ_SECONDS
+        for offset in offsets.tolist():
+            _read_at(fd, offset)
+            reads += 1
+            if reads % 256 == 0 and time.perf_counter() >= deadline:
+                break
+        random_seconds = time.perf_counter() - started
+    finally:
+        os.close(fd)
+        os.remove(path)
+
+    total = blocks * DISK_BLOCK_BYTES
+    return {
+        "seq_write_mbps": round(total / write_seconds / 1e6, 1),
+        "seq_read_mbps": round(total / read_seconds / 1e6, 1),
+        "random_read_iops": int(reads / random_seconds),
+    }
+
+
+def benchmark_network(nbytes=NETWORK_BYTES):
+    """Loopback TCP throughput in Gbit/s; bounds what the network stack can push"""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    chunk = b"\0" * NETWORK_CHUNK_BYTES
+
+    def send():
+        with socket.create_connection(server.getsockname()) as client:
+            sent = 0
+            while sent < nbytes:
+                client.sendall(chunk)
+                sent += len(chunk)
+
+    sender = threading.Thread(target=send, daemon=True)
+    sender.start()
+    connection, _ = server.accept()
+    received = 0
+    buffer = bytearray(NETWORK_CHUNK_BYTES)
+    started = time.perf_counter()
+    with connection:
+        while True:
+            count = connection.recv_into(buffer)
+            if not count:
+                break
+            received += count
+    elapsed = time.perf_counter() - started
+    server.close()
+    sender.join()
+    return {"loopback_gbps": round(received * 8 / elapsed / 1e9, 2)}
+
+
+# (name, benchmark, takes the target directory)
+BENCHMARKS = [
+    ("cpu", benchmark_cpu, False),
+    ("memory", benchmark_memory, False),
+    ("disk", benchmark_disk, True),
+    ("network", benchmark_network, False),
+]
+
+
+def run_benchmarks(directory=None, progress=None, save=True):
+    """
+    Run every benchmark and return the result dict. progress(name, index,
+    total) is called before each one. A benchmark that fails is recorded as
+    None instead of aborting the suite.
+    """
+    directory = directory or benchmark_dir()
+    results = {}
+    for index, (name, benchmark, takes_directory) in enumerate(BENCHMARKS):
+        if progress:
+            progress(name, index, len(BENCHMARKS))
+        try:
+            results[name] = benchmark(directory) if takes_directory else benchmark()
+        except Exception:
+            results[name] = None
+    benchmark_result = {
+        "measured_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "fingerprint": hardware_fingerprint(directory),
+        "results": results,
+    }
+    if save:
+        save_benchmark(benchmark_result)
+    return benchmark_result
+
+
+def save_benchmark(benchmark_result, path=BENCHMARK_FILE):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(benchmark_result, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_benchmark(path=BENCHMARK_FILE, directory=None):
+    """Stored benchmark if it was measured on this hardware, otherwise None"""
+    try:
+        with open(path, "r") as f:
+            benchmark_result = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if benchmark_result.get("fingerprint") != hardware_fingerprint(directory):
+        return None
+    return benchmark_result
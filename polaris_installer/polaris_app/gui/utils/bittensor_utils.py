@@ -1,13 +1,20 @@
+import importlib.util
 import json
 import os
 import signal
 import subprocess
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 import logging
 
+from config.env import METAGRAPH_MAX_AGE_BLOCKS
+from gui.utils.metagraph_cache import MetagraphCache
+from gui.utils.storage import miner_data_dir
+from gui.utils.subtensor_pool import SubtensorPool
+
 # Configure logging
 logger = logging.getLogger(__name__)
 handler = logging.StreamHandler()
@@ -16,26 +23,39 @@ handler.setFormatter(formatter)
 logger.addHandler(handler)
 logger.setLevel(logging.INFO)
 
-# Try to import bittensor
-try:
-    import bittensor as bt
-    BITTENSOR_AVAILABLE = True
-except ImportError:
-    BITTENSOR_AVAILABLE = False
+# bittensor takes seconds to import, so only check that it is installed here
+BITTENSOR_AVAILABLE = importlib.util.find_spec("bittensor") is not None
+if not BITTENSOR_AVAILABLE:
     logger.warning("Bittensor not installed. Some functionality will be limited.")
 
+def load_bittensor():
+    """Import bittensor on first use; later calls return the already loaded module"""
+    import bittensor
+    return bittensor
+
 # Constants
 POLARIS_HOME = Path.home() / '.polaris'
 BITTENSOR_CONFIG_PATH = POLARIS_HOME / 'bittensor'
 PID_FILE = BITTENSOR_CONFIG_PATH / 'pids' / 'miner.pid'
-LOG_FILE = BITTENSOR_CONFIG_PATH / 'logs' / 'miner.log'
+
+_logs_path = None
+
+def get_logs_path():
+    """Miner log directory on the fastest volume with enough space, chosen once per host"""
+    global _logs_path
+    if _logs_path is None:
+        _logs_path = miner_data_dir(BITTENSOR_CONFIG_PATH) / 'logs'
+    return _logs_path
+
+def get_log_file():
+    return get_logs_path() / 'miner.log'
 
 def setup_directories():
     """Create necessary directories if they don't exist"""
     POLARIS_HOME.mkdir(parents=True, exist_ok=True)
     BITTENSOR_CONFIG_PATH.mkdir(parents=True, exist_ok=True)
     (BITTENSOR_CONFIG_PATH / 'pids').mkdir(parents=True, exist_ok=True)
-    (BITTENSOR_CONFIG_PATH / 'logs').mkdir(parents=True, exist_ok=True)
+    get_logs_path().mkdir(parents=True, exist_ok=True)
 
 def load_config():
     """Load miner configuration from file"""
@@ -55,19 +75,36 @@ def save_config(config):
     with open(BITTENSOR_CONFIG_PATH / 'config.json', 'w') as f:
         json.dump(config, f, indent=4)
 
+_subtensor_pool = None
+
+def get_subtensor_pool():
+    """Shared subtensor connections, one per network, kept open between calls"""
+    global _subtensor_pool
+    if _subtensor_pool is None:
+        _subtensor_pool = SubtensorPool(lambda network: load_bittensor().subtensor(network=network))
+    return _subtensor_pool
+
 def get_subtensor(network='finney'):
-    """Initialize and return subtensor connection"""
+    """Return the shared subtensor connection for network, safe to use from any thread"""
     if not BITTENSOR_AVAILABLE:
         logger.error("Bittensor not installed.")
         return None
         
     try:
-        subtensor = bt.subtensor(network=network)
-        return subtensor
+        return get_subtensor_pool().shared(network)
     except Exception as e:
         logger.error(f"Failed to connect to subtensor: {str(e)}")
         return None
 
+_metagraph_cache = None
+
+def get_metagraph_cache():
+    """Shared on-disk metagraph cache; the chain is only contacted for stale snapshots"""
+    global _metagraph_cache
+    if _metagraph_cache is None:
+        _metagraph_cache = MetagraphCache(get_subtensor_pool().connection, max_age_blocks=METAGRAPH_MAX_AGE_BLOCKS)
+    return _metagraph_cache
+
 def write_pid(pid):
     """Write process ID to file"""
     setup_directories()
@@ -85,7 +122,7 @@ def log_message(message):
     """Write message to log file"""
     setup_directories()
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    with open(LOG_FILE, 'a') as f:
+    with open(get_log_file(), 'a') as f:
         f.write(f"[{timestamp}] {message}\n")
 
 def start_bittensor_miner(wallet_name, hotkey="default", netuid=49, network="finney"):
@@ -107,7 +144,7 @@ def start_bittensor_miner(wallet_name, hotkey="default", netuid=49, network="fin
                 '--subtensor.network', network,
                 '--logging.debug'
             ],
-            stdout=open(LOG_FILE, 'a'),
+            stdout=open(get_log_file(), 'a'),
             stderr=subprocess.STDOUT,
             start_new_session=True
         )
@@ -198,7 +235,7 @@ def get_uid_from_hotkey(hotkey, netuid=49, network="finney"):
         
     # Create logs directory if it doesn't exist
     setup_directories()
-    logs_dir = BITTENSOR_CONFIG_PATH / 'logs'
+    logs_dir = get_logs_path()
     
     # Path for the UID log file
     uid_log_file = logs_dir / 'miner_uid_log.txt'
@@ -213,19 +250,15 @@ def get_uid_from_hotkey(hotkey, netuid=49, network="finney"):
     }
     
     try:
-        # Connect to the subtensor network
-        sub = bt.subtensor(network)
-        logger.info(f"Connected to {network} network")
-
-        # Get the metagraph for the subnet
-        meta = sub.metagraph(netuid)
-        logger.info(f"Retrieved metagraph for subnet {netuid}")
+        # Get the metagraph for the subnet, synced from the network only when the cached one is stale
+        meta = get_metagraph_cache().get(network, netuid)
+        logger.info(f"Using metagraph for subnet {netuid} on {network} at block {meta.block}")
         
         # Ensure we're using the actual SS58 address
         if not hotkey.startswith('5'):
             # If not an SS58 address, try to get it from wallet
             try:
-                wallet = bt.wallet(name=hotkey, hotkey="default")
+                wallet = load_bittensor().wallet(name=hotkey, hotkey="default")
                 hotkey = wallet.hotkey.ss58_address
             except:
                 # If that fails too, log warning
@@ -235,15 +268,21 @@ def get_uid_from_hotkey(hotkey, netuid=49, network="finney"):
                     f.write(json.dumps(log_entry) + '\n')
                 return False, {"error": "Not a valid SS58 address"}
             
-        # Find the UID for the given hotkey
-        uid = next((uid for uid, registered_hotkey in zip(meta.uids, meta.hotkeys) if registered_hotkey == hotkey), None)
+        # Find the UIDs for the given hotkey
+        uids = meta.uids_for_hotkey(hotkey)
+        if not uids and meta.age_blocks() > 0:
+            # The hotkey may have registered since the snapshot was taken
+            meta = get_metagraph_cache().get(network, netuid, refresh=True)
+            uids = meta.uids_for_hotkey(hotkey)
 
-        if uid is not None:
-            logger.info(f"Found UID {uid} for hotkey {hotkey[:10]}...")
+        if uids:
+            uid = uids[0]
+            logger.info(f"Found UID(s) {', '.join(map(str, uids))} for hotkey {hotkey[:10]}...")
             
             # Update log entry with success info
             log_entry['status'] = 'success'
             log_entry['uid'] = int(uid)
+            log_entry['uids'] = [int(u) for u in uids]
             
             # Write to log file
             with open(uid_log_file, 'a') as f:
@@ -252,9 +291,10 @@ def get_uid_from_hotkey(hotkey, netuid=49, network="finney"):
             # Also write to a dedicated file for this specific hotkey
             hotkey_uid_file = logs_dir / f'hotkey_{hotkey[:10]}_uid.txt'
             with open(hotkey_uid_file, 'w') as f:
-                f.write(f"Hotkey: {hotkey}\nUID: {uid}\nNetwork: {network}\nNetuid: {netuid}\nTimestamp: {datetime.now().isoformat()}")
+                f.write(f"Hotkey: {hotkey}\nUID: {', '.join(map(str, uids))}\nNetwork: {network}\nNetuid: {netuid}\nTimestamp: {datetime.now().isoformat()}")
                 
-            return True, {"uid": int(uid), "hotkey": hotkey, "netuid": netuid, "network": network}
+            return True, {"uid": int(uid), "uids": [int(u) for u in uids], "hotkey": hotkey,
+                          "netuid": netuid, "network": network}
         else:
             logger.warning(f"Could not find UID for hotkey {hotkey[:10]}... in subnet {netuid}")
             
@@ -280,6 +320,89 @@ def get_uid_from_hotkey(hotkey, netuid=49, network="finney"):
             
         return False, {"error": str(e)}
 
+def get_uids_from_hotkeys(hotkeys, netuid=49, network="finney"):
+    """
+    Resolve many SS58 hotkeys to UIDs with one metagraph lookup.
+
+    Args:
+        hotkeys (list): SS58 hotkey addresses.
+        netuid (int): The subnet ID.
+        network (str): The network to connect to ('finney' for mainnet, 'test' for testnet)
+
+    Returns:
+        tuple: (success, result_dict) where result_dict["uids"] maps each hotkey to the
+        list of UIDs it holds, empty when it is not registered
+    """
+    if not BITTENSOR_AVAILABLE:
+        return False, {"error": "Bittensor not installed"}
+
+    try:
+        meta = get_metagraph_cache().get(network, netuid)
+        uids = meta.uids_for_hotkeys(hotkeys)
+        if not all(uids.values()) and meta.age_blocks() > 0:
+            # Some hotkeys may have registered since the snapshot was taken
+            meta = get_metagraph_cache().get(network, netuid, refresh=True)
+            uids = meta.uids_for_hotkeys(hotkeys)
+    except Exception as e:
+        logger.error(f"Error retrieving UIDs: {str(e)}")
+        return False, {"error": str(e)}
+
+    found = sum(bool(hotkey_uids) for hotkey_uids in uids.values())
+    logger.info(f"Resolved {found}/{len(uids)} hotkeys in subnet {netuid} on {network}")
+    return True, {"uids": uids, "netuid": netuid, "network": network, "block": meta.block}
+
+def get_uids_for_coldkey(coldkey, netuid=49, network="finney"):
+    """
+    List the UIDs of every hotkey registered under a coldkey.
+
+    Returns:
+        tuple: (success, result_dict) where result_dict["uids"] is a list of UIDs
+    """
+    if not BITTENSOR_AVAILABLE:
+        return False, {"error": "Bittensor not installed"}
+
+    try:
+        meta = get_metagraph_cache().get(network, netuid)
+    except Exception as e:
+        logger.error(f"Error retrieving UIDs: {str(e)}")
+        return False, {"error": str(e)}
+    return True, {"uids": meta.uids_for_coldkey(coldkey), "netuid": netuid, "network": network, "block": meta.block}
+
+def resolve_uids(targets, max_workers=8):
+    """
+    Resolve (network, netuid, hotkey) tuples concurrently.
+
+    Targets are grouped per (network, netuid) so each metagraph is fetched
+    once; groups run in parallel over the shared connections and their
+    results are yielded as soon as each group finishes.
+
+    Yields:
+        dict: {"network", "netuid", "hotkey", "uids", "uid", "block"} where uids
+        lists every UID the hotkey holds and uid is the lowest of them, or None
+        when the hotkey is not registered; "error" replaces "block" when the
+        metagraph could not be loaded
+    """
+    groups = {}
+    for network, netuid, hotkey in targets:
+        groups.setdefault((network, int(netuid)), []).append(hotkey)
+    if not groups:
+        return
+
+    def resolve_group(network, netuid, hotkeys):
+        success, data = get_uids_from_hotkeys(hotkeys, netuid, network)
+        if not success:
+            return [{"network": network, "netuid": netuid, "hotkey": hotkey, "uids": [], "uid": None,
+                     "error": data["error"]} for hotkey in hotkeys]
+        return [{"network": network, "netuid": netuid, "hotkey": hotkey, "uids": uids,
+                 "uid": min(uids) if uids else None, "block": data["block"]}
+                for hotkey, uids in data["uids"].items()]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(groups))) as executor:
+        futures = [executor.submit(resolve_group, network, netuid, hotkeys)
+                   for (network, netuid), hotkeys in groups.items()]
+        for future in as_completed(futures):
+            yield from future.result()
+
 def register_wallet_to_subnet(wallet_name, hotkey="default", netuid=49, network="finney"):
     """
     Register a wallet to a subnet using btcli.
@@ -334,11 +457,28 @@ def list_wallets():
         return []
         
     try:
-        return bt.wallet.list_wallets()
+        return load_bittensor().wallet.list_wallets()
     except Exception as e:
         logger.error(f"Error listing wallets: {str(e)}")
         return []
 
+def get_hotkey_address(wallet_name, hotkey="default"):
+    """
+    SS58 address of a wallet's hotkey; the coldkey is not unlocked.
+
+    Returns:
+        tuple: (success, address or error message)
+    """
+    if not BITTENSOR_AVAILABLE:
+        return False, "Bittensor not installed"
+
+    try:
+        wallet = load_bittensor().wallet(name=wallet_name, hotkey=hotkey)
+        return True, wallet.hotkey.ss58_address
+    except Exception as e:
+        logger.error(f"Error reading hotkey: {str(e)}")
+        return False, str(e)
+
 def get_wallet_info(wallet_name, hotkey="default"):
     """
     Get information about a wallet.
@@ -354,7 +494,7 @@ def get_wallet_info(wallet_name, hotkey="default"):
         return {"error": "Bittensor not installed"}
         
     try:
-        wallet = bt.wallet(name=wallet_name, hotkey=hotkey)
+        wallet = load_bittensor().wallet(name=wallet_name, hotkey=hotkey)
         return {
             "coldkey": wallet.coldkey.ss58_address,
             "hotkey": wallet.hotkey.ss58_address,
@@ -0,0 +1,301 @@
+"""
+GPU inventory from sysfs/procfs with a single batched nvidia-smi query.
+
+Display controllers are enumerated from /sys/bus/pci/devices and NVIDIA
+model names from /proc/driver/nvidia/gpus without starting any process.
+nvidia-smi is run at most once per inventory, for every field at once, and
+libcuda (when loadable) supplies SM counts and compute capability so CUDA
+core counts are derived rather than guessed. All paths are injectable so
+the inventory can be exercised against a fake sysfs tree and a fake
+nvidia-smi script on machines without a GPU.
+"""
+import ctypes
+import os
+import shutil
+import subprocess
+import threading
+
+SYSFS_PCI_DEVICES = "/sys/bus/pci/devices"
+PROCFS_NVIDIA_GPUS = "/proc/driver/nvidia/gpus"
+NVIDIA_SMI = "nvidia-smi"
+CUDA_LIBRARY = "libcuda.so.1" if os.name != "nt" else "nvcuda.dll"
+NVIDIA_SMI_TIMEOUT = 5
+
+# PCI base class 0x03 is "display controller"
+PCI_DISPLAY_CLASS = 0x03
+
+VENDOR_NVIDIA = 0x10de
+VENDOR_AMD = 0x1002
+VENDOR_INTEL = 0x8086
+VENDOR_NAMES = {VENDOR_NVIDIA: "NVIDIA", VENDOR_AMD: "AMD", VENDOR_INTEL: "Intel"}
+
+NVIDIA_SMI_FIELDS = [
+    "pci.bus_id",
+    "name",
+    "memory.total",
+    "clocks.max.sm",
+    "clocks.max.memory",
+    "pcie.link.gen.max",
+    "pcie.link.width.max",
+    "power.limit",
+    "power.max_limit",
+]
+
+# CUDA cores per streaming multiprocessor, by compute capability
+CORES_PER_SM = {
+    (3, 0): 192, (3, 2): 192, (3, 5): 192, (3, 7): 192,
+    (5, 0): 128, (5, 2): 128, (5, 3): 128,
+    (6, 0): 64, (6, 1): 128, (6, 2): 128,
+    (7, 0): 64, (7, 2): 64, (7, 5): 64,
+    (8, 0): 64, (8, 6): 128, (8, 7): 128, (8, 9): 128,
+    (9, 0): 128,
+    (10, 0): 128, (12, 0): 128,
+}
+
+# PCIe generation by per-lane transfer rate in GT/s
+PCIE_GENERATIONS = {2.5: 1, 5.0: 2, 8.0: 3, 16.0: 4, 32.0: 5, 64.0: 6}
+
+# cuDeviceGetAttribute attribute ids
+CU_DEVICE_ATTRIBUTE_MULTIPROCESSOR_COUNT = 16
+CU_DEVICE_ATTRIBUTE_COMPUTE_CAPABILITY_MAJOR = 75
+CU_DEVICE_ATTRIBUTE_COMPUTE_CAPABILITY_MINOR = 76
+
+
+def normalize_bus_id(bus_id):
+    """'00000000:01:00.0' (nvidia-smi) and '0000:01:00.0' (sysfs) -> '0000:01:00.0'"""
+    parts = bus_id.strip().lower().split(":")
+    if len(parts) == 2:
+        parts.insert(0, "0")
+    domain, bus, device = parts[-3:]
+    return f"{int(domain, 16):04x}:{int(bus, 16):02x}:{device}"
+
+
+def _read_text(path):
+    try:
+        with open(path, "r") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _read_hex(path):
+    text = _read_text(path)
+    try:
+        return int(text, 16) if text else None
+    except ValueError:
+        return None
+
+
+def pcie_link(gen=None, speed=None, width=None):
+    """
+    {"gen", "speed", "width"} whichever source reported the link: sysfs gives
+    the speed ("16.0 GT/s PCIe"), nvidia-smi the generation, and each is
+    derived from the other when possible. None when nothing is known.
+    """
+    rate = None
+    if speed:
+        try:
+            rate = float(str(speed).split()[0])
+        except ValueError:
+            pass
+    if gen is None and rate is not None:
+        gen = PCIE_GENERATIONS.get(rate)
+    if rate is None and gen is not None:
+        rate = next((value for value, generation in PCIE_GENERATIONS.items() if generation == gen), None)
+    if isinstance(width, str):
+        width = int(width) if width.isdigit() else None
+    if gen is None and rate is None and width is None:
+        return None
+    return {"gen": gen, "speed": f"{rate:.1f} GT/s" if rate is not None else None, "width": width}
+
+
+def _smi_value(text):
+    text = text.strip()
+    if not text or text.startswith("[") or text in ("N/A", "Not Supported"):
+        return None
+    try:
+        number = float(text)
+    except ValueError:
+        return text
+    return int(number) if number.is_integer() else number
+
+
+class GpuInventory:
+    def __init__(self, sysfs_root=SYSFS_PCI_DEVICES, procfs_root=PROCFS_NVIDIA_GPUS,
+                 nvidia_smi=NVIDIA_SMI, cuda_library=CUDA_LIBRARY):
+        self.sysfs_root = sysfs_root
+        self.procfs_root = procfs_root
+        self.nvidia_smi = nvidia_smi
+        self.cuda_library = cuda_library
+        self.lock = threading.Lock()
+        self.gpus = None
+
+    def get(self, refresh=False):
+        """List of GPU dicts, collected once and cached"""
+        with self.lock:
+            if self.gpus is None or refresh:
+                self.gpus = self._collect()
+            return [dict(gpu) for gpu in self.gpus]
+
+    def _collect(self):
+        devices = {gpu["pci_bus_id"]: gpu for gpu in self.pci_devices()}
+
+        for bus_id, model in self.nvidia_proc_models().items():
+            gpu = devices.setdefault(bus_id, self._empty(bus_id, VENDOR_NVIDIA))
+            gpu["model"] = model
+
+        # Only NVIDIA devices need the driver tools, so when sysfs lists the PCI bus a host
+        # without one never forks nvidia-smi or loads libcuda. Without sysfs (Windows, macOS)
+        # there is no way to tell and the tools are tried.
+        pci_listed = os.path.isdir(self.sysfs_root)
+        if not pci_listed or any(gpu["vendor_id"] == VENDOR_NVIDIA for gpu in devices.values()):
+            for bus_id, fields in self.query_nvidia_smi().items():
+                gpu = devices.setdefault(bus_id, self._empty(bus_id, VENDOR_NVIDIA))
+                gpu.update({key: value for key, value in fields.items() if value is not None})
+
+            for bus_id, (sm_count, capability) in self.cuda_attributes().items():
+                gpu = devices.get(bus_id)
+                if gpu is None:
+                    continue
+                gpu["sm_count"] = sm_count
+                gpu["compute_capability"] = f"{capability[0]}.{capability[1]}"
+                cores_per_sm = CORES_PER_SM.get(capability)
+                gpu["cuda_cores"] = sm_count * cores_per_sm if cores_per_sm else None
+
+        return [devices[bus_id] for bus_id in sorted(devices)]
+
+    def _empty(self, bus_id, vendor_id):
+        vendor = VENDOR_NAMES.get(vendor_id, f"{vendor_id:04x}" if vendor_id is not None else "Unknown")
+        return {
+            "model": f"{vendor} GPU",
+            "vendor": vendor,
+            "vendor_id": vendor_id,
+            "device_id": None,
+            "pci_bus_id": bus_id,
+            "driver": None,
+            "vram": "Unknown",
+            "cuda_cores": None,
+            "sm_count": None,
+            "compute_capability": None,
+            "max_sm_clock_mhz": None,
+            "max_memory_clock_mhz": None,
+            "pcie_link": None,
+            "power_limit_w": None,
+            "power_max_limit_w": None,
+        }
+
+    def pci_devices(self):
+        """Display controllers from sysfs"""
+        try:
+            entries = sorted(os.listdir(self.sysfs_root))
+        except OSError:
+            return []
+        gpus = []
+        for entry in entries:
+            path = os.path.join(self.sysfs_root, entry)
+            device_class = _read_hex(os.path.join(path, "class"))
+            if device_class is None or device_class >> 16 != PCI_DISPLAY_CLASS:
+                continue
+            gpu = self._empty(normalize_bus_id(entry), _read_hex(os.path.join(path, "vendor")))
+            device_id = _read_hex(os.path.join(path, "device"))
+            gpu["device_id"] = device_id
+            if device_id is not None:
+                gpu["model"] = f"{gpu['vendor']} GPU [{device_id:04x}]"
+            driver_link = os.path.join(path, "driver")
+            if os.path.islink(driver_link):
+                gpu["driver"] = os.path.basename(os.readlink(driver_link))
+            gpu["pcie_link"] = pcie_link(speed=_read_text(os.path.join(path, "max_link_speed")),
+                                         width=_read_text(os.path.join(path, "max_link_width")))
+            gpus.append(gpu)
+        return gpus
+
+    def nvidia_proc_models(self):
+        """{bus id: model} from the NVIDIA driver's procfs entries"""
+        try:
+            entries = os.listdir(self.procfs_root)
+        except OSError:
+            return {}
+        models = {}
+        for entry in entries:
+            text = _read_text(os.path.join(self.procfs_root, entry, "information")) or ""
+            for line in text.splitlines():
+                key, _, value = line.partition(":")
+                if key.strip() == "Model" and value.strip():
+                    models[normalize_bus_id(entry)] = value.strip()
+        return models
+
+    def query_nvidia_smi(self):
+        """All NVIDIA_SMI_FIELDS for every GPU in one nvidia-smi run, keyed by bus id"""
+        if not shutil.which(self.nvidia_smi):
+            return {}
+        try:
+            result = subprocess.run(
+                [self.nvidia_smi, f"--query-gpu={','.join(NVIDIA_SMI_FIELDS)}", "--format=csv,noheader,nounits"],
+                capture_output=True, text=True, timeout=NVIDIA_SMI_TIMEOUT)
+        except (OSError, subprocess.SubprocessError):
+            return {}
+        if result.returncode != 0:
+            return {}
+
+        gpus = {}
+        for line in result.stdout.strip().splitlines():
+            values = [_smi_value(value) for value in line.split(",")]
+            if len(values) != len(NVIDIA_SMI_FIELDS) or not values[0]:
+                continue
+            row = dict(zip(NVIDIA_SMI_FIELDS, values))
+            gpus[normalize_bus_id(str(row["pci.bus_id"]))] = {
+                "model": row["name"],
+                "vram": f"{row['memory.total']} MiB" if row["memory.total"] is not None else None,
+                "max_sm_clock_mhz": row["clocks.max.sm"],
+                "max_memory_clock_mhz": row["clocks.max.memory"],
+                "pcie_link": pcie_link(gen=row["pcie.link.gen.max"], width=row["pcie.link.width.max"]),
+                "power_limit_w": row["power.limit"],
+                "power_max_limit_w": row["power.max_limit"],
+            }
+        return gpus
+
+    def cuda_attributes(self):
+        """{bus id: (SM count, (major, minor))} through the CUDA driver API, or {} without it"""
+        if not self.cuda_library:
+            return {}
+        try:
+            cuda = ctypes.CDLL(self.cuda_library)
+        except OSError:
+            return {}
+        attributes = {}
+        try:
+            if cuda.cuInit(0) != 0:
+                return {}
+            count = ctypes.c_int()
+            if cuda.cuDeviceGetCount(ctypes.byref(count)) != 0:
+                return {}
+            for ordinal in range(count.value):
+                device = ctypes.c_int()
+                if cuda.cuDeviceGet(ctypes.byref(device), ordinal) != 0:
+                    continue
+                values = []
+                for attribute in (CU_DEVICE_ATTRIBUTE_MULTIPROCESSOR_COUNT,
+                                  CU_DEVICE_ATTRIBUTE_COMPUTE_CAPABILITY_MAJOR,
+                                  CU_DEVICE_ATTRIBUTE_COMPUTE_CAPABILITY_MINOR):
+                    value = ctypes.c_int()
+                    if cuda.cuDeviceGetAttribute(ctypes.byref(value), attribute, device) != 0:
+                        break
+                    values.append(value.value)
+                bus_id = ctypes.create_string_buffer(32)
+                if len(values) != 3 or cuda.cuDeviceGetPCIBusId(bus_id, len(bus_id), device) != 0:
+                    continue
+                attributes[normalize_bus_id(bus_id.value.decode())] = (values[0], (values[1], values[2]))
+        except AttributeError:
+            return {}
+        return attributes
+
+
+_inventory = None
+
+
+def get_gpu_inventory():
+    """Process-wide inventory, so the probes above run once per process"""
+    global _inventory
+    if _inventory is None:
+        _inventory = GpuInventory()
+    return _inventory
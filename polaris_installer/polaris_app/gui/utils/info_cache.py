@@ -0,0 +1,150 @@
+"""
+Tiered cache for system information.
+
+Each field belongs to a TTL tier: hardware identity is probed once per
+process, the public IP every few minutes and dynamic values every few
+seconds. Reads only probe fields that have expired, and a background
+refresher can keep the expiring tiers warm so views read without waiting.
+"""
+import threading
+import time
+
+from gui.utils.probes import PROBE_OK
+from gui.utils.public_ip import get_public_ip_resolver
+from gui.utils.system_info import SYSTEM_INFO_FIELDS, build_system_info, probe_fields
+
+TIER_STATIC = "static"
+TIER_MINUTES = "minutes"
+TIER_SECONDS = "seconds"
+
+# None means the value never expires
+TIER_TTLS = {
+    TIER_STATIC: None,
+    TIER_MINUTES: 300.0,
+    TIER_SECONDS: 10.0,
+}
+
+FIELD_TIERS = {
+    "hostname": TIER_STATIC,
+    "operating_system": TIER_STATIC,
+    "cpu": TIER_STATIC,
+    "memory": TIER_STATIC,
+    "gpus": TIER_STATIC,
+    # Only changes when the benchmark is re-run, which invalidates it
+    "benchmark": TIER_STATIC,
+    "public_ip": TIER_MINUTES,
+    "ip_address": TIER_MINUTES,
+    "storage": TIER_SECONDS,
+    "open_ports": TIER_SECONDS,
+}
+
+# Failed or late probes are retried sooner than their tier would allow
+RETRY_AFTER = 5.0
+BACKGROUND_REFRESH_INTERVAL = 5.0
+
+
+class SystemInfoCache:
+    def __init__(self, ttls=None, probe=probe_fields):
+        self.ttls = dict(TIER_TTLS, **(ttls or {}))
+        self.probe = probe
+        self.lock = threading.Lock()
+        self.refresh_lock = threading.Lock()
+        # field -> (value, status, expires_at or None)
+        self.entries = {}
+        self.stopped = threading.Event()
+        self.refresher = None
+
+    def get(self, username=None, open_ports=None):
+        """Same shape as get_full_system_info, probing only expired fields"""
+        fields = [name for name in SYSTEM_INFO_FIELDS if name != "open_ports" or not open_ports]
+        values, statuses = self.get_fields(fields)
+        return build_system_info(values, statuses, username, open_ports)
+
+    def get_fields(self, fields=SYSTEM_INFO_FIELDS):
+        """Returns ({field: value}, {field: status}), refreshing expired fields first"""
+        values, statuses = {}, {}
+        missing = list(fields)
+        while missing:
+            produced = self.refresh(self.expired_fields(missing))
+            with self.lock:
+                for name in missing:
+                    # invalidate() may have dropped the entry since it was refreshed
+                    entry = self.entries.get(name) or produced.get(name)
+                    if entry is not None:
+                        values[name], statuses[name] = entry[0], entry[1]
+            missing = [name for name in missing if name not in values]
+        return values, statuses
+
+    def expired_fields(self, fields=SYSTEM_INFO_FIELDS):
+        now = time.monotonic()
+        with self.lock:
+            return [name for name in fields
+                    if name not in self.entries
+                    or (self.entries[name][2] is not None and self.entries[name][2] <= now)]
+
+    def refresh(self, fields):
+        """Probe the given fields now, store the results and return the new entries"""
+        if not fields:
+            return {}
+        with self.refresh_lock:
+            # Another thread may have refreshed them while we waited
+            fields = self.expired_fields(fields)
+            if not fields:
+                return {}
+            results = self.probe(fields)
+            now = time.monotonic()
+            produced = {}
+            with self.lock:
+                for name, result in results.items():
+                    if result.status == PROBE_OK:
+                        ttl = self.ttls[FIELD_TIERS[name]]
+                    else:
+                        ttl = RETRY_AFTER
+                    produced[name] = (result.value, result.status, None if ttl is None else now + ttl)
+                    self.entries[name] = produced[name]
+            return produced
+
+    def invalidate(self, fields=None, tier=None):
+        """Drop cached fields: the given ones, a whole tier, or everything"""
+        with self.lock:
+            if fields is None and tier is None:
+                self.entries.clear()
+                return
+            names = set(fields or [])
+            if tier is not None:
+                names.update(name for name, name_tier in FIELD_TIERS.items() if name_tier == tier)
+            for name in names:
+                self.entries.pop(name, None)
+
+    def start_background_refresh(self, interval=BACKGROUND_REFRESH_INTERVAL):
+        """Re-probe expired fields on a daemon thread so reads stay instant"""
+        if self.refresher and self.refresher.is_alive():
+            return
+        self.stopped.clear()
+        self.refresher = threading.Thread(target=self._refresh_loop, args=(interval,), daemon=True)
+        self.refresher.start()
+
+    def stop_background_refresh(self):
+        self.stopped.set()
+
+    def _refresh_loop(self, interval):
+        while True:
+            expired = self.expired_fields()
+            if expired:
+                self.refresh(expired)
+            if self.stopped.wait(interval):
+                break
+
+
+_cache = None
+
+
+def get_system_info_cache():
+    """Process-wide cache shared by all views"""
+    global _cache
+    if _cache is None:
+        _cache = SystemInfoCache()
+        # A new public address usually comes with new interface addresses
+        get_public_ip_resolver().add_listener(
+            lambda address: _cache.invalidate(["public_ip", "ip_address"]))
+    return _cache
@@ -0,0 +1,194 @@
+"""
+On-disk metagraph cache with block-based invalidation.
+
+Each (network, netuid) snapshot is stored as one .npy file per array (uids,
+hotkeys, coldkeys, stake, incentive, emission) and opened memory-mapped, so
+lookups read only the pages they touch. A snapshot records the block it was
+taken at; its current age is estimated from the wall clock and the chain's
+block time, so deciding whether to refresh needs no network round trip.
+"""
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+CACHE_ROOT = Path.home() / '.polaris' / 'metagraph'
+DEFAULT_MAX_AGE_BLOCKS = 100
+# Bittensor produces a block every 12 seconds
+BLOCK_TIME_SECONDS = 12
+META_FILE = "meta.json"
+
+ARRAYS = ("uids", "hotkeys", "coldkeys", "stake", "incentive", "emission")
+# SS58 addresses are 48 characters
+ADDRESS_DTYPE = "<U48"
+
+
+def _as_array(values, dtype):
+    # Older bittensor releases hand out torch tensors
+    if hasattr(values, "numpy"):
+        values = values.numpy()
+    return np.asarray(values, dtype=dtype)
+
+
+class MetagraphSnapshot:
+    """Arrays of one metagraph at one block, usually memory-mapped from disk"""
+
+    def __init__(self, network, netuid, block, synced_at, arrays):
+        self.network = network
+        self.netuid = netuid
+        self.block = block
+        self.synced_at = synced_at
+        self.uids = arrays["uids"]
+        self.hotkeys = arrays["hotkeys"]
+        self.coldkeys = arrays["coldkeys"]
+        self.stake = arrays["stake"]
+        self.incentive = arrays["incentive"]
+        self.emission = arrays["emission"]
+        self.index_lock = threading.Lock()
+        self.hotkey_index = None
+        self.coldkey_index = None
+
+    def estimated_block(self, now=None):
+        elapsed = (now or time.time()) - self.synced_at
+        return self.block + int(max(elapsed, 0) // BLOCK_TIME_SECONDS)
+
+    def age_blocks(self, now=None):
+        return self.estimated_block(now) - self.block
+
+    def _build_indexes(self):
+        # Built once per snapshot, on first lookup
+        with self.index_lock:
+            if self.hotkey_index is not None:
+                return
+            uids = self.uids.tolist()
+            coldkey_index = {}
+            for uid, coldkey in zip(uids, self.coldkeys.tolist()):
+                coldkey_index.setdefault(coldkey, []).append(uid)
+            # A hotkey can hold more than one UID, so it maps to a list like a coldkey does
+            hotkey_index = {}
+            for uid, hotkey in zip(uids, self.hotkeys.tolist()):
+                hotkey_index.setdefault(hotkey, []).append(uid)
+            self.coldkey_index = coldkey_index
+            self.hotkey_index = hotkey_index
+
+    def uids_for_hotkey(self, hotkey):
+        """Every UID registered to hotkey, empty when it is not registered"""
+        self._build_indexes()
+        return list(self.hotkey_index.get(hotkey, []))
+
+    def uids_for_hotkeys(self, hotkeys):
+        """{hotkey: [UIDs]} for many hotkeys in one pass"""
+        self._build_indexes()
+        return {hotkey: list(self.hotkey_index.get(hotkey, [])) for hotkey in hotkeys}
+
+    def uids_for_coldkey(self, coldkey):
+        """UIDs of every hotkey registered under coldkey"""
+        self._build_indexes()
+        return list(self.coldkey_index.get(coldkey, []))
+
+    def neuron(self, index):
+        return {
+            "uid": int(self.uids[index]),
+            "hotkey": str(self.hotkeys[index]),
+            "coldkey": str(self.coldkeys[index]),
+            "stake": float(self.stake[index]),
+            "incentive": float(self.incentive[index]),
+            "emission": float(self.emission[index]),
+        }
+
+
+class MetagraphCache:
+    """
+    Metagraph snapshots per (network, netuid). connect(network) must return
+    a context manager yielding an object with metagraph(netuid), such as a
+    pooled bittensor subtensor.
+    """
+
+    def __init__(self, connect, root=CACHE_ROOT, max_age_blocks=DEFAULT_MAX_AGE_BLOCKS):
+        self.connect = connect
+        self.root = Path(root)
+        self.max_age_blocks = max_age_blocks
+        self.lock = threading.Lock()
+        self.key_locks = {}
+        self.snapshots = {}
+
+    def _key_lock(self, key):
+        with self.lock:
+            return self.key_locks.setdefault(key, threading.Lock())
+
+    def _directory(self, network, netuid):
+        return self.root / network / str(netuid)
+
+    def get(self, network, netuid, max_age_blocks=None, refresh=False):
+        """
+        Snapshot no older than max_age_blocks, syncing from the chain only
+        when needed. If a sync fails and an older snapshot exists, the older
+        snapshot is returned rather than raising.
+        """
+        max_age_blocks = self.max_age_blocks if max_age_blocks is None else max_age_blocks
+        key = (network, int(netuid))
+        with self._key_lock(key):
+            snapshot = self.snapshots.get(key) or self.load(network, netuid)
+            if snapshot is not None and not refresh and snapshot.age_blocks() <= max_age_blocks:
+                self.snapshots[key] = snapshot
+                return snapshot
+            try:
+                snapshot = self.sync(network, netuid)
+            except Exception:
+                if snapshot is None:
+                    raise
+            self.snapshots[key] = snapshot
+            return snapshot
+
+    def load(self, network, netuid):
+        """Snapshot stored on disk, memory-mapped, or None"""
+        directory = self._directory(network, netuid)
+        try:
+            with open(directory / META_FILE, "r") as f:
+                meta = json.load(f)
+            snapshot_dir = directory / meta["snapshot"]
+            arrays = {name: np.load(snapshot_dir / f"{name}.npy", mmap_mode="r") for name in ARRAYS}
+        except (OSError, ValueError, KeyError):
+            return None
+        return MetagraphSnapshot(network, int(netuid), meta["block"], meta["synced_at"], arrays)
+
+    def sync(self, network, netuid):
+        """Download the metagraph and store it as a new snapshot"""
+        with self.connect(network) as subtensor:
+            metagraph = subtensor.metagraph(int(netuid))
+        block = int(_as_array(metagraph.block, np.int64))
+        arrays = {
+            "uids": _as_array(metagraph.uids, np.int64),
+            "hotkeys": _as_array(metagraph.hotkeys, ADDRESS_DTYPE),
+            "coldkeys": _as_array(metagraph.coldkeys, ADDRESS_DTYPE),
+            "stake": _as_array(metagraph.S, np.float64),
+            "incentive": _as_array(metagraph.I, np.float64),
+            "emission": _as_array(metagraph.E, np.float64),
+        }
+        return self.store(network, netuid, block, arrays)
+
+    def store(self, network, netuid, block, arrays, synced_at=None):
+        """Write arrays as the current snapshot; readers of the previous one are not disturbed"""
+        synced_at = synced_at or time.time()
+        directory = self._directory(network, netuid)
+        snapshot_name = f"block-{block}-{int(synced_at * 1000)}"
+        snapshot_dir = directory / snapshot_name
+        snapshot_dir.mkdir(parents=True, exist_ok=True)
+        for name in ARRAYS:
+            np.save(snapshot_dir / f"{name}.npy", arrays[name])
+
+        tmp_path = directory / (META_FILE + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"block": block, "synced_at": synced_at, "snapshot": snapshot_name,
+                       "neurons": len(arrays["uids"])}, f)
+        os.replace(tmp_path, directory / META_FILE)
+
+        # Older snapshots may still be mapped on Windows; they are retried on the next sync
+        for entry in directory.iterdir():
+            if entry.is_dir() and entry.name != snapshot_name:
+                shutil.rmtree(entry, ignore_errors=True)
+        return self.load(network, netuid)
@@ -0,0 +1,227 @@
+"""
+Typed model of the system information document.
+
+Slotted dataclasses mirror the structure of gui/views/info.json. They can
+be built from and turned back into the nested dicts get_full_system_info
+produces, validated against their field types, serialized compactly
+(through orjson when it is installed) and diffed field by field, which
+skips whole subtrees whose dataclass equality holds.
+Diffs are the JSON Patch operations the heartbeat publishes.
+"""
+import dataclasses
+import json
+import sys
+import typing
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from core.heartbeat import json_diff
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# slots=True needs Python 3.10; older interpreters get regular dataclasses
+slotted_dataclass = dataclass(slots=True) if sys.version_info >= (3, 10) else dataclass
+
+
+class ValidationError(ValueError):
+    def __init__(self, errors):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+@slotted_dataclass
+class StorageSpec:
+    type: str
+    capacity: str
+    mountpoint: Optional[str] = None
+    volumes: Optional[List[Dict[str, Any]]] = None
+
+
+@slotted_dataclass
+class NetworkSpec:
+    internal_ip: str
+    ssh: str
+    open_ports: List[str]
+    username: str
+    auth_type: str
+    public_ip: Optional[str] = None
+
+
+@slotted_dataclass
+class CpuSpec:
+    model: Optional[str]
+    cores: Optional[int]
+    threads: Optional[int]
+    frequency: str
+
+
+@slotted_dataclass
+class GpuSpec:
+    model: str
+    vram: str
+    cuda_cores: Optional[int]
+    sm_count: Optional[int] = None
+    compute_capability: Optional[str] = None
+    max_sm_clock_mhz: Optional[int] = None
+    pcie_link: Optional[Dict[str, Any]] = None
+    power_limit_w: Optional[float] = None
+    pci_bus_id: Optional[str] = None
+
+
+@slotted_dataclass
+class ComputeResource:
+    id: str
+    resource_type: str
+    location: str
+    hourly_price: float
+    ram: str
+    storage: StorageSpec
+    network: NetworkSpec
+    cpu_specs: CpuSpec
+    gpu_specs: List[GpuSpec] = field(default_factory=list)
+    benchmark: Optional[Dict[str, Any]] = None
+
+
+@slotted_dataclass
+class HostInfo:
+    hostname: str
+    operating_system: str
+    ip_address: str
+    compute_resources: List[ComputeResource]
+    public_ip: Optional[str] = None
+    probe_status: Optional[Dict[str, str]] = None
+
+
+_type_hints = {}
+
+
+def _hints(cls):
+    if cls not in _type_hints:
+        _type_hints[cls] = typing.get_type_hints(cls)
+    return _type_hints[cls]
+
+
+def _unwrap_optional(annotation):
+    if typing.get_origin(annotation) is typing.Union:
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        return args[0], True
+    return annotation, False
+
+
+def _build(annotation, value):
+    annotation, _ = _unwrap_optional(annotation)
+    if value is None:
+        return None
+    if dataclasses.is_dataclass(annotation):
+        return from_dict(annotation, value)
+    if typing.get_origin(annotation) is list and dataclasses.is_dataclass(typing.get_args(annotation)[0]):
+        item_type = typing.get_args(annotation)[0]
+        return [from_dict(item_type, item) for item in value]
+    return value
+
+
+def from_dict(cls, data):
+    """
+    Build cls from a nested dict; keys the model does not know are ignored.
+    Raises ValidationError when a field without a default is missing.
+    """
+    hints = _hints(cls)
+    kwargs = {}
+    missing = []
+    for model_field in dataclasses.fields(cls):
+        if model_field.name in data:
+            kwargs[model_field.name] = _build(hints[model_field.name], data[model_field.name])
+        elif model_field.default is dataclasses.MISSING and model_field.default_factory is dataclasses.MISSING:
+            missing.append(f"{cls.__name__}.{model_field.name}: missing")
+    if missing:
+        raise ValidationError(missing)
+    return cls(**kwargs)
+
+
+def to_dict(instance):
+    """Nested dict/list form, as get_full_system_info returns it"""
+    if dataclasses.is_dataclass(instance):
+        return {model_field.name: to_dict(getattr(instance, model_field.name))
+                for model_field in dataclasses.fields(instance)}
+    if isinstance(instance, list):
+        return [to_dict(item) for item in instance]
+    return instance
+
+
+_PRIMITIVES = {str: (str,), int: (int,), float: (int, float), bool: (bool,)}
+
+
+def _check(annotation, value, path, errors):
+    annotation, optional = _unwrap_optional(annotation)
+    if value is None:
+        if not optional:
+            errors.append(f"{path}: required")
+        return
+    origin = typing.get_origin(annotation)
+    if dataclasses.is_dataclass(annotation):
+        if not isinstance(value, annotation):
+            errors.append(f"{path}: expected {annotation.__name__}")
+            return
+        for model_field in dataclasses.fields(annotation):
+            _check(_hints(annotation)[model_field.name], getattr(value, model_field.name),
+                   f"{path}.{model_field.name}", errors)
+    elif origin is list:
+        if not isinstance(value, list):
+            errors.append(f"{path}: expected list")
+            return
+        item_type = typing.get_args(annotation)[0]
+        for index, item in enumerate(value):
+            _check(item_type, item, f"{path}[{index}]", errors)
+    elif origin is dict:
+        if not isinstance(value, dict):
+            errors.append(f"{path}: expected object")
+    elif annotation in _PRIMITIVES:
+        if not isinstance(value, _PRIMITIVES[annotation]) or (annotation is not bool and isinstance(value, bool)):
+            errors.append(f"{path}: expected {annotation.__name__}, got {type(value).__name__}")
+
+
+def validate(instance, raise_error=True):
+    """Type-check every field; returns the list of problems or raises ValidationError"""
+    errors = []
+    _check(type(instance), instance, type(instance).__name__, errors)
+    if errors and raise_error:
+        raise ValidationError(errors)
+    return errors
+
+
+def validate_host(data):
+    """HostInfo built from one entry of the system information document; raises ValidationError"""
+    host = from_dict(HostInfo, data)
+    validate(host)
+    return host
+
+
+def dumps(instance, pretty=False):
+    """Serialize a model (or list of models) to a JSON string, compact unless pretty"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(instance, option=orjson.OPT_INDENT_2 if pretty else 0).decode()
+    if pretty:
+        return json.dumps(to_dict(instance), indent=2)
+    return json.dumps(to_dict(instance), separators=(",", ":"))
+
+
+def diff(old, new, path=""):
+    """
+    JSON Patch operations turning old into new, as core.heartbeat.json_diff
+    produces them for the dict form. Equal subtrees are skipped through a
+    single equality check, so unchanged snapshots cost one comparison per
+    top-level field; changed non-model values are handed to json_diff.
+    """
+    if old == new:
+        return []
+    if dataclasses.is_dataclass(old) and type(old) is type(new):
+        ops = []
+        for model_field in dataclasses.fields(old):
+            ops.extend(diff(getattr(old, model_field.name), getattr(new, model_field.name),
+                            f"{path}/{model_field.name}"))
+        return ops
+    return json_diff(to_dict(old), to_dict(new), path)
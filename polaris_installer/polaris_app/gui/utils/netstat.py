@@ -0,0 +1,178 @@
+"""
+Listening socket discovery from /proc/net, without forking ss or netstat.
+
+/proc/net/{tcp,tcp6,udp,udp6} list every socket with hex encoded addresses
+and an inode; owning processes are found by matching that inode against
+the socket links in /proc/<pid>/fd. PortWatcher polls the same files and
+only resolves owners for sockets it has not seen before, which keeps a
+once-per-second poll cheap.
+"""
+import ipaddress
+import os
+import socket
+import struct
+import threading
+from collections import namedtuple
+
+PROC_ROOT = "/proc"
+PROTOCOLS = ("tcp", "tcp6", "udp", "udp6")
+
+# Socket states from include/net/tcp_states.h
+TCP_LISTEN = "0A"
+UDP_UNCONNECTED = "07"
+
+ListeningSocket = namedtuple("ListeningSocket", ["protocol", "address", "port", "pid", "inode"])
+
+
+def _decode_address(hex_address):
+    """'0100007F:1F90' -> ('127.0.0.1', 8080). The kernel prints each 32-bit word in host order"""
+    host, port = hex_address.split(":")
+    packed = b"".join(struct.pack("=I", int(host[i:i + 8], 16)) for i in range(0, len(host), 8))
+    family = socket.AF_INET if len(packed) == 4 else socket.AF_INET6
+    return socket.inet_ntop(family, packed), int(port, 16)
+
+
+def _read_table(path):
+    try:
+        with open(path, "r") as f:
+            return f.read().splitlines()[1:]
+    except OSError:
+        return None
+
+
+def parse_proc_net(protocol, proc_root=PROC_ROOT):
+    """
+    Listening entries of one /proc/net table as ListeningSocket tuples with
+    pid None. TCP sockets count when in LISTEN state, UDP sockets when bound
+    and unconnected. Returns None when the table cannot be read.
+    """
+    lines = _read_table(os.path.join(proc_root, "net", protocol))
+    if lines is None:
+        return None
+    listening_state = TCP_LISTEN if protocol.startswith("tcp") else UDP_UNCONNECTED
+    sockets = []
+    for line in lines:
+        fields = line.split()
+        if len(fields) < 10 or fields[3] != listening_state:
+            continue
+        try:
+            address, port = _decode_address(fields[1])
+        except (ValueError, struct.error, OSError):
+            continue
+        sockets.append(ListeningSocket(protocol, address, port, None, int(fields[9])))
+    return sockets
+
+
+def socket_owners(inodes, proc_root=PROC_ROOT):
+    """Map socket inodes to owning PIDs. Processes we may not inspect are skipped"""
+    wanted = {f"socket:[{inode}]": inode for inode in inodes if inode}
+    owners = {}
+    if not wanted:
+        return owners
+    try:
+        pids = [entry for entry in os.listdir(proc_root) if entry.isdigit()]
+    except OSError:
+        return owners
+    for pid in pids:
+        fd_dir = os.path.join(proc_root, pid, "fd")
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            continue
+        for fd in fds:
+            try:
+                target = os.readlink(os.path.join(fd_dir, fd))
+            except OSError:
+                continue
+            inode = wanted.get(target)
+            if inode is not None and inode not in owners:
+                owners[inode] = int(pid)
+                if len(owners) == len(wanted):
+                    return owners
+    return owners
+
+
+def listening_sockets(protocols=PROTOCOLS, resolve_pids=True, proc_root=PROC_ROOT):
+    """
+    All listening sockets for the given protocols. Returns None when no
+    table could be read, e.g. on systems without procfs.
+    """
+    sockets = []
+    readable = False
+    for protocol in protocols:
+        entries = parse_proc_net(protocol, proc_root)
+        if entries is None:
+            continue
+        readable = True
+        sockets.extend(entries)
+    if not readable:
+        return None
+    if resolve_pids:
+        owners = socket_owners([entry.inode for entry in sockets], proc_root)
+        sockets = [entry._replace(pid=owners.get(entry.inode)) for entry in sockets]
+    return sockets
+
+
+def is_loopback(address):
+    try:
+        return ipaddress.ip_address(address).is_loopback
+    except ValueError:
+        return False
+
+
+class PortWatcher:
+    """
+    Polls /proc/net for listening sockets. poll() returns (added, removed)
+    since the previous poll; owners are resolved only for new sockets.
+    """
+
+    def __init__(self, protocols=PROTOCOLS, resolve_pids=True, proc_root=PROC_ROOT):
+        self.protocols = protocols
+        self.resolve_pids = resolve_pids
+        self.proc_root = proc_root
+        self.sockets = {}
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def poll(self):
+        current = {}
+        for protocol in self.protocols:
+            for entry in parse_proc_net(protocol, self.proc_root) or []:
+                current[(entry.protocol, entry.address, entry.port, entry.inode)] = entry
+
+        new_keys = [key for key in current if key not in self.sockets]
+        owners = {}
+        if self.resolve_pids and new_keys:
+            owners = socket_owners([current[key].inode for key in new_keys], self.proc_root)
+
+        added = []
+        for key, entry in current.items():
+            if key in self.sockets:
+                current[key] = self.sockets[key]
+            else:
+                current[key] = entry._replace(pid=owners.get(entry.inode))
+                added.append(current[key])
+        removed = [entry for key, entry in self.sockets.items() if key not in current]
+        self.sockets = current
+        return added, removed
+
+    def snapshot(self):
+        return list(self.sockets.values())
+
+    def start(self, on_change, interval=1.0):
+        """Poll on a daemon thread and call on_change(added, removed) when something changed"""
+        self.stopped.clear()
+
+        def loop():
+            while True:
+                added, removed = self.poll()
+                if added or removed:
+                    on_change(added, removed)
+                if self.stopped.wait(interval):
+                    break
+
+        self.thread = threading.Thread(target=loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
@@ -0,0 +1,93 @@
+"""
+Concurrent, time-bounded probes for system information.
+
+Every probe runs on its own daemon thread with its own deadline. A probe
+that misses its deadline or fails reports the last value it produced
+("stale") or the caller's default ("unavailable"), so one slow lookup never
+blocks the others. A probe that finishes after its deadline still refreshes
+the remembered value for the next run, and until it finishes later runs wait
+on that same execution instead of starting another thread for it.
+"""
+import threading
+import time
+
+PROBE_OK = "ok"
+PROBE_STALE = "stale"
+PROBE_UNAVAILABLE = "unavailable"
+
+DEFAULT_PROBE_TIMEOUT = 3.0
+
+
+class Probe:
+    """A named callable with a deadline and a fallback value"""
+
+    def __init__(self, name, func, timeout=DEFAULT_PROBE_TIMEOUT, default=None):
+        self.name = name
+        self.func = func
+        self.timeout = timeout
+        self.default = default
+
+
+class ProbeResult:
+    def __init__(self, value, status, elapsed):
+        self.value = value
+        self.status = status
+        self.elapsed = elapsed
+
+
+class ProbeEngine:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.last_values = {}
+        # name -> (outcome, done) of the execution still running for that probe
+        self.in_flight = {}
+
+    def run(self, probes):
+        """Run probes concurrently and return {name: ProbeResult} once every one has finished or expired"""
+        started = time.monotonic()
+        pending = {}
+        for probe in probes:
+            with self.lock:
+                execution = self.in_flight.get(probe.name)
+                if execution is None:
+                    execution = ({}, threading.Event())
+                    self.in_flight[probe.name] = execution
+                    threading.Thread(target=self._execute, args=(probe,) + execution, daemon=True).start()
+            pending[probe.name] = (probe,) + execution
+
+        results = {}
+        for name, (probe, outcome, done) in pending.items():
+            remaining = started + probe.timeout - time.monotonic()
+            finished = done.wait(max(remaining, 0))
+            elapsed = time.monotonic() - started
+            if finished and "value" in outcome:
+                results[name] = ProbeResult(outcome["value"], PROBE_OK, elapsed)
+                continue
+            with self.lock:
+                if name in self.last_values:
+                    results[name] = ProbeResult(self.last_values[name], PROBE_STALE, elapsed)
+                else:
+                    results[name] = ProbeResult(probe.default, PROBE_UNAVAILABLE, elapsed)
+        return results
+
+    def _execute(self, probe, outcome, done):
+        try:
+            value = probe.func()
+        except Exception:
+            with self.lock:
+                del self.in_flight[probe.name]
+            done.set()
+            return
+        with self.lock:
+            self.last_values[probe.name] = value
+            outcome["value"] = value
+            del self.in_flight[probe.name]
+        done.set()
+
+
+# Shared so stale values survive between calls
+_engine = ProbeEngine()
+
+
+def run_probes(probes):
+    return _engine.run(probes)
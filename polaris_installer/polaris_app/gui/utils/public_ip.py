@@ -0,0 +1,203 @@
+"""
+Public IP discovery raced across several providers.
+
+Every configured provider is queried at once on its own thread; the first
+address reported by enough providers wins, and the answer is cached for a
+TTL. Providers are plain-text HTTP endpoints or STUN servers
+("stun:host:port"), so a local stand-in of either kind can be used in tests.
+A lightweight monitor re-resolves in the background when the host's
+network interfaces change.
+"""
+import ipaddress
+import os
+import queue
+import socket
+import struct
+import threading
+import time
+
+import psutil
+import requests
+
+from config.env import PUBLIC_IP_PROVIDERS
+
+DEFAULT_PROVIDERS = [
+    "https://api.ipify.org",
+    "https://checkip.amazonaws.com",
+    "https://icanhazip.com",
+    "stun:stun.l.google.com:19302",
+    "stun:stun.cloudflare.com:3478",
+]
+RESOLVE_TIMEOUT = 3.0
+CACHE_TTL = 300.0
+QUORUM = 2
+MONITOR_INTERVAL = 5.0
+
+STUN_BINDING_REQUEST = 0x0001
+STUN_BINDING_RESPONSE = 0x0101
+STUN_MAGIC_COOKIE = 0x2112A442
+STUN_MAPPED_ADDRESS = 0x0001
+STUN_XOR_MAPPED_ADDRESS = 0x0020
+
+
+def _valid_ip(text):
+    try:
+        return str(ipaddress.ip_address(text.strip()))
+    except ValueError:
+        return None
+
+
+def query_http(url, timeout=RESOLVE_TIMEOUT):
+    response = requests.get(url, timeout=timeout)
+    response.raise_for_status()
+    return _valid_ip(response.text)
+
+
+def _parse_stun_response(data, transaction_id):
+    if len(data) < 20:
+        return None
+    message_type, length, cookie = struct.unpack("!HHI", data[:8])
+    if message_type != STUN_BINDING_RESPONSE or cookie != STUN_MAGIC_COOKIE or data[8:20] != transaction_id:
+        return None
+    offset = 20
+    mapped = None
+    while offset + 4 <= min(len(data), 20 + length):
+        attribute, size = struct.unpack("!HH", data[offset:offset + 4])
+        value = data[offset + 4:offset + 4 + size]
+        offset += 4 + (size + 3) // 4 * 4
+        if attribute not in (STUN_XOR_MAPPED_ADDRESS, STUN_MAPPED_ADDRESS) or len(value) < 8 or value[1] != 0x01:
+            continue
+        address = struct.unpack("!I", value[4:8])[0]
+        if attribute == STUN_XOR_MAPPED_ADDRESS:
+            return socket.inet_ntoa(struct.pack("!I", address ^ STUN_MAGIC_COOKIE))
+        mapped = socket.inet_ntoa(struct.pack("!I", address))
+    return mapped
+
+
+def query_stun(host, port, timeout=RESOLVE_TIMEOUT):
+    """IPv4 address a STUN server sees us as (RFC 5389 binding request)"""
+    transaction_id = os.urandom(12)
+    request = struct.pack("!HHI", STUN_BINDING_REQUEST, 0, STUN_MAGIC_COOKIE) + transaction_id
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.settimeout(timeout)
+        sock.sendto(request, (host, port))
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            data, _ = sock.recvfrom(2048)
+            address = _parse_stun_response(data, transaction_id)
+            if address:
+                return address
+    return None
+
+
+def query_provider(provider, timeout=RESOLVE_TIMEOUT):
+    if provider.startswith("stun:"):
+        host, _, port = provider[len("stun:"):].rpartition(":")
+        return query_stun(host, int(port), timeout)
+    return query_http(provider, timeout)
+
+
+class PublicIPResolver:
+    def __init__(self, providers=None, timeout=RESOLVE_TIMEOUT, ttl=CACHE_TTL, quorum=QUORUM):
+        self.providers = list(providers or DEFAULT_PROVIDERS)
+        self.timeout = timeout
+        self.ttl = ttl
+        self.quorum = max(1, min(quorum, len(self.providers)))
+        self.lock = threading.Lock()
+        self.address = None
+        self.expires_at = 0.0
+        self.listeners = []
+        self.stopped = threading.Event()
+        self.monitor = None
+
+    def add_listener(self, callback):
+        """callback(address) is called when a background re-check finds a different address"""
+        self.listeners.append(callback)
+
+    def get(self, refresh=False):
+        """Cached public IP, resolving when expired. Returns None when no provider answered"""
+        with self.lock:
+            if not refresh and self.address and time.monotonic() < self.expires_at:
+                return self.address
+        address = self.resolve()
+        if address:
+            with self.lock:
+                self.address = address
+                self.expires_at = time.monotonic() + self.ttl
+        return address
+
+    def invalidate(self):
+        with self.lock:
+            self.expires_at = 0.0
+
+    def resolve(self):
+        """Race all providers; first address reported by `quorum` of them, else the first answer"""
+        answers = queue.Queue()
+
+        def ask(provider):
+            try:
+                answers.put(query_provider(provider, self.timeout))
+            except Exception:
+                answers.put(None)
+
+        for provider in self.providers:
+            threading.Thread(target=ask, args=(provider,), daemon=True).start()
+
+        deadline = time.monotonic() + self.timeout
+        votes = {}
+        first = None
+        for _ in self.providers:
+            try:
+                address = answers.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if not address:
+                continue
+            first = first or address
+            votes[address] = votes.get(address, 0) + 1
+            if votes[address] >= self.quorum:
+                return address
+        return first
+
+    def _interface_signature(self):
+        try:
+            return sorted((name, address.address) for name, addresses in psutil.net_if_addrs().items()
+                          for address in addresses if address.family in (socket.AF_INET, socket.AF_INET6))
+        except Exception:
+            return None
+
+    def start_monitor(self, interval=MONITOR_INTERVAL):
+        """Re-resolve in the background whenever interface addresses change"""
+        if self.monitor and self.monitor.is_alive():
+            return
+        self.stopped.clear()
+
+        def watch():
+            signature = self._interface_signature()
+            while not self.stopped.wait(interval):
+                current = self._interface_signature()
+                if current == signature:
+                    continue
+                signature = current
+                previous = self.address
+                address = self.get(refresh=True)
+                if address != previous:
+                    for callback in self.listeners:
+                        callback(address)
+
+        self.monitor = threading.Thread(target=watch, daemon=True)
+        self.monitor.start()
+
+    def stop_monitor(self):
+        self.stopped.set()
+
+
+_resolver = None
+
+
+def get_public_ip_resolver():
+    """Process-wide resolver using the providers from POLARIS_PUBLIC_IP_PROVIDERS"""
+    global _resolver
+    if _resolver is None:
+        _resolver = PublicIPResolver(PUBLIC_IP_PROVIDERS)
+    return _resolver
@@ -0,0 +1,244 @@
+"""
+Storage topology: mounted block devices and where miner data should live.
+
+Mounts come from /proc/self/mountinfo and are matched to their block device
+through /sys/dev/block, which also gives the parent disk's rotational flag
+and queue depth. Without procfs (macOS, Windows) psutil's partition list is
+used instead and the device details stay unknown. An optional short write
+probe measures real throughput per volume.
+"""
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import psutil
+
+PROC_MOUNTINFO = "/proc/self/mountinfo"
+SYS_ROOT = "/sys"
+STORAGE_FILE = Path.home() / '.polaris' / 'storage.json'
+
+MIN_DATA_FREE_BYTES = 10 * 1024 ** 3
+PROBE_BYTES = 64 * 1024 * 1024
+PROBE_BLOCK_BYTES = 1024 * 1024
+
+# Filesystems that store data but report an anonymous 0:xx device number
+# (btrfs subvolumes, ZFS datasets, container overlay roots)
+DISK_BACKED_FSTYPES = {"btrfs", "zfs", "overlay", "bcachefs", "ext4", "ext3", "ext2", "xfs", "f2fs"}
+
+# Preference order when no throughput was measured
+KIND_RANK = {"NVMe": 3, "SSD": 2, "HDD": 1, "Unknown": 0}
+
+
+def _read_text(path):
+    try:
+        with open(path, "r") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _unescape(path):
+    """mountinfo escapes spaces and similar characters as octal"""
+    return path.replace("\\040", " ").replace("\\011", "\t").replace("\\012", "\n").replace("\\134", "\\")
+
+
+def _device_details(major_minor, sys_root=SYS_ROOT):
+    """(partition name, disk name, rotational, queue depth, removable) for a block device number"""
+    link = os.path.join(sys_root, "dev", "block", major_minor)
+    if not os.path.exists(link):
+        return None
+    path = os.path.realpath(link)
+    name = os.path.basename(path)
+    # Partitions live inside their parent disk's directory
+    disk_path = os.path.dirname(path) if os.path.exists(os.path.join(path, "partition")) else path
+    disk = os.path.basename(disk_path)
+    rotational = _read_text(os.path.join(disk_path, "queue", "rotational"))
+    queue_depth = _read_text(os.path.join(disk_path, "queue", "nr_requests"))
+    removable = _read_text(os.path.join(disk_path, "removable"))
+    return (name, disk,
+            None if rotational is None else rotational == "1",
+            int(queue_depth) if queue_depth and queue_depth.isdigit() else None,
+            removable == "1")
+
+
+def _source_details(source, sys_root=SYS_ROOT):
+    """Device details through the mount source (/dev/...), for mounts whose own device number is anonymous"""
+    if not source.startswith("/dev/"):
+        return None
+    try:
+        device = os.stat(source).st_rdev
+    except OSError:
+        return None
+    return _device_details(f"{os.major(device)}:{os.minor(device)}", sys_root)
+
+
+def _kind(disk, rotational):
+    if disk and disk.startswith("nvme"):
+        return "NVMe"
+    if rotational is None:
+        return "Unknown"
+    return "HDD" if rotational else "SSD"
+
+
+def _procfs_mounts(mountinfo, sys_root):
+    try:
+        with open(mountinfo, "r") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    mounts = []
+    for line in lines:
+        fields = line.split()
+        if "-" not in fields:
+            continue
+        separator = fields.index("-")
+        major_minor, mountpoint = fields[2], _unescape(fields[4])
+        fstype, source = fields[separator + 1], fields[separator + 2]
+        details = _device_details(major_minor, sys_root) or _source_details(source, sys_root)
+        if details is None:
+            if fstype not in DISK_BACKED_FSTYPES and not source.startswith("/dev/"):
+                # Pseudo and network filesystems have no block device
+                continue
+            details = (os.path.basename(source), None, None, None, False)
+        mounts.append((mountpoint, source, fstype, major_minor, details))
+    return mounts
+
+
+def list_volumes(mountinfo=PROC_MOUNTINFO, sys_root=SYS_ROOT):
+    """One entry per mounted block device (bind mounts collapse to the shortest path)"""
+    mounts = _procfs_mounts(mountinfo, sys_root)
+    if mounts is None:
+        mounts = [(partition.mountpoint, partition.device, partition.fstype, partition.device,
+                   (os.path.basename(partition.device), None, None, None, False))
+                  for partition in psutil.disk_partitions(all=False)]
+
+    volumes = {}
+    for mountpoint, source, fstype, device_key, (name, disk, rotational, queue_depth, removable) in mounts:
+        if device_key in volumes and len(volumes[device_key]["mountpoint"]) <= len(mountpoint):
+            continue
+        try:
+            usage = shutil.disk_usage(mountpoint)
+        except OSError:
+            continue
+        volumes[device_key] = {
+            "mountpoint": mountpoint,
+            "device": source,
+            "disk": disk,
+            "fstype": fstype,
+            "kind": _kind(disk, rotational),
+            "rotational": rotational,
+            "queue_depth": queue_depth,
+            "removable": removable,
+            "total_bytes": usage.total,
+            "free_bytes": usage.free,
+            "throughput_mbps": None,
+        }
+    return sorted(volumes.values(), key=lambda volume: volume["mountpoint"])
+
+
+def _writable_dir(volume):
+    """A directory on the volume we can write to: the home directory if it lives there, else the mount root"""
+    home = str(Path.home())
+    if volume_for(home, [volume]) is volume and os.access(home, os.W_OK):
+        return home
+    if os.access(volume["mountpoint"], os.W_OK):
+        return volume["mountpoint"]
+    return None
+
+
+def probe_throughput(volume, nbytes=PROBE_BYTES):
+    """Sequential write throughput in MB/s including fsync, or None when the volume is not writable"""
+    directory = _writable_dir(volume)
+    if directory is None:
+        return None
+    block = os.urandom(PROBE_BLOCK_BYTES)
+    try:
+        fd, path = tempfile.mkstemp(prefix=".polaris-probe-", dir=directory)
+    except OSError:
+        return None
+    try:
+        started = time.perf_counter()
+        for _ in range(max(nbytes // PROBE_BLOCK_BYTES, 1)):
+            os.write(fd, block)
+        os.fsync(fd)
+        elapsed = time.perf_counter() - started
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+        os.remove(path)
+    return round(max(nbytes, PROBE_BLOCK_BYTES) / elapsed / 1e6, 1)
+
+
+def volume_for(path, volumes):
+    """Volume whose mountpoint is the longest prefix of path"""
+    path = os.path.realpath(path)
+    best = None
+    for volume in volumes:
+        mountpoint = volume["mountpoint"]
+        if path == mountpoint or path.startswith(mountpoint.rstrip(os.sep) + os.sep):
+            if best is None or len(mountpoint) > len(best["mountpoint"]):
+                best = volume
+    return best
+
+
+def pick_data_volume(volumes=None, min_free_bytes=MIN_DATA_FREE_BYTES, probe=False):
+    """
+    Fastest writable volume with at least min_free_bytes free. Measured
+    throughput decides when probe is set, otherwise NVMe > SSD > HDD, with
+    free space breaking ties. Removable devices such as USB sticks are never
+    picked.
+    """
+    volumes = list_volumes() if volumes is None else volumes
+    candidates = [volume for volume in volumes
+                  if volume["free_bytes"] >= min_free_bytes and not volume.get("removable")
+                  and _writable_dir(volume)]
+    if not candidates:
+        return None
+    if probe:
+        for volume in candidates:
+            volume["throughput_mbps"] = probe_throughput(volume)
+    return max(candidates, key=lambda volume: (volume["throughput_mbps"] or 0,
+                                               KIND_RANK[volume["kind"]],
+                                               volume["free_bytes"]))
+
+
+def stored_data_dir(path=STORAGE_FILE):
+    """Miner data directory chosen on an earlier run, or None"""
+    try:
+        with open(path, "r") as f:
+            stored = json.load(f).get("data_dir")
+    except (OSError, json.JSONDecodeError):
+        return None
+    if stored and os.path.isdir(os.path.dirname(stored)):
+        return Path(stored)
+    return None
+
+
+def miner_data_dir(default, path=STORAGE_FILE):
+    """
+    Directory for miner data and logs. The choice is made once and stored,
+    so logs do not move between runs; default is used when the best volume
+    already holds it or no volume qualifies.
+    """
+    stored = stored_data_dir(path)
+    if stored is not None:
+        return stored
+
+    volumes = list_volumes()
+    chosen = pick_data_volume(volumes)
+    data_dir = Path(default)
+    if chosen is not None and volume_for(str(Path(default).parent), volumes) is not chosen:
+        data_dir = Path(_writable_dir(chosen)) / "polaris"
+
+    try:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"data_dir": str(data_dir), "mountpoint": chosen["mountpoint"] if chosen else None}, f,
+                      indent=2)
+    except OSError:
+        pass
+    return data_dir
@@ -0,0 +1,174 @@
+"""
+Shared, long-lived subtensor connections.
+
+Opening a subtensor costs a websocket handshake plus a runtime metadata
+download, so one connection per network is kept open and reused by every
+caller. Idle connections are health-checked before being handed out and
+replaced when the check fails; failed connects are retried with exponential
+backoff instead of hammering an unreachable endpoint. A connection is used
+by one thread at a time, either for a whole with block through
+connection() or per call through the proxy shared() returns, since the
+underlying websocket does not multiplex concurrent requests.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+HEALTH_CHECK_INTERVAL = 30.0
+BACKOFF_INITIAL = 1.0
+BACKOFF_MAX = 60.0
+
+
+def _current_block(subtensor):
+    return subtensor.get_current_block()
+
+
+def _close(subtensor):
+    close = getattr(subtensor, "close", None)
+    if close:
+        try:
+            close()
+        except Exception:
+            pass
+
+
+class _Endpoint:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.subtensor = None
+        self.checked_at = 0.0
+        self.failures = 0
+        self.retry_at = 0.0
+        self.last_error = None
+
+
+class SharedSubtensor:
+    """
+    Stand-in for a pooled subtensor that can be handed to any thread. Every
+    method call takes the network's connection exclusively for its duration.
+    """
+
+    def __init__(self, pool, network):
+        self._pool = pool
+        self.network = network
+
+    def __getattr__(self, name):
+        with self._pool.connection(self.network) as subtensor:
+            value = getattr(subtensor, name)
+        if not callable(value):
+            return value
+
+        def call(*args, **kwargs):
+            with self._pool.connection(self.network) as subtensor:
+                return getattr(subtensor, name)(*args, **kwargs)
+
+        return call
+
+
+class SubtensorPool:
+    """
+    One connection per network. connect(network) opens a new connection
+    (bittensor.subtensor in the app); health_check(connection) must raise
+    or return a falsy value when the connection is no longer usable.
+    """
+
+    def __init__(self, connect, health_check=_current_block, check_interval=HEALTH_CHECK_INTERVAL,
+                 backoff_initial=BACKOFF_INITIAL, backoff_max=BACKOFF_MAX):
+        self.connect = connect
+        self.health_check = health_check
+        self.check_interval = check_interval
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.lock = threading.Lock()
+        self.endpoints = {}
+
+    def _endpoint(self, network):
+        with self.lock:
+            return self.endpoints.setdefault(network, _Endpoint())
+
+    def _healthy(self, endpoint):
+        if time.monotonic() - endpoint.checked_at < self.check_interval:
+            return True
+        try:
+            healthy = bool(self.health_check(endpoint.subtensor))
+        except Exception:
+            healthy = False
+        if healthy:
+            endpoint.checked_at = time.monotonic()
+        return healthy
+
+    def _open(self, network, endpoint):
+        now = time.monotonic()
+        if now < endpoint.retry_at:
+            raise ConnectionError(f"Could not connect to the {network} network, retrying in "
+                                  f"{endpoint.retry_at - now:.1f}s: {endpoint.last_error}")
+        try:
+            endpoint.subtensor = self.connect(network)
+        except Exception as e:
+            endpoint.failures += 1
+            endpoint.last_error = str(e)
+            delay = min(self.backoff_initial * 2 ** (endpoint.failures - 1), self.backoff_max)
+            endpoint.retry_at = time.monotonic() + delay
+            raise ConnectionError(f"Could not connect to the {network} network: {e}") from e
+        endpoint.failures = 0
+        endpoint.retry_at = 0.0
+        endpoint.last_error = None
+        endpoint.checked_at = time.monotonic()
+
+    def _acquire(self, network, endpoint):
+        if endpoint.subtensor is not None and not self._healthy(endpoint):
+            _close(endpoint.subtensor)
+            endpoint.subtensor = None
+        if endpoint.subtensor is None:
+            self._open(network, endpoint)
+        return endpoint.subtensor
+
+    @contextmanager
+    def connection(self, network):
+        """Healthy connection for network, held exclusively for the with block"""
+        endpoint = self._endpoint(network)
+        with endpoint.lock:
+            subtensor = self._acquire(network, endpoint)
+            try:
+                yield subtensor
+            except (ConnectionError, OSError, TimeoutError):
+                # Likely a dropped websocket; check it before the next use
+                endpoint.checked_at = 0.0
+                raise
+
+    def shared(self, network):
+        """
+        Thread-safe proxy for the network's connection. Connects first, so an
+        unreachable network raises ConnectionError here rather than on first use.
+        """
+        with self.connection(network):
+            pass
+        return SharedSubtensor(self, network)
+
+    def invalidate(self, network):
+        """Close the connection so the next use reconnects"""
+        endpoint = self._endpoint(network)
+        with endpoint.lock:
+            if endpoint.subtensor is not None:
+                _close(endpoint.subtensor)
+            endpoint.subtensor = None
+            endpoint.retry_at = 0.0
+
+    def status(self):
+        """{network: {"connected", "failures", "last_error"}} for display"""
+        with self.lock:
+            endpoints = dict(self.endpoints)
+        return {network: {"connected": endpoint.subtensor is not None,
+                          "failures": endpoint.failures,
+                          "last_error": endpoint.last_error}
+                for network, endpoint in endpoints.items()}
+
+    def close(self):
+        with self.lock:
+            endpoints = list(self.endpoints.values())
+            self.endpoints = {}
+        for endpoint in endpoints:
+            with endpoint.lock:
+                if endpoint.subtensor is not None:
+                    _close(endpoint.subtensor)
+                endpoint.subtensor = None
@@ -3,55 +3,85 @@ import socket
 import subprocess
 import os
 import shutil
-import re
 import getpass
 import json
 import psutil
-import requests
+
+from gui.utils.benchmark import load_benchmark
+from gui.utils.gpu_inventory import VENDOR_AMD, VENDOR_NVIDIA, get_gpu_inventory
+from gui.utils.models import validate_host
+from gui.utils.netstat import is_loopback, listening_sockets
+from gui.utils.probes import Probe, run_probes
+from gui.utils.public_ip import RESOLVE_TIMEOUT, get_public_ip_resolver
+from gui.utils.storage import volume_for, list_volumes, pick_data_volume, stored_data_dir
+
+
+# The resolver races its providers for up to RESOLVE_TIMEOUT
+PUBLIC_IP_TIMEOUT = RESOLVE_TIMEOUT + 0.5
+LOCAL_PROBE_TIMEOUT = 2.0
+GPU_PROBE_TIMEOUT = 5.0
+
+
+def _field_probes():
+    """Probe for each system information field: (func, timeout, default)"""
+    return {
+        "hostname": (socket.gethostname, LOCAL_PROBE_TIMEOUT, "localhost"),
+        "operating_system": (lambda: f"{platform.system()} {platform.release()}", LOCAL_PROBE_TIMEOUT, "Unknown"),
+        "cpu": (_get_cpu_info, LOCAL_PROBE_TIMEOUT,
+                {"model": platform.processor(), "cores": None, "threads": None, "frequency": "Unknown"}),
+        "memory": (_get_memory_info, LOCAL_PROBE_TIMEOUT, "Unknown"),
+        "gpus": (_get_gpu_info, GPU_PROBE_TIMEOUT, []),
+        "public_ip": (_get_public_ip, PUBLIC_IP_TIMEOUT, "Unavailable"),
+        "ip_address": (lambda: socket.gethostbyname(socket.gethostname()), LOCAL_PROBE_TIMEOUT, "127.0.0.1"),
+        "storage": (_get_disk_info, LOCAL_PROBE_TIMEOUT, {"type": "Unknown", "capacity": "Unknown"}),
+        "open_ports": (_get_open_ports, LOCAL_PROBE_TIMEOUT, []),
+        # Its fingerprint check waits for the GPU inventory
+        "benchmark": (load_benchmark, GPU_PROBE_TIMEOUT, None),
+    }
+
+
+SYSTEM_INFO_FIELDS = ("hostname", "operating_system", "cpu", "memory", "gpus",
+                      "public_ip", "ip_address", "storage", "open_ports", "benchmark")
+
+
+def probe_fields(fields=SYSTEM_INFO_FIELDS):
+    """Run the probes for the given fields concurrently; returns {field: ProbeResult}"""
+    table = _field_probes()
+    return run_probes([Probe(name, *table[name]) for name in fields])
 
 
 def get_full_system_info(username=None, open_ports=None):
     """
     Gathers system information. Username and open_ports can be provided by user.
     If not provided, defaults are used for username, and open ports are detected.
+    Probes run concurrently with individual deadlines; "probe_status" reports
+    which values are fresh, stale or unavailable.
     """
-    # System identification
-    hostname = socket.gethostname()
-    try:
-        public_ip = requests.get('https://api.ipify.org').text.strip()
-    except:
-        public_ip = "Unavailable"
+    # User can specify open ports or we'll detect them
+    fields = [name for name in SYSTEM_INFO_FIELDS if name != "open_ports" or not open_ports]
+    results = probe_fields(fields)
+    values = {name: result.value for name, result in results.items()}
+    statuses = {name: result.status for name, result in results.items()}
+    return build_system_info(values, statuses, username, open_ports)
 
-    try:
-        ip_address = socket.gethostbyname(hostname)
-    except:
-        ip_address = "127.0.0.1"
 
-    # OS information
-    os_name = f"{platform.system()} {platform.release()}"
+def build_system_info(values, statuses, username=None, open_ports=None):
+    """Assemble the node description from probed field values; raises ValidationError on a malformed one"""
+    hostname = values["hostname"]
+    os_name = values["operating_system"]
+    public_ip = values["public_ip"]
+    ip_address = values["ip_address"]
+    cpu_info = values["cpu"]
+    memory = values["memory"]
+    storage = values["storage"]
+    gpus = values["gpus"]
 
-    # CPU information
-    cpu_info = {
-        "model": platform.processor(),
-        "cores": psutil.cpu_count(logical=False),
-        "threads": psutil.cpu_count(logical=True),
-        "frequency": f"{psutil.cpu_freq().current:.2f} MHz" if psutil.cpu_freq() else "Unknown"
-    }
-
-    # Memory and storage
-    memory = f"{round(psutil.virtual_memory().total / (1024 ** 3), 2)} GB"
-    storage = _get_disk_info()
-    
-    # GPU information
-    gpus = _get_gpu_info()
-    
     # Use provided username or get current user as fallback
     if not username:
         username = getpass.getuser()
     
-    # User can specify open ports or we'll detect them
     if not open_ports:
-        detected_ports = _get_open_ports()
+        detected_ports = values["open_ports"]
         open_ports = detected_ports[:2] if detected_ports else ["22", "8080"]
     
     # Ensure ports is a list of strings
@@ -64,7 +94,8 @@ def get_full_system_info(username=None, open_ports=None):
     ssh_port = open_ports[0] if open_ports else "22"
     ssh_conn = f"ssh://{username}@{public_ip}:{ssh_port}"
 
-    return [{
+    host = {
+        "probe_status": statuses,
         "hostname": hostname,
         "operating_system": os_name,
         "ip_address": ip_address,
@@ -85,44 +116,100 @@ def get_full_system_info(username=None, open_ports=None):
                 "auth_type": "public_key"
             },
             "cpu_specs": cpu_info,
-            "gpu_specs": gpus
+            "gpu_specs": gpus,
+            "benchmark": values["benchmark"]
         }]
-    }]
+    }
+    validate_host(host)
+    return [host]
+
+
+def _get_public_ip():
+    public_ip = get_public_ip_resolver().get()
+    if not public_ip:
+        raise OSError("no public IP provider answered")
+    return public_ip
+
+
+def _get_cpu_info():
+    frequency = psutil.cpu_freq()
+    return {
+        "model": platform.processor(),
+        "cores": psutil.cpu_count(logical=False),
+        "threads": psutil.cpu_count(logical=True),
+        "frequency": f"{frequency.current:.2f} MHz" if frequency else "Unknown"
+    }
+
+
+def _get_memory_info():
+    return f"{round(psutil.virtual_memory().total / (1024 ** 3), 2)} GB"
 
 
 def _get_disk_info():
+    """The miner data volume's type and capacity, plus every mounted volume"""
     try:
-        total, used, free = shutil.disk_usage("/")
+        volumes = list_volumes()
+        # Report the volume miner data was placed on; pick one only before that choice exists
+        data_dir = stored_data_dir()
+        data_volume = volume_for(str(data_dir.parent), volumes) if data_dir is not None else None
+        data_volume = data_volume or pick_data_volume(volumes) or volume_for("/", volumes)
+        if data_volume is None:
+            raise OSError("no mounted volumes found")
         return {
-            "type": "SSD/HDD",
-            "capacity": f"{round(total / (1024 ** 3), 2)} GB"
+            "type": data_volume["kind"],
+            "capacity": f"{round(data_volume['total_bytes'] / (1024 ** 3), 2)} GB",
+            "mountpoint": data_volume["mountpoint"],
+            "volumes": volumes
         }
     except:
-        return {"type": "Unknown", "capacity": "Unknown"}
+        try:
+            total, used, free = shutil.disk_usage("/")
+            return {
+                "type": "Unknown",
+                "capacity": f"{round(total / (1024 ** 3), 2)} GB"
+            }
+        except:
+            return {"type": "Unknown", "capacity": "Unknown"}
 
 
 def _get_gpu_info():
+    """Discrete GPUs; cuda_cores is None when it cannot be derived"""
     gpus = []
-    try:
-        result = subprocess.run(["nvidia-smi", "--query-gpu=name,memory.total", "--format=csv,noheader"], 
-                                capture_output=True, text=True)
-        if result.returncode == 0:
-            for line in result.stdout.strip().splitlines():
-                name, mem = line.split(",", 1)
-                gpus.append({
-                    "model": name.strip(),
-                    "vram": mem.strip(),
-                    "cuda_cores": 8704  # Default CUDA cores value
-                })
-    except:
-        pass
+    for gpu in get_gpu_inventory().get():
+        if gpu["vendor_id"] not in (VENDOR_NVIDIA, VENDOR_AMD):
+            continue
+        gpus.append({
+            "model": gpu["model"],
+            "vram": gpu["vram"],
+            "cuda_cores": gpu["cuda_cores"],
+            "sm_count": gpu["sm_count"],
+            "compute_capability": gpu["compute_capability"],
+            "max_sm_clock_mhz": gpu["max_sm_clock_mhz"],
+            "pcie_link": gpu["pcie_link"],
+            "power_limit_w": gpu["power_limit_w"],
+            "pci_bus_id": gpu["pci_bus_id"],
+        })
     return gpus
 
 
 def _get_open_ports():
+    """TCP ports listening on a non-loopback address, in numeric order"""
+    sockets = listening_sockets(protocols=("tcp", "tcp6"), resolve_pids=False)
+    if sockets is not None:
+        ports = {entry.port for entry in sockets if not is_loopback(entry.address)}
+        return [str(port) for port in sorted(ports)]
+
+    # No procfs (e.g. macOS): fall back to ss where it exists
     try:
-        result = subprocess.run(["ss", "-tuln"], capture_output=True, text=True)
-        ports = re.findall(r":(\d+)\s", result.stdout)
-        return sorted(set(ports))
+        result = subprocess.run(["ss", "-tln"], capture_output=True, text=True, timeout=LOCAL_PROBE_TIMEOUT)
+        ports = set()
+        for line in result.stdout.splitlines()[1:]:
+            fields = line.split()
+            if len(fields) < 4:
+                continue
+            address, _, port = fields[3].rpartition(":")
+            if port.isdigit() and not is_loopback(address.strip("[]").split("%")[0]):
+                ports.add(int(port))
+        return [str(port) for port in sorted(ports)]
     except:
         return []
@@ -0,0 +1,213 @@
+"""
+Continuous host telemetry with constant memory.
+
+A daemon thread samples CPU per core, memory, disk I/O, network throughput
+and (through pynvml, when installed) GPU utilization at a fixed rate. Each
+metric lives in a preallocated array ring buffer, so weeks of uptime cost
+the same memory as the first hour. Every sample only reads kernel counters
+through psutil; nothing is forked.
+"""
+import math
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+import psutil
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import pynvml
+    NVML_AVAILABLE = True
+except ImportError:
+    NVML_AVAILABLE = False
+
+DEFAULT_INTERVAL = 1.0
+# One hour at the default rate
+DEFAULT_CAPACITY = 3600
+
+
+class RingBuffer:
+    """Fixed-size float ring buffer backed by array('d')"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.data = array("d", [math.nan]) * capacity
+        self.index = 0
+        self.count = 0
+
+    def append(self, value):
+        self.data[self.index] = math.nan if value is None else value
+        self.index = (self.index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def values(self, last=None):
+        """The newest `last` values (all by default), oldest first"""
+        count = self.count if last is None else min(last, self.count)
+        start = (self.index - count) % self.capacity
+        if start + count <= self.capacity:
+            return self.data[start:start + count]
+        return self.data[start:] + self.data[:self.index]
+
+    def __len__(self):
+        return self.count
+
+
+def percentile(values, fraction):
+    """Percentile of a sequence without NaNs; interpolated with NumPy, nearest rank without it"""
+    if NUMPY_AVAILABLE:
+        return float(np.percentile(np.frombuffer(array("d", values), dtype=np.float64), fraction * 100))
+    ordered = sorted(values)
+    rank = max(math.ceil(fraction * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+class TelemetrySampler:
+    """
+    Samples host metrics every `interval` seconds into ring buffers that hold
+    `capacity` samples each. Metric names: cpu.total, cpu.core<N>,
+    memory.percent, memory.used, disk.read_bps, disk.write_bps,
+    net.sent_bps, net.recv_bps, gpu<N>.util, gpu<N>.memory_used.
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL, capacity=DEFAULT_CAPACITY, gpu=True):
+        self.interval = interval
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self.timestamps = RingBuffer(capacity)
+        self.series = {}
+        self.stopped = threading.Event()
+        self.thread = None
+        self.previous = None
+        self.gpu_handles = self._init_gpus() if gpu else []
+
+    def _init_gpus(self):
+        if not NVML_AVAILABLE:
+            return []
+        try:
+            pynvml.nvmlInit()
+            return [pynvml.nvmlDeviceGetHandleByIndex(i) for i in range(pynvml.nvmlDeviceGetCount())]
+        except Exception:
+            return []
+
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return self
+        self.stopped.clear()
+        # Prime the counters so the first stored sample already has rates
+        psutil.cpu_percent(percpu=True)
+        self.previous = self._read_counters()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+
+    def _run(self):
+        next_sample = time.monotonic() + self.interval
+        while not self.stopped.wait(max(next_sample - time.monotonic(), 0)):
+            next_sample += self.interval
+            try:
+                self.sample()
+            except Exception:
+                continue
+
+    def _read_counters(self):
+        disk = psutil.disk_io_counters()
+        net = psutil.net_io_counters()
+        return (time.monotonic(),
+                (disk.read_bytes, disk.write_bytes) if disk else (0, 0),
+                (net.bytes_sent, net.bytes_recv) if net else (0, 0))
+
+    def sample(self):
+        """Take one sample of every metric"""
+        values = {}
+        cores = psutil.cpu_percent(percpu=True)
+        for core, value in enumerate(cores):
+            values[f"cpu.core{core}"] = value
+        values["cpu.total"] = sum(cores) / len(cores) if cores else None
+
+        memory = psutil.virtual_memory()
+        values["memory.percent"] = memory.percent
+        values["memory.used"] = memory.total - memory.available
+
+        counters = self._read_counters()
+        if self.previous:
+            elapsed = counters[0] - self.previous[0] or self.interval
+            values["disk.read_bps"] = (counters[1][0] - self.previous[1][0]) / elapsed
+            values["disk.write_bps"] = (counters[1][1] - self.previous[1][1]) / elapsed
+            values["net.sent_bps"] = (counters[2][0] - self.previous[2][0]) / elapsed
+            values["net.recv_bps"] = (counters[2][1] - self.previous[2][1]) / elapsed
+        self.previous = counters
+
+        for index, handle in enumerate(self.gpu_handles):
+            try:
+                values[f"gpu{index}.util"] = pynvml.nvmlDeviceGetUtilizationRates(handle).gpu
+                values[f"gpu{index}.memory_used"] = pynvml.nvmlDeviceGetMemoryInfo(handle).used
+            except Exception:
+                values[f"gpu{index}.util"] = None
+
+        self.record(time.time(), values)
+
+    def record(self, timestamp, values):
+        """Store one sample; metrics missing from values get a gap"""
+        with self.lock:
+            for name in values:
+                if name not in self.series:
+                    series = RingBuffer(self.capacity)
+                    # Align a new metric with samples taken before it appeared
+                    for _ in range(len(self.timestamps)):
+                        series.append(None)
+                    self.series[name] = series
+            self.timestamps.append(timestamp)
+            for name, series in self.series.items():
+                series.append(values.get(name))
+
+    def metrics(self):
+        with self.lock:
+            return sorted(self.series)
+
+    def window(self, metric, seconds=None):
+        """[(timestamp, value)] for the last `seconds` (everything by default), oldest first"""
+        with self.lock:
+            series = self.series.get(metric)
+            if series is None:
+                return []
+            timestamps = self.timestamps.values()
+            values = series.values()
+        if seconds is not None and timestamps:
+            cutoff = timestamps[-1] - seconds
+            start = bisect_left(timestamps, cutoff)
+            timestamps, values = timestamps[start:], values[start:]
+        return [(timestamp, value) for timestamp, value in zip(timestamps, values) if not math.isnan(value)]
+
+    def aggregate(self, metric, seconds=None):
+        """min/max/mean/p95/last over a window, or None when there are no samples"""
+        values = [value for _, value in self.window(metric, seconds)]
+        if not values:
+            return None
+        return {
+            "count": len(values),
+            "min": min(values),
+            "max": max(values),
+            "mean": sum(values) / len(values),
+            "p95": percentile(values, 0.95),
+            "last": values[-1],
+        }
+
+
+_sampler = None
+
+
+def get_sampler(interval=DEFAULT_INTERVAL, capacity=DEFAULT_CAPACITY):
+    """Process-wide sampler; interval and capacity apply on first use"""
+    global _sampler
+    if _sampler is None:
+        _sampler = TelemetrySampler(interval, capacity)
+    return _sampler
@@ -0,0 +1,103 @@
+"""
+Tests for resolve_uids over a metagraph cache with an injected chain connection.
+"""
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+
+from gui.utils import bittensor_utils
+from gui.utils.metagraph_cache import ARRAYS, MetagraphCache
+
+
+class FakeChain:
+    """Stands in for pooled subtensor connections: {(network, netuid): [(uid, hotkey, coldkey)]}"""
+
+    def __init__(self, neurons, block=1000):
+        self.neurons = neurons
+        self.block = block
+        self.lock = threading.Lock()
+        self.fetches = []
+
+    @contextmanager
+    def connect(self, network):
+        if network == "offline":
+            raise ConnectionError("Could not connect to the offline network")
+        yield SimpleNamespace(metagraph=lambda netuid: self.metagraph(network, netuid))
+
+    def metagraph(self, network, netuid):
+        with self.lock:
+            self.fetches.append((network, netuid))
+        rows = self.neurons[(network, netuid)]
+        zeros = [0.0] * len(rows)
+        return SimpleNamespace(block=self.block, uids=[row[0] for row in rows], hotkeys=[row[1] for row in rows],
+                               coldkeys=[row[2] for row in rows], S=zeros, I=zeros, E=zeros)
+
+
+class ResolveUidsTest(unittest.TestCase):
+    def setUp(self):
+        self.chain = FakeChain({
+            ("finney", 49): [(0, "5Alice", "5Cold"), (1, "5Bob", "5Cold"), (2, "5Alice", "5Other")],
+            ("test", 100): [(0, "5Carol", "5Cold")],
+        })
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache = MetagraphCache(self.chain.connect, root=directory.name)
+        for patcher in (mock.patch.object(bittensor_utils, "_metagraph_cache", self.cache),
+                        mock.patch.object(bittensor_utils, "BITTENSOR_AVAILABLE", True)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def resolve(self, targets):
+        return {(result["network"], result["netuid"], result["hotkey"]): result
+                for result in bittensor_utils.resolve_uids(targets)}
+
+    def test_each_metagraph_is_fetched_once(self):
+        results = self.resolve([("finney", 49, "5Bob"), ("finney", "49", "5Alice"), ("test", 100, "5Carol")])
+        self.assertEqual(len(results), 3)
+        self.assertEqual(sorted(self.chain.fetches), [("finney", 49), ("test", 100)])
+        self.assertEqual(results[("test", 100, "5Carol")]["uid"], 0)
+        self.assertEqual(results[("finney", 49, "5Bob")]["block"], 1000)
+
+    def test_hotkey_with_several_uids_reports_all_of_them(self):
+        result = self.resolve([("finney", 49, "5Alice")])[("finney", 49, "5Alice")]
+        self.assertEqual((result["uids"], result["uid"]), ([0, 2], 0))
+
+    def test_unregistered_hotkey(self):
+        result = self.resolve([("finney", 49, "5Nobody")])[("finney", 49, "5Nobody")]
+        self.assertEqual((result["uids"], result["uid"]), ([], None))
+        self.assertNotIn("error", result)
+
+    def test_recent_registration_refreshes_an_aged_snapshot(self):
+        rows = self.chain.neurons[("finney", 49)]
+        arrays = {"uids": np.array([row[0] for row in rows], dtype=np.int64),
+                  "hotkeys": np.array([row[1] for row in rows], dtype="<U48"),
+                  "coldkeys": np.array([row[2] for row in rows], dtype="<U48")}
+        arrays.update({name: np.zeros(len(rows)) for name in ARRAYS if name not in arrays})
+        self.cache.store("finney", 49, 990, arrays, synced_at=time.time() - 60)
+        rows.append((3, "5Dave", "5Cold"))
+
+        result = self.resolve([("finney", 49, "5Dave")])[("finney", 49, "5Dave")]
+        self.assertEqual(result["uid"], 3)
+        self.assertEqual(self.chain.fetches, [("finney", 49)])
+
+    def test_unreachable_network_reports_errors_without_failing_the_rest(self):
+        results = self.resolve([("offline", 1, "5Alice"), ("offline", 1, "5Bob"), ("finney", 49, "5Bob")])
+        for hotkey in ("5Alice", "5Bob"):
+            result = results[("offline", 1, hotkey)]
+            self.assertEqual((result["uid"], result["uids"]), (None, []))
+            self.assertIn("offline", result["error"])
+        self.assertEqual(results[("finney", 49, "5Bob")]["uid"], 1)
+
+    def test_no_targets(self):
+        self.assertEqual(list(bittensor_utils.resolve_uids([])), [])
+        self.assertEqual(self.chain.fetches, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
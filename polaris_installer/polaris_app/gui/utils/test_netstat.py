@@ -0,0 +1,130 @@
+"""
+Tests for the /proc/net parser and PortWatcher against a fake /proc root.
+"""
+import os
+import socket
+import struct
+import sys
+import tempfile
+import unittest
+
+from gui.utils.netstat import PortWatcher, listening_sockets, parse_proc_net
+
+HEADER = "  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode\n"
+
+
+def _hex_ipv4(address, port):
+    # The kernel prints the address as a host-order 32-bit word
+    word = struct.unpack("=I", socket.inet_aton(address))[0]
+    return f"{word:08X}:{port:04X}"
+
+
+def _hex_ipv6(address, port):
+    packed = socket.inet_pton(socket.AF_INET6, address)
+    words = struct.unpack("=4I", packed)
+    return "".join(f"{word:08X}" for word in words) + f":{port:04X}"
+
+
+def _row(index, local, state, inode):
+    return (f"   {index}: {local} 00000000:0000 {state} 00000000:00000000 00:00000000 00000000  "
+            f"1000        0 {inode} 1 0000000000000000 100 0 0 10 0\n")
+
+
+class FakeProc:
+    def __init__(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        os.makedirs(os.path.join(self.root, "net"))
+
+    def table(self, protocol, rows):
+        with open(os.path.join(self.root, "net", protocol), "w") as f:
+            f.write(HEADER + "".join(_row(index, *row) for index, row in enumerate(rows)))
+
+    def process(self, pid, inodes):
+        fd_dir = os.path.join(self.root, str(pid), "fd")
+        os.makedirs(fd_dir, exist_ok=True)
+        for fd, inode in enumerate(inodes, 3):
+            os.symlink(f"socket:[{inode}]", os.path.join(fd_dir, str(fd)))
+
+
+class ParseProcNetTest(unittest.TestCase):
+    def setUp(self):
+        self.proc = FakeProc()
+        self.addCleanup(self.proc.directory.cleanup)
+
+    def test_tcp_keeps_only_listening_sockets(self):
+        self.proc.table("tcp", [(_hex_ipv4("0.0.0.0", 22), "0A", 1001),
+                                (_hex_ipv4("127.0.0.1", 8080), "0A", 1002),
+                                (_hex_ipv4("10.0.0.5", 51234), "01", 1003)])
+        sockets = parse_proc_net("tcp", self.proc.root)
+        self.assertEqual([(entry.address, entry.port, entry.inode) for entry in sockets],
+                         [("0.0.0.0", 22, 1001), ("127.0.0.1", 8080, 1002)])
+        self.assertTrue(all(entry.pid is None for entry in sockets))
+
+    @unittest.skipUnless(sys.byteorder == "little", "the sample row is from a little-endian host")
+    def test_kernel_sample_row(self):
+        with open(os.path.join(self.proc.root, "net", "tcp"), "w") as f:
+            f.write(HEADER + "   0: 0100007F:1F90 00000000:0000 0A 00000000:00000000 00:00000000 "
+                             "00000000  1000        0 51234 1 0000000000000000 100 0 0 10 0\n")
+        self.assertEqual(parse_proc_net("tcp", self.proc.root)[0][1:], ("127.0.0.1", 8080, None, 51234))
+
+    def test_udp_keeps_unconnected_sockets(self):
+        self.proc.table("udp", [(_hex_ipv4("0.0.0.0", 53), "07", 2001),
+                                (_hex_ipv4("10.0.0.5", 40000), "01", 2002)])
+        self.assertEqual([entry.port for entry in parse_proc_net("udp", self.proc.root)], [53])
+
+    def test_ipv6_addresses(self):
+        self.proc.table("tcp6", [(_hex_ipv6("::", 443), "0A", 3001),
+                                 (_hex_ipv6("::1", 9000), "0A", 3002)])
+        sockets = parse_proc_net("tcp6", self.proc.root)
+        self.assertEqual([(entry.address, entry.port) for entry in sockets], [("::", 443), ("::1", 9000)])
+
+    def test_malformed_rows_are_skipped(self):
+        with open(os.path.join(self.proc.root, "net", "tcp"), "w") as f:
+            f.write(HEADER + "   0: garbage\n" + _row(1, "ZZZZZZZZ:0016", "0A", 1)
+                    + _row(2, _hex_ipv4("0.0.0.0", 22), "0A", 2))
+        self.assertEqual([entry.inode for entry in parse_proc_net("tcp", self.proc.root)], [2])
+
+    def test_missing_table_is_none(self):
+        self.assertIsNone(parse_proc_net("udp6", self.proc.root))
+
+    def test_listening_sockets_resolves_owners(self):
+        self.proc.table("tcp", [(_hex_ipv4("0.0.0.0", 22), "0A", 1001),
+                                (_hex_ipv4("0.0.0.0", 80), "0A", 1002)])
+        self.proc.process(42, [1001])
+        sockets = listening_sockets(proc_root=self.proc.root)
+        self.assertEqual({entry.port: entry.pid for entry in sockets}, {22: 42, 80: None})
+
+    def test_listening_sockets_without_procfs_is_none(self):
+        with tempfile.TemporaryDirectory() as empty:
+            self.assertIsNone(listening_sockets(proc_root=empty))
+
+
+class PortWatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.proc = FakeProc()
+        self.addCleanup(self.proc.directory.cleanup)
+        self.watcher = PortWatcher(protocols=("tcp",), proc_root=self.proc.root)
+
+    def test_reports_added_and_removed_sockets(self):
+        self.proc.table("tcp", [(_hex_ipv4("0.0.0.0", 22), "0A", 1001)])
+        added, removed = self.watcher.poll()
+        self.assertEqual(([entry.port for entry in added], removed), ([22], []))
+
+        self.proc.table("tcp", [(_hex_ipv4("0.0.0.0", 8080), "0A", 1002)])
+        added, removed = self.watcher.poll()
+        self.assertEqual([entry.port for entry in added], [8080])
+        self.assertEqual([entry.port for entry in removed], [22])
+
+    def test_owners_are_resolved_only_for_new_sockets(self):
+        self.proc.table("tcp", [(_hex_ipv4("0.0.0.0", 22), "0A", 1001)])
+        self.proc.process(42, [1001])
+        self.watcher.poll()
+        # A later owner change is not picked up for a socket already known
+        os.unlink(os.path.join(self.proc.root, "42", "fd", "3"))
+        self.assertEqual(self.watcher.poll(), ([], []))
+        self.assertEqual([entry.pid for entry in self.watcher.snapshot()], [42])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Tests for ProbeEngine deadlines and its ok/stale/unavailable transitions.
+"""
+import threading
+import unittest
+
+from gui.utils.probes import PROBE_OK, PROBE_STALE, PROBE_UNAVAILABLE, Probe, ProbeEngine
+
+
+class ProbeEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = ProbeEngine()
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def blocking(self, value):
+        def func():
+            self.release.wait(5)
+            return value
+        return func
+
+    def test_fast_probe_is_ok(self):
+        result = self.engine.run([Probe("hostname", lambda: "node", timeout=1)])["hostname"]
+        self.assertEqual((result.value, result.status), ("node", PROBE_OK))
+
+    def test_first_failure_falls_back_to_default(self):
+        def fail():
+            raise OSError("no such device")
+        result = self.engine.run([Probe("gpus", fail, timeout=1, default=[])])["gpus"]
+        self.assertEqual((result.value, result.status), ([], PROBE_UNAVAILABLE))
+
+    def test_first_timeout_falls_back_to_default(self):
+        result = self.engine.run([Probe("public_ip", self.blocking("1.2.3.4"), timeout=0.05,
+                                        default="Unavailable")])["public_ip"]
+        self.assertEqual((result.value, result.status), ("Unavailable", PROBE_UNAVAILABLE))
+
+    def test_failure_after_success_reports_last_value_as_stale(self):
+        self.engine.run([Probe("memory", lambda: "16 GB", timeout=1)])
+
+        def fail():
+            raise OSError("gone")
+        result = self.engine.run([Probe("memory", fail, timeout=1, default="Unknown")])["memory"]
+        self.assertEqual((result.value, result.status), ("16 GB", PROBE_STALE))
+
+    def test_timeout_after_success_reports_last_value_as_stale(self):
+        self.engine.run([Probe("storage", lambda: "old", timeout=1)])
+        result = self.engine.run([Probe("storage", self.blocking("new"), timeout=0.05)])["storage"]
+        self.assertEqual((result.value, result.status), ("old", PROBE_STALE))
+
+    def test_late_result_refreshes_the_remembered_value(self):
+        self.engine.run([Probe("storage", self.blocking("late"), timeout=0.05, default="Unknown")])
+        self.release.set()
+        while "storage" in self.engine.in_flight:
+            threading.Event().wait(0.01)
+        self.assertEqual(self.engine.last_values["storage"], "late")
+
+        def fail():
+            raise OSError("gone")
+        result = self.engine.run([Probe("storage", fail, timeout=1, default="Unknown")])["storage"]
+        self.assertEqual((result.value, result.status), ("late", PROBE_STALE))
+
+    def test_slow_probe_does_not_delay_the_others(self):
+        results = self.engine.run([Probe("slow", self.blocking("slow"), timeout=0.05),
+                                   Probe("fast", lambda: "fast", timeout=1)])
+        self.assertEqual(results["fast"].status, PROBE_OK)
+        self.assertEqual(results["slow"].status, PROBE_UNAVAILABLE)
+
+    def test_in_flight_probe_is_not_started_again(self):
+        calls = []
+
+        def hanging():
+            calls.append(1)
+            self.release.wait(5)
+            return "done"
+
+        for _ in range(3):
+            result = self.engine.run([Probe("open_ports", hanging, timeout=0.02)])["open_ports"]
+            self.assertEqual(result.status, PROBE_UNAVAILABLE)
+        self.assertEqual(len(calls), 1)
+
+        # Once the execution finishes the next run starts a fresh one
+        self.release.set()
+        while "open_ports" in self.engine.in_flight:
+            threading.Event().wait(0.01)
+        result = self.engine.run([Probe("open_ports", hanging, timeout=1)])["open_ports"]
+        self.assertEqual((result.value, result.status), ("done", PROBE_OK))
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
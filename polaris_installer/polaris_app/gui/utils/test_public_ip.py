@@ -0,0 +1,143 @@
+"""
+Tests for the public IP quorum, using local HTTP and STUN stand-ins as providers.
+"""
+import socket
+import struct
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from gui.utils.public_ip import (STUN_BINDING_RESPONSE, STUN_MAGIC_COOKIE, STUN_MAPPED_ADDRESS,
+                                 STUN_XOR_MAPPED_ADDRESS, PublicIPResolver, _parse_stun_response,
+                                 query_provider)
+
+
+def _stun_response(transaction_id, address, attribute=STUN_XOR_MAPPED_ADDRESS):
+    value = struct.unpack("!I", socket.inet_aton(address))[0]
+    if attribute == STUN_XOR_MAPPED_ADDRESS:
+        value ^= STUN_MAGIC_COOKIE
+    body = struct.pack("!HHBBHI", attribute, 8, 0, 0x01, 0, value)
+    return struct.pack("!HHI", STUN_BINDING_RESPONSE, len(body), STUN_MAGIC_COOKIE) + transaction_id + body
+
+
+class HttpProvider:
+    """Plain-text IP endpoint on localhost answering after an optional delay"""
+
+    def __init__(self, test, answer, delay=0.0, status=200):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(delay)
+                self.send_response(status)
+                self.end_headers()
+                self.wfile.write(f"{answer}\n".encode())
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        test.addCleanup(self.server.server_close)
+        test.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+
+class StunProvider:
+    """STUN server on localhost that reports a fixed mapped address"""
+
+    def __init__(self, test, answer):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.settimeout(0.1)
+        self.stopped = threading.Event()
+        test.addCleanup(self.sock.close)
+        test.addCleanup(self.stopped.set)
+
+        def serve():
+            while not self.stopped.is_set():
+                try:
+                    data, peer = self.sock.recvfrom(2048)
+                except OSError:
+                    continue
+                self.sock.sendto(_stun_response(data[8:20], answer), peer)
+
+        threading.Thread(target=serve, daemon=True).start()
+        self.url = f"stun:127.0.0.1:{self.sock.getsockname()[1]}"
+
+
+class StunParserTest(unittest.TestCase):
+    transaction_id = bytes(range(12))
+
+    def test_xor_mapped_address(self):
+        response = _stun_response(self.transaction_id, "203.0.113.7")
+        self.assertEqual(_parse_stun_response(response, self.transaction_id), "203.0.113.7")
+
+    def test_plain_mapped_address(self):
+        response = _stun_response(self.transaction_id, "198.51.100.2", STUN_MAPPED_ADDRESS)
+        self.assertEqual(_parse_stun_response(response, self.transaction_id), "198.51.100.2")
+
+    def test_other_transaction_is_ignored(self):
+        response = _stun_response(bytes(12), "203.0.113.7")
+        self.assertIsNone(_parse_stun_response(response, self.transaction_id))
+
+    def test_truncated_response(self):
+        self.assertIsNone(_parse_stun_response(b"\x01\x01", self.transaction_id))
+
+
+class ProviderTest(unittest.TestCase):
+    def test_http_provider(self):
+        self.assertEqual(query_provider(HttpProvider(self, "203.0.113.7").url, timeout=2), "203.0.113.7")
+
+    def test_http_provider_with_garbage(self):
+        self.assertIsNone(query_provider(HttpProvider(self, "<html>").url, timeout=2))
+
+    def test_stun_provider(self):
+        self.assertEqual(query_provider(StunProvider(self, "203.0.113.9").url, timeout=2), "203.0.113.9")
+
+
+class QuorumTest(unittest.TestCase):
+    def resolver(self, providers, **kwargs):
+        return PublicIPResolver([provider.url for provider in providers], **kwargs)
+
+    def test_agreeing_providers_beat_a_faster_outlier(self):
+        resolver = self.resolver([HttpProvider(self, "192.0.2.1"),
+                                  HttpProvider(self, "203.0.113.7", delay=0.1),
+                                  StunProvider(self, "203.0.113.7")], timeout=2)
+        self.assertEqual(resolver.resolve(), "203.0.113.7")
+
+    def test_quorum_answers_without_waiting_for_slow_providers(self):
+        resolver = self.resolver([HttpProvider(self, "203.0.113.7"),
+                                  StunProvider(self, "203.0.113.7"),
+                                  HttpProvider(self, "192.0.2.1", delay=1.5)], timeout=2)
+        started = time.monotonic()
+        self.assertEqual(resolver.resolve(), "203.0.113.7")
+        self.assertLess(time.monotonic() - started, 1.0)
+
+    def test_without_quorum_the_first_answer_wins(self):
+        resolver = self.resolver([HttpProvider(self, "192.0.2.1"),
+                                  HttpProvider(self, "203.0.113.7", delay=0.2)], timeout=2)
+        self.assertEqual(resolver.resolve(), "192.0.2.1")
+
+    def test_failing_providers_do_not_vote(self):
+        resolver = self.resolver([HttpProvider(self, "192.0.2.1", status=500),
+                                  HttpProvider(self, "203.0.113.7")], timeout=2, quorum=1)
+        self.assertEqual(resolver.resolve(), "203.0.113.7")
+
+    def test_no_answer_is_none_and_not_cached(self):
+        resolver = self.resolver([HttpProvider(self, "nope")], timeout=1)
+        self.assertIsNone(resolver.get())
+        self.assertIsNone(resolver.address)
+
+    def test_answer_is_cached_until_invalidated(self):
+        provider = HttpProvider(self, "203.0.113.7")
+        resolver = PublicIPResolver([provider.url], timeout=2)
+        self.assertEqual(resolver.get(), "203.0.113.7")
+        resolver.providers = ["http://127.0.0.1:9"]
+        self.assertEqual(resolver.get(), "203.0.113.7")
+        resolver.invalidate()
+        self.assertIsNone(resolver.get())
+
+
+if __name__ == "__main__":
+    unittest.main()
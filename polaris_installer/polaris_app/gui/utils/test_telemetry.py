@@ -0,0 +1,94 @@
+"""
+Tests for the telemetry ring buffers and their windowed aggregates.
+"""
+import math
+import unittest
+from unittest import mock
+
+from gui.utils import telemetry
+from gui.utils.telemetry import RingBuffer, TelemetrySampler, percentile
+
+
+class RingBufferTest(unittest.TestCase):
+    def test_values_are_oldest_first_before_wrapping(self):
+        ring = RingBuffer(4)
+        for value in (1, 2, 3):
+            ring.append(value)
+        self.assertEqual(list(ring.values()), [1, 2, 3])
+        self.assertEqual(len(ring), 3)
+
+    def test_wrapping_keeps_the_newest_capacity_values(self):
+        ring = RingBuffer(3)
+        for value in range(1, 8):
+            ring.append(value)
+        self.assertEqual(list(ring.values()), [5, 6, 7])
+        self.assertEqual(list(ring.values(last=2)), [6, 7])
+        self.assertEqual(len(ring), 3)
+
+    def test_none_is_stored_as_a_gap(self):
+        ring = RingBuffer(2)
+        ring.append(None)
+        self.assertTrue(math.isnan(ring.values()[0]))
+
+
+class PercentileTest(unittest.TestCase):
+    def test_nearest_rank_without_numpy(self):
+        with mock.patch.object(telemetry, "NUMPY_AVAILABLE", False):
+            self.assertEqual(percentile(list(range(1, 101)), 0.95), 95)
+            self.assertEqual(percentile([7.0], 0.95), 7.0)
+
+    @unittest.skipUnless(telemetry.NUMPY_AVAILABLE, "numpy is not installed")
+    def test_interpolated_with_numpy(self):
+        self.assertAlmostEqual(percentile([0.0, 10.0], 0.5), 5.0)
+
+
+class SamplerAggregateTest(unittest.TestCase):
+    def setUp(self):
+        self.sampler = TelemetrySampler(interval=1.0, capacity=5, gpu=False)
+
+    def test_aggregate_over_every_sample(self):
+        for second, value in enumerate([10, 20, 30, 40]):
+            self.sampler.record(1000.0 + second, {"cpu.total": value})
+        stats = self.sampler.aggregate("cpu.total")
+        self.assertEqual((stats["count"], stats["min"], stats["max"], stats["last"]), (4, 10, 40, 40))
+        self.assertAlmostEqual(stats["mean"], 25)
+
+    def test_aggregate_only_covers_the_retained_samples(self):
+        for second in range(8):
+            self.sampler.record(1000.0 + second, {"cpu.total": second})
+        stats = self.sampler.aggregate("cpu.total")
+        self.assertEqual((stats["count"], stats["min"], stats["max"]), (5, 3, 7))
+
+    def test_window_is_cut_by_seconds(self):
+        for second in range(5):
+            self.sampler.record(1000.0 + second, {"memory.percent": second * 10})
+        self.assertEqual(self.sampler.window("memory.percent", seconds=2),
+                         [(1002.0, 20), (1003.0, 30), (1004.0, 40)])
+        self.assertEqual(self.sampler.aggregate("memory.percent", seconds=1)["count"], 2)
+
+    def test_missing_values_are_gaps(self):
+        self.sampler.record(1000.0, {"gpu0.util": 50, "cpu.total": 1})
+        self.sampler.record(1001.0, {"gpu0.util": None, "cpu.total": 2})
+        self.sampler.record(1002.0, {"cpu.total": 3})
+        self.assertEqual(self.sampler.window("gpu0.util"), [(1000.0, 50)])
+        self.assertEqual(self.sampler.aggregate("gpu0.util")["count"], 1)
+
+    def test_new_metric_is_aligned_with_earlier_samples(self):
+        self.sampler.record(1000.0, {"cpu.total": 1})
+        self.sampler.record(1001.0, {"cpu.total": 2, "net.recv_bps": 300})
+        self.assertEqual(self.sampler.window("net.recv_bps"), [(1001.0, 300)])
+        self.assertEqual(self.sampler.metrics(), ["cpu.total", "net.recv_bps"])
+
+    def test_unknown_metric(self):
+        self.assertEqual(self.sampler.window("gpu3.util"), [])
+        self.assertIsNone(self.sampler.aggregate("gpu3.util"))
+
+    def test_sample_records_host_metrics(self):
+        self.sampler.sample()
+        self.sampler.sample()
+        self.assertIn("cpu.total", self.sampler.metrics())
+        self.assertEqual(self.sampler.aggregate("memory.percent")["count"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,14 +3,38 @@ from PySide6.QtWidgets import (
     QProgressBar, QGroupBox, QFormLayout, QRadioButton, QButtonGroup,
     QLineEdit, QGridLayout
 )
-from PySide6.QtCore import Qt
-from gui.utils.system_info import get_full_system_info
+from PySide6.QtCore import Qt, QThread, Signal
+from gui.utils.benchmark import run_benchmarks
+from gui.utils.models import HostInfo, diff, dumps, from_dict
+from gui.utils.info_cache import TIER_MINUTES, TIER_SECONDS, get_system_info_cache
+from gui.utils.public_ip import get_public_ip_resolver
+
+
+class BenchmarkWorker(QThread):
+    """Runs the hardware benchmark suite without blocking the UI"""
+    progress_signal = Signal(str)
+    result_signal = Signal(dict)
+    error_signal = Signal(str)
+
+    def run(self):
+        def report(name, index, total):
+            self.progress_signal.emit(f"Benchmarking {name} ({index + 1}/{total})...")
+
+        try:
+            result = run_benchmarks(progress=report)
+        except Exception as e:
+            self.error_signal.emit(str(e))
+            return
+        self.result_signal.emit(result)
 
 
 class NodeSetupView(QWidget):
     def __init__(self):
         super().__init__()
+        self.info_cache = get_system_info_cache()
         self.init_ui()
+        self.info_cache.start_background_refresh()
+        get_public_ip_resolver().start_monitor()
 
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -129,7 +153,7 @@ class NodeSetupView(QWidget):
 
             if index == 0:  # System Info
                 # Auto-detected system info
-                auto_system_info = get_full_system_info()[0]
+                auto_system_info = self.info_cache.get()[0]
                 self.collected_system_info = auto_system_info  # Save initial info
                 
                 # Create box for system info
@@ -398,7 +422,7 @@ class NodeSetupView(QWidget):
                 username = self.username_input.text().strip()
                 ports = [self.port1_input.text().strip(), self.port2_input.text().strip()]
                 # Update collected system info with user inputs
-                updated_info = get_full_system_info(username=username, open_ports=ports)[0]
+                updated_info = self.info_cache.get(username=username, open_ports=ports)[0]
                 self.collected_system_info = updated_info
             
             self.current_step += 1
@@ -425,7 +449,6 @@ class NodeSetupView(QWidget):
                 label.setStyleSheet("color: #999;")
 
     def _create_advanced_panel(self):
-        import json
         from PySide6.QtWidgets import QTextEdit
 
         panel = QWidget()
@@ -448,8 +471,8 @@ class NodeSetupView(QWidget):
         """)
         
         # Initial system info
-        initial_info = get_full_system_info()
-        self.specs_box.setPlainText(json.dumps(initial_info, indent=2))
+        self.shown_info = None
+        self._show_specs(self.info_cache.get())
         layout.addWidget(self.specs_box)
 
         # Add a refresh button
@@ -470,19 +493,56 @@ class NodeSetupView(QWidget):
         refresh_btn.clicked.connect(self._refresh_system_info)
         layout.addWidget(refresh_btn)
 
+        # Measured capabilities are stored and reused until the hardware changes
+        self.benchmark_btn = QPushButton("Run Hardware Benchmark")
+        self.benchmark_btn.setStyleSheet(refresh_btn.styleSheet())
+        self.benchmark_btn.clicked.connect(self._run_benchmark)
+        layout.addWidget(self.benchmark_btn)
+
         layout.addStretch()
         return panel
         
+    def _run_benchmark(self):
+        """Runs the benchmark suite on a worker thread"""
+        self.benchmark_btn.setEnabled(False)
+        self.benchmark_worker = BenchmarkWorker()
+        self.benchmark_worker.progress_signal.connect(self.benchmark_btn.setText)
+        self.benchmark_worker.result_signal.connect(self._benchmark_finished)
+        self.benchmark_worker.error_signal.connect(self._benchmark_failed)
+        self.benchmark_worker.start()
+
+    def _benchmark_failed(self, error):
+        self.benchmark_btn.setText("Benchmark failed - Retry")
+        self.benchmark_btn.setToolTip(error)
+        self.benchmark_btn.setEnabled(True)
+
+    def _benchmark_finished(self, result):
+        self.benchmark_btn.setText("Run Hardware Benchmark")
+        self.benchmark_btn.setToolTip("")
+        self.benchmark_btn.setEnabled(True)
+        self.info_cache.invalidate(["benchmark"])
+        self._refresh_system_info()
+
     def _refresh_system_info(self):
         """Refreshes the advanced view with latest system info including user inputs"""
-        import json
+        # Hardware identity does not change; re-probe only the network and dynamic values
+        self.info_cache.invalidate(tier=TIER_MINUTES)
+        self.info_cache.invalidate(tier=TIER_SECONDS)
         
         # Get the latest input values if available
         if hasattr(self, 'username_input') and hasattr(self, 'port1_input') and hasattr(self, 'port2_input'):
             username = self.username_input.text().strip()
             ports = [self.port1_input.text().strip(), self.port2_input.text().strip()]
-            info = get_full_system_info(username=username, open_ports=ports)
+            info = self.info_cache.get(username=username, open_ports=ports)
         else:
-            info = get_full_system_info()
+            info = self.info_cache.get()
             
-        self.specs_box.setPlainText(json.dumps(info, indent=2))
+        self._show_specs(info)
+
+    def _show_specs(self, info):
+        """Re-renders the advanced view only when the document actually changed"""
+        host = from_dict(HostInfo, info[0])
+        if self.shown_info is not None and not diff(self.shown_info, host):
+            return
+        self.shown_info = host
+        self.specs_box.setPlainText(dumps([host], pretty=True))
@@ -0,0 +1,174 @@
+# src/deploy.py
+"""
+Incremental application deployment for Polaris Installer
+
+A content-hash manifest is kept next to the deployed tree so that later
+deploys only copy files that changed. Changed files are written in
+parallel, cloned with a reflink where the filesystem allows and copied
+otherwise, and progress is reported as one summarized stream. Hardlinking
+is opt-in and only meant for trees the installer itself owns (wheelhouse,
+venv templates): a hardlinked file shares its inode with the source, so an
+edit on either side silently changes both.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from src.utils import logger
+
+MANIFEST_NAME = ".polaris_manifest.json"
+DEPLOY_WORKERS = 8
+FICLONE = 0x40049409
+IGNORED_DIRS = {"__pycache__"}
+
+
+class _Linker:
+    """Places a file using the cheapest method the filesystem supports"""
+
+    def __init__(self, allow_hardlink=False):
+        self.reflink = fcntl is not None
+        self.hardlink = allow_hardlink
+        self.lock = threading.Lock()
+        self.counts = {"reflink": 0, "hardlink": 0, "copy": 0}
+
+    def place(self, source, destination):
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        tmp_path = f"{destination}.{threading.get_ident()}.tmp"
+        try:
+            method = self._place(source, tmp_path)
+            os.replace(tmp_path, destination)
+        except BaseException:
+            if os.path.lexists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        with self.lock:
+            self.counts[method] += 1
+
+    def _place(self, source, tmp_path):
+        if self.reflink:
+            try:
+                with open(source, "rb") as src, open(tmp_path, "wb") as dst:
+                    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                shutil.copystat(source, tmp_path)
+                return "reflink"
+            except OSError:
+                self.reflink = False
+                os.unlink(tmp_path)
+
+        if self.hardlink:
+            try:
+                os.link(source, tmp_path)
+                return "hardlink"
+            except OSError:
+                self.hardlink = False
+
+        shutil.copy2(source, tmp_path)
+        return "copy"
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(destination):
+    try:
+        with open(os.path.join(destination, MANIFEST_NAME), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"files": {}}
+
+
+def _scan(source):
+    files = {}
+    for root, dirs, names in os.walk(source):
+        dirs[:] = [d for d in dirs if d not in IGNORED_DIRS]
+        for name in names:
+            path = os.path.join(root, name)
+            stat = os.stat(path)
+            files[os.path.relpath(path, source)] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    return files
+
+
+def tree_fingerprint(source):
+    """Cheap fingerprint of a source tree from file paths, sizes and mtimes"""
+    digest = hashlib.sha256()
+    for rel, entry in sorted(_scan(source).items()):
+        digest.update(f"{rel}\0{entry['size']}\0{entry['mtime_ns']}\n".encode())
+    return digest.hexdigest()
+
+
+def deploy_tree(source, destination, log=None, progress=None, workers=DEPLOY_WORKERS,
+                allow_hardlink=False):
+    """
+    Bring destination in line with source, copying only what changed since
+    the last deploy. progress(done, total) is called at most once per
+    percent; a single summary line is logged at the end. Pass
+    allow_hardlink=True only when source is an installer-owned cache that
+    nothing edits in place.
+    Returns a dict with copied, unchanged and removed file counts.
+    """
+    log = log or logger.info
+    os.makedirs(destination, exist_ok=True)
+    previous = load_manifest(destination)["files"]
+    current = _scan(source)
+
+    def classify(rel):
+        entry = current[rel]
+        old = previous.get(rel)
+        dest_path = os.path.join(destination, rel)
+        dest_ok = old is not None and os.path.exists(dest_path) and os.path.getsize(dest_path) == entry["size"]
+        if dest_ok and old["size"] == entry["size"] and old["mtime_ns"] == entry["mtime_ns"]:
+            entry["sha256"] = old["sha256"]
+            return False
+        entry["sha256"] = file_sha256(os.path.join(source, rel))
+        return not (dest_ok and old["sha256"] == entry["sha256"])
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        changed = [rel for rel, is_changed in zip(current, pool.map(classify, list(current))) if is_changed]
+
+    linker = _Linker(allow_hardlink)
+    total = len(changed)
+    reported = [-1]
+    done = [0]
+    lock = threading.Lock()
+
+    def place(rel):
+        linker.place(os.path.join(source, rel), os.path.join(destination, rel))
+        with lock:
+            done[0] += 1
+            percent = done[0] * 100 // total
+            if progress and percent != reported[0]:
+                reported[0] = percent
+                progress(done[0], total)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(place, changed))
+
+    removed = [rel for rel in previous if rel not in current]
+    for rel in removed:
+        try:
+            os.unlink(os.path.join(destination, rel))
+        except FileNotFoundError:
+            pass
+
+    tmp_manifest = os.path.join(destination, MANIFEST_NAME + ".tmp")
+    with open(tmp_manifest, "w") as f:
+        json.dump({"source": os.path.abspath(source), "files": current}, f)
+    os.replace(tmp_manifest, os.path.join(destination, MANIFEST_NAME))
+
+    methods = ", ".join(f"{count} {method}" for method, count in linker.counts.items() if count)
+    log(f"[INFO] Deployed {total} changed files ({methods or 'nothing to copy'}), "
+        f"{len(current) - total} unchanged, {len(removed)} removed")
+    return {"copied": total, "unchanged": len(current) - total, "removed": len(removed)}
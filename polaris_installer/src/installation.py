@@ -1,131 +1,227 @@
-from PySide6.QtCore import QThread, Signal, QMutex, QWaitCondition
-import time
-import sys
+# src/installation.py
+"""
+Installation pipeline for Polaris Installer
+
+The pipeline has no Qt dependency: it reports through plain callbacks so
+it can be driven by the GUI thread wrapper in src/ui/installation_thread.py
+or headlessly from the command line:
+
+    python -m src.installation --headless --config install.json
+"""
+import argparse
+import json
 import os
-import subprocess
 import shutil
+import subprocess
+import sys
+import time
 
-
-class InstallationProcess(QThread):
-    progress_updated = Signal(int)
-    log_message = Signal(str)
-    installation_complete = Signal()
-
-    def __init__(self, settings=None):
-        super().__init__()
-        self.mutex = QMutex()
-        self.condition = QWaitCondition()
+from src.deploy import deploy_tree, tree_fingerprint
+from src.journal import JOURNAL_NAME, StepJournal, fingerprint
+from src.packages import InstallError, PackageInstaller, canonical_name
+from src.streaming import ProgressThrottle
+from src.timing import TRACE_NAME, Tracer, format_summary, set_tracer, span
+from src.utils import expand_path
+from src.venv_template import BASE_PACKAGES, DEFAULT_TEMPLATE_DIR, clone_venv, ensure_template, is_template_clone
+from src.wheelhouse import DEFAULT_WHEELHOUSE_DIR, Wheelhouse
+
+INSTALL_PACKAGES = ["pip", "wheel", "setuptools", "pyside6>=6.6.0", "bittensor-cli", "numpy"]
+
+DEFAULT_INSTALL_SETTINGS = {
+    "install_dir": os.path.expanduser("~/Polaris"),
+    "python_version": "system",
+    "create_shortcut": True,
+    "add_to_path": True,
+    "launch_on_startup": False,
+    "launch_after_install": True,
+    "use_wheelhouse": True,
+    "use_venv_template": True,
+    "resume_install": True
+}
+
+
+class InstallationPipeline:
+    """Runs the installation steps and reports through log/progress/complete/timings callbacks"""
+
+    def __init__(self, settings=None, log=None, progress=None, complete=None, timings=None):
         self.abort = False
+        self.log = log or print
+        self.progress = progress or (lambda value: None)
+        self.complete = complete or (lambda: None)
+        self.timings = timings or (lambda summary: None)
 
-        default_settings = {
-            "install_dir": os.path.expanduser("~/Polaris"),
-            "python_version": "system",
-            "create_shortcut": True,
-            "add_to_path": True,
-            "launch_on_startup": False
-        }
-
-        self.settings = settings if settings else default_settings
+        self.settings = settings if settings else dict(DEFAULT_INSTALL_SETTINGS)
         self.install_dir = self.settings["install_dir"]
 
     def run(self):
+        """Run the installation. Returns True when it completed"""
+        tracer = Tracer()
+        set_tracer(tracer)
         try:
-            if self.abort:
-                self.log_message.emit("[INFO] Installation aborted by user")
-                return
+            with tracer.span("install", "total"):
+                return self._run()
+        finally:
+            set_tracer(None)
+            self._report_timings(tracer)
 
-            self.log_message.emit("[INFO] Starting Polaris installation process...")
-            self.progress_updated.emit(5)
+    def _report_timings(self, tracer):
+        summary = tracer.summary()
+        if os.path.isdir(self.install_dir):
+            trace_path = os.path.join(self.install_dir, "logs", TRACE_NAME)
+            try:
+                tracer.export_chrome_trace(trace_path)
+                self.log(f"[INFO] Timing trace written to {trace_path}")
+            except OSError as e:
+                self.log(f"[WARNING] Failed to write timing trace: {str(e)}")
+        self.timings(summary)
 
-            self.log_message.emit(f"[INFO] Creating installation directory at {self.install_dir}")
-            os.makedirs(self.install_dir, exist_ok=True)
-            self.progress_updated.emit(10)
+    def _run(self):
+        try:
+            if self.abort:
+                self.log("[INFO] Installation aborted by user")
+                return False
+
+            self.log("[INFO] Starting Polaris installation process...")
+            self.progress(5)
 
-            self.log_message.emit("[INFO] Checking Python installation...")
-            self.progress_updated.emit(15)
-            python_version = sys.version.split()[0]
-            self.log_message.emit(f"[INFO] Python {python_version} detected")
+            with span("prepare", "phase"):
+                self.log(f"[INFO] Creating installation directory at {self.install_dir}")
+                os.makedirs(self.install_dir, exist_ok=True)
+                self.journal = StepJournal(os.path.join(self.install_dir, JOURNAL_NAME),
+                                           reset=not self.settings.get("resume_install", True))
+                self.rerun_remaining = False
+                self.progress(10)
 
-            is_wsl = self._check_if_wsl()
-            if is_wsl:
-                self.log_message.emit("[INFO] Windows Subsystem for Linux (WSL) detected")
+                self.log("[INFO] Checking Python installation...")
+                self.progress(15)
+                python_version = sys.version.split()[0]
+                self.log(f"[INFO] Python {python_version} detected")
 
-            self.log_message.emit("[INFO] Creating virtual environment...")
-            self.progress_updated.emit(20)
-            venv_success = self._create_virtual_env()
-            if not venv_success:
-                self.log_message.emit("[ERROR] Failed to create virtual environment")
-                return
+                is_wsl = self._check_if_wsl()
+                if is_wsl:
+                    self.log("[INFO] Windows Subsystem for Linux (WSL) detected")
 
             if os.name == "nt":
-                pip_path = os.path.join(self.install_dir, "venv", "Scripts", "pip.exe")
                 python_path = os.path.join(self.install_dir, "venv", "Scripts", "python.exe")
             else:
-                pip_path = os.path.join(self.install_dir, "venv", "bin", "pip")
                 python_path = os.path.join(self.install_dir, "venv", "bin", "python")
+            interpreter = {"python": os.path.realpath(sys.executable), "version": python_version}
+
+            self.log("[INFO] Creating virtual environment...")
+            self.progress(20)
+            venv_inputs = dict(interpreter, template=self.settings.get("use_venv_template", True))
+            if not self._run_step("venv", venv_inputs, self._create_virtual_env, outputs=[python_path]):
+                self.log("[ERROR] Failed to create virtual environment")
+                return False
+
+            self.log("[INFO] Installing required dependencies...")
+            self.progress(30)
+            packages = self.settings.get("packages", INSTALL_PACKAGES)
+            dependency_inputs = dict(interpreter, packages=packages, find_links=self.settings.get("find_links"))
+            if not self._run_step("dependencies", dependency_inputs,
+                                  lambda: self._install_dependencies(python_path, packages), outputs=[python_path]):
+                return False
+            self.progress(80)
+
+            self.log("[INFO] Setting up Polaris App...")
+            self.progress(85)
+            app_dir = os.path.join(self.install_dir, "polaris_app")
+            app_inputs = {"source": tree_fingerprint(self._app_source_dir()), "python": python_path, "wsl": is_wsl}
+            if not self._run_step("app", app_inputs, lambda: self._setup_polaris_app(python_path, is_wsl),
+                                  outputs=[os.path.join(app_dir, "main.py"), os.path.join(self.install_dir, "scripts")]):
+                self.log("[ERROR] Failed to set up Polaris App")
+                return False
 
-            self.log_message.emit("[INFO] Installing required dependencies...")
-            self.progress_updated.emit(30)
-
-            self.log_message.emit("[INFO] Installing build requirements...")
-            result = subprocess.run([pip_path, "install", "--upgrade", "pip", "wheel", "setuptools"],
-                                    capture_output=True, text=True)
-            if result.returncode != 0:
-                self.log_message.emit(f"[WARNING] Failed to install build requirements: {result.stderr}")
-
-            packages = ["pyside6>=6.6.0", "bittensor-cli", "numpy"]
-            for i, package in enumerate(packages):
-                self.log_message.emit(f"[INFO] Installing {package}")
-                progress = 40 + (i + 1) * 15
-                result = subprocess.run([pip_path, "install", package],
-                                        capture_output=True, text=True)
-                if result.returncode != 0:
-                    self.log_message.emit(f"[ERROR] Failed to install {package}: {result.stderr}")
-                else:
-                    self.log_message.emit(f"[INFO] Successfully installed {package}")
-                self.progress_updated.emit(progress)
-
-            self.log_message.emit("[INFO] Setting up Polaris App...")
-            self.progress_updated.emit(85)
-            app_success = self._setup_polaris_app(python_path, is_wsl)
-            if not app_success:
-                self.log_message.emit("[ERROR] Failed to set up Polaris App")
-                return
+            with span("cuda_probe", "phase"):
+                self._check_cuda(python_path)
+            self.progress(90)
 
-            try:
-                cmd = [python_path, "-c", "import torch; print(torch.cuda.is_available())"]
-                result = subprocess.run(cmd, capture_output=True, text=True)
+            self.log("[INFO] Creating desktop shortcut...")
+            self._run_step("shortcut", {"python": python_path, "wsl": is_wsl},
+                           lambda: self._create_shortcut(is_wsl, python_path))
+            self.progress(95)
 
-                if result.stdout.strip() == "True":
-                    self.log_message.emit("[INFO] CUDA detected, GPU acceleration enabled")
-                else:
-                    self.log_message.emit("[WARNING] CUDA not detected, using CPU only mode")
-            except:
-                self.log_message.emit("[WARNING] Unable to check CUDA, assuming CPU only mode")
+            self.log("[INFO] Configuration complete")
+            self.progress(100)
 
-            self.progress_updated.emit(90)
+            if self.settings.get("launch_after_install", True):
+                self.log("[INFO] Launching Polaris GUI App...")
 
-            self.log_message.emit("[INFO] Creating desktop shortcut...")
-            self._create_shortcut(is_wsl, python_path)
-            self.progress_updated.emit(95)
-
-            self.log_message.emit("[INFO] Configuration complete")
-            self.progress_updated.emit(100)
+                try:
+                    with span("launch", "phase"):
+                        subprocess.Popen([python_path, os.path.join(self.install_dir, "polaris_app", "main.py")])
+                    self.log("[INFO] Polaris launched successfully inside virtual environment")
+                except Exception as e:
+                    self.log(f"[ERROR] Failed to launch GUI: {str(e)}")
 
-            self.log_message.emit("[INFO] Launching Polaris GUI App...")
+            self.complete()
+            return True
 
-            try:
-                subprocess.Popen([python_path, os.path.join(self.install_dir, "polaris_app", "main.py")])
-                self.log_message.emit("[INFO] Polaris launched successfully inside virtual environment")
-            except Exception as e:
-                self.log_message.emit(f"[ERROR] Failed to launch GUI: {str(e)}")
+        except Exception as e:
+            self.log(f"[ERROR] Installation failed: {str(e)}")
+        return False
+
+    def _run_step(self, name, inputs, action, outputs=()):
+        """
+        Run one journaled step. A step is skipped when the journal shows it
+        succeeded with the same inputs and its outputs still exist; once any
+        step runs, every later step runs as well.
+        """
+        if self.abort:
+            self.log("[INFO] Installation aborted by user")
+            return False
 
-            self.installation_complete.emit()
+        step_fingerprint = fingerprint(inputs)
+        if (not self.rerun_remaining and self.journal.is_done(name, step_fingerprint)
+                and all(os.path.exists(path) for path in outputs)):
+            self.log(f"[INFO] Skipping step '{name}': unchanged since the last install")
+            return True
 
-        except Exception as e:
-            self.log_message.emit(f"[ERROR] Installation failed: {str(e)}")
+        self.rerun_remaining = True
+        started = time.monotonic()
+        success = False
+        try:
+            with span(name, "phase"):
+                success = action() is not False
         finally:
-            self.finished.emit()
+            self.journal.record(name, step_fingerprint, success, time.monotonic() - started)
+        return success
+
+    def _install_dependencies(self, python_path, packages):
+        wheelhouse = None
+        if self.settings.get("use_wheelhouse", True):
+            wheelhouse = Wheelhouse(self.settings.get("wheelhouse_dir", DEFAULT_WHEELHOUSE_DIR),
+                                    max_bytes=self.settings.get("wheelhouse_max_mb", 4096) * 1024 * 1024)
+        preinstalled = []
+        if is_template_clone(os.path.join(self.install_dir, "venv")):
+            # The template already carries current pip, wheel and setuptools
+            preinstalled = BASE_PACKAGES
+            packages = [package for package in packages if canonical_name(package) not in preinstalled]
+        throttle = ProgressThrottle(self.progress, self.log).start()
+        installer = PackageInstaller(python_path, log=throttle.log, wheelhouse=wheelhouse,
+                                     find_links=self.settings.get("find_links"),
+                                     no_index=self.settings.get("offline", False), preinstalled=preinstalled)
+        try:
+            installer.install(packages, progress=lambda fraction: throttle.progress(30 + fraction * 50))
+            return True
+        except InstallError as e:
+            throttle.log(f"[ERROR] Failed to install dependencies: {str(e)}")
+            return False
+        finally:
+            throttle.stop()
+
+    def _check_cuda(self, python_path):
+        try:
+            cmd = [python_path, "-c", "import torch; print(torch.cuda.is_available())"]
+            with span("python -c import torch", "subprocess"):
+                result = subprocess.run(cmd, capture_output=True, text=True)
+
+            if result.stdout.strip() == "True":
+                self.log("[INFO] CUDA detected, GPU acceleration enabled")
+            else:
+                self.log("[WARNING] CUDA not detected, using CPU only mode")
+        except:
+            self.log("[WARNING] Unable to check CUDA, assuming CPU only mode")
 
     def _check_if_wsl(self):
         try:
@@ -135,24 +231,40 @@ class InstallationProcess(QThread):
             return False
 
     def _create_virtual_env(self):
+        venv_path = os.path.join(self.install_dir, "venv")
+        if self.settings.get("use_venv_template", True) and not os.path.exists(os.path.join(venv_path, "pyvenv.cfg")):
+            try:
+                template = ensure_template(self.settings.get("venv_template_dir", DEFAULT_TEMPLATE_DIR),
+                                           log=self.log)
+                if template:
+                    clone_venv(template, venv_path, log=self.log)
+                    return True
+            except (OSError, subprocess.CalledProcessError) as e:
+                self.log(f"[WARNING] Virtual environment template unavailable, creating a fresh one: {str(e)}")
+                shutil.rmtree(venv_path, ignore_errors=True)
+
         try:
-            venv_path = os.path.join(self.install_dir, "venv")
-            result = subprocess.run([sys.executable, "-m", "venv", venv_path],
-                                    check=True, capture_output=True)
+            with span("python -m venv", "subprocess"):
+                result = subprocess.run([sys.executable, "-m", "venv", venv_path],
+                                        check=True, capture_output=True)
             return True
         except subprocess.CalledProcessError as e:
-            self.log_message.emit(f"[ERROR] Failed to create virtual environment: {e.stderr.decode() if e.stderr else str(e)}")
+            self.log(f"[ERROR] Failed to create virtual environment: {e.stderr.decode() if e.stderr else str(e)}")
             return False
 
+    def _app_source_dir(self):
+        return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "polaris_app")
+
     def _setup_polaris_app(self, python_path, is_wsl=False):
         try:
-            source_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "polaris_app")
+            source_dir = self._app_source_dir()
             app_dir = os.path.join(self.install_dir, "polaris_app")
 
             os.makedirs(app_dir, exist_ok=True)
 
-            self.log_message.emit(f"[INFO] Copying application files from {source_dir} to {app_dir}")
-            self._copy_directory(source_dir, app_dir)
+            self.log(f"[INFO] Deploying application files from {source_dir} to {app_dir}")
+            deploy_tree(source_dir, app_dir, log=self.log,
+                        progress=lambda done, total: self.progress(85 + done * 3 // total))
 
             scripts_dir = os.path.join(self.install_dir, "scripts")
             os.makedirs(scripts_dir, exist_ok=True)
@@ -173,23 +285,9 @@ cd "{app_dir}"
 
             return True
         except Exception as e:
-            self.log_message.emit(f"[ERROR] Failed to set up Polaris application: {str(e)}")
+            self.log(f"[ERROR] Failed to set up Polaris application: {str(e)}")
             return False
 
-    def _copy_directory(self, source, destination):
-        if not os.path.exists(destination):
-            os.makedirs(destination)
-
-        for item in os.listdir(source):
-            source_item = os.path.join(source, item)
-            dest_item = os.path.join(destination, item)
-
-            if os.path.isdir(source_item):
-                self._copy_directory(source_item, dest_item)
-            else:
-                shutil.copy2(source_item, dest_item)
-                self.log_message.emit(f"[INFO] Copied {source_item} to {dest_item}")
-
     def _create_shortcut(self, is_wsl=False, python_path=None):
         if os.name == "nt" and not is_wsl:
             try:
@@ -206,16 +304,16 @@ cd "{app_dir}"
                     shortcut.WorkingDirectory = os.path.dirname(os.path.join(self.install_dir, "scripts", "launch.bat"))
                     shortcut.save()
 
-                    self.log_message.emit("[INFO] Windows desktop shortcut created")
+                    self.log("[INFO] Windows desktop shortcut created")
                 except ImportError:
-                    self.log_message.emit("[WARNING] Windows shortcut modules not available")
+                    self.log("[WARNING] Windows shortcut modules not available")
 
             except Exception as e:
-                self.log_message.emit(f"[WARNING] Failed to create Windows shortcut: {str(e)}")
+                self.log(f"[WARNING] Failed to create Windows shortcut: {str(e)}")
 
         elif is_wsl:
             try:
-                self.log_message.emit("[INFO] Creating WSL launcher script")
+                self.log("[INFO] Creating WSL launcher script")
                 launcher_path = os.path.join(self.install_dir, "scripts", "launch.sh")
 
                 if not os.path.exists(launcher_path):
@@ -226,12 +324,12 @@ cd "{os.path.join(self.install_dir, "polaris_app")}"
 """)
                     os.chmod(launcher_path, 0o755)
 
-                self.log_message.emit("[INFO] WSL launcher script created")
-                self.log_message.emit("[INFO] In WSL, run the launcher script to start the application")
-                self.log_message.emit(f"[INFO] Launcher path: {launcher_path}")
+                self.log("[INFO] WSL launcher script created")
+                self.log("[INFO] In WSL, run the launcher script to start the application")
+                self.log(f"[INFO] Launcher path: {launcher_path}")
 
             except Exception as e:
-                self.log_message.emit(f"[WARNING] Failed to create WSL launcher: {str(e)}")
+                self.log(f"[WARNING] Failed to create WSL launcher: {str(e)}")
 
         else:
             try:
@@ -261,6 +359,65 @@ Categories=Utility;
                     shutil.copy2(desktop_file_path, desktop_shortcut)
                     os.chmod(desktop_shortcut, 0o755)
 
-                self.log_message.emit("[INFO] Linux desktop shortcut created")
+                self.log("[INFO] Linux desktop shortcut created")
             except Exception as e:
-                self.log_message.emit(f"[WARNING] Failed to create Linux shortcut: {str(e)}")
+                self.log(f"[WARNING] Failed to create Linux shortcut: {str(e)}")
+
+
+def load_settings(config_path=None):
+    """Installation settings from a JSON config file, on top of the defaults"""
+    settings = dict(DEFAULT_INSTALL_SETTINGS)
+    if config_path:
+        with open(config_path, "r") as f:
+            settings.update(json.load(f))
+    settings["install_dir"] = expand_path(settings["install_dir"])
+    return settings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.installation",
+                                     description="Install the Polaris miner node")
+    parser.add_argument("--headless", action="store_true",
+                        help="install from the command line without starting the GUI")
+    parser.add_argument("--config", help="JSON file with installation settings")
+    parser.add_argument("--install-dir", help="override the installation directory")
+    parser.add_argument("--find-links", help="local directory of wheels to install from")
+    parser.add_argument("--offline", action="store_true", help="never contact a package index")
+    # Neither flag leaves launch_after_install to the settings file
+    parser.add_argument("--launch", action="store_true", default=None, help="start the Polaris app when done")
+    parser.add_argument("--no-launch", dest="launch", action="store_false", default=None,
+                        help="do not start the Polaris app when done")
+    parser.add_argument("--fresh", action="store_true", help="ignore the step journal and redo every step")
+    args = parser.parse_args(argv)
+
+    if not args.headless:
+        from src.installer import PolarisInstaller
+        return PolarisInstaller().run()
+
+    settings = load_settings(args.config)
+    if args.launch is not None:
+        settings["launch_after_install"] = args.launch
+    if args.install_dir:
+        settings["install_dir"] = expand_path(args.install_dir)
+    if args.find_links:
+        settings["find_links"] = expand_path(args.find_links)
+    if args.offline:
+        settings["offline"] = True
+    if args.fresh:
+        settings["resume_install"] = False
+
+    last_progress = [-1]
+
+    def report_progress(value):
+        if value != last_progress[0]:
+            last_progress[0] = value
+            print(f"[PROGRESS] {value}%", flush=True)
+
+    pipeline = InstallationPipeline(settings, log=lambda message: print(message, flush=True),
+                                    progress=report_progress,
+                                    timings=lambda summary: print(format_summary(summary), flush=True))
+    return 0 if pipeline.run() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
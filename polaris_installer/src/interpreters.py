@@ -0,0 +1,123 @@
+# src/interpreters.py
+"""
+Python interpreter discovery for Polaris Installer
+
+PATH and the usual installation prefixes are scanned once, versions are
+read concurrently, and results are cached per binary path and mtime so
+repeat scans do not start any subprocess for known interpreters.
+"""
+import glob
+import os
+import re
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from src.utils import load_json_cache, save_json_cache
+
+VERSION_TIMEOUT = 2
+DISCOVERY_WORKERS = 8
+
+if os.name == "nt":
+    INTERPRETER_NAME = re.compile(r"^python(3\d*)?\.exe$", re.IGNORECASE)
+    COMMON_PREFIX_PATTERNS = [
+        "C:\\Python3*",
+        "C:\\Program Files\\Python3*",
+        os.path.join(os.environ.get("LOCALAPPDATA", ""), "Programs", "Python", "Python3*"),
+    ]
+else:
+    INTERPRETER_NAME = re.compile(r"^python3(\.\d+)?$")
+    COMMON_PREFIX_PATTERNS = [
+        "/usr/bin",
+        "/usr/local/bin",
+        "/opt/homebrew/bin",
+        "/opt/local/bin",
+        "/opt/python*/bin",
+        os.path.expanduser("~/.pyenv/versions/*/bin"),
+        os.path.expanduser("~/.local/bin"),
+        "/Library/Frameworks/Python.framework/Versions/*/bin",
+    ]
+
+
+def candidate_paths():
+    """Interpreter binaries on PATH and in common prefixes, one per real file"""
+    directories = os.environ.get("PATH", "").split(os.pathsep)
+    for pattern in COMMON_PREFIX_PATTERNS:
+        directories.extend(glob.glob(pattern))
+
+    seen_dirs = set()
+    seen_files = {os.path.realpath(sys.executable)}
+    for directory in directories:
+        if not directory or directory in seen_dirs:
+            continue
+        seen_dirs.add(directory)
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in sorted(entries, key=lambda e: e.name):
+            if not INTERPRETER_NAME.match(entry.name):
+                continue
+            real_path = os.path.realpath(entry.path)
+            if real_path in seen_files or not os.access(real_path, os.X_OK):
+                continue
+            seen_files.add(real_path)
+            yield entry.path
+
+
+def read_version(path, timeout=VERSION_TIMEOUT):
+    """Exact version reported by an interpreter, or None"""
+    try:
+        result = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=timeout)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    version_text = (result.stdout or result.stderr).strip()
+    if version_text.startswith("Python "):
+        return version_text.split(" ")[1]
+    return None
+
+
+def discover_interpreters(on_found=None, workers=DISCOVERY_WORKERS):
+    """
+    Find installed interpreters other than the running one. on_found(version,
+    path) is called as each one is identified; cached interpreters are
+    reported first without starting a subprocess.
+    Returns a list of (version, path) tuples.
+    """
+    cache = load_json_cache("interpreters")
+    fresh_cache = {}
+    found = []
+
+    def report(version, path):
+        found.append((version, path))
+        if on_found:
+            on_found(version, path)
+
+    pending = []
+    for path in candidate_paths():
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+        cached = cache.get(path)
+        if cached and cached["mtime"] == mtime:
+            fresh_cache[path] = cached
+            if cached["version"]:
+                report(cached["version"], path)
+        else:
+            pending.append((path, mtime))
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(read_version, path): (path, mtime) for path, mtime in pending}
+            for future in as_completed(futures):
+                path, mtime = futures[future]
+                version = future.result()
+                # Binaries that are not usable interpreters are cached too, as None
+                fresh_cache[path] = {"mtime": mtime, "version": version}
+                if version:
+                    report(version, path)
+
+    if fresh_cache != cache:
+        save_json_cache("interpreters", fresh_cache)
+    return found
@@ -0,0 +1,51 @@
+# src/journal.py
+"""
+Step journal for resumable installations
+
+Each completed installation step is recorded on disk together with a
+fingerprint of its inputs, so a rerun can skip steps that already
+succeeded with the same inputs and resume at the first failed or stale one.
+"""
+import hashlib
+import json
+import os
+import time
+
+JOURNAL_NAME = ".install_journal.json"
+
+
+def fingerprint(inputs):
+    """Stable hash of a JSON-serializable description of a step's inputs"""
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class StepJournal:
+    def __init__(self, path, reset=False):
+        self.path = path
+        self.steps = {} if reset else self._load()
+
+    def is_done(self, name, step_fingerprint):
+        entry = self.steps.get(name)
+        return bool(entry) and entry["status"] == "done" and entry["fingerprint"] == step_fingerprint
+
+    def record(self, name, step_fingerprint, success, duration=None):
+        self.steps[name] = {
+            "fingerprint": step_fingerprint,
+            "status": "done" if success else "failed",
+            "finished_at": time.time(),
+            "duration": duration,
+        }
+        self._save()
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f).get("steps", {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"steps": self.steps}, f, indent=2)
+        os.replace(tmp_path, self.path)
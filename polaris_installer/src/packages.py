@@ -0,0 +1,380 @@
+# src/packages.py
+"""
+Dependency installation engine for Polaris Installer
+
+The whole requirement set is resolved by a single pip run, the resulting
+artifacts are downloaded concurrently and then installed in one pass. With
+a wheelhouse attached, a requirement set that was resolved before is
+installed straight from the local cache without any network access.
+Artifacts are fetched from the URLs pip resolved them to, so index-url and
+extra-index-url are already applied; the direct downloads also honour pip's
+proxy, cert, client-cert and trusted-host settings.
+"""
+import ast
+import hashlib
+import json
+import os
+import re
+import shutil
+import ssl
+import tempfile
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from src.streaming import PhaseProgress, PipOutputParser, stream_command
+from src.timing import span
+from src.utils import logger, run_command
+
+DOWNLOAD_WORKERS = 8
+DOWNLOAD_TIMEOUT = 60
+CHUNK_SIZE = 256 * 1024
+PIP_CONFIG_TIMEOUT = 15
+# Configuration sections pip install reads, lowest precedence first
+PIP_CONFIG_SECTIONS = ("global", "install", ":env:")
+
+
+class InstallError(Exception):
+    """Raised when the package set cannot be resolved or installed"""
+
+
+class PackageInstaller:
+    """Resolves, downloads and installs a package set into a virtual environment"""
+
+    def __init__(self, python_path, log=None, workers=DOWNLOAD_WORKERS,
+                 wheelhouse=None, find_links=None, no_index=False, preinstalled=()):
+        self.python_path = python_path
+        # Distributions already current in the target; the resolver's copies of them are skipped
+        self.preinstalled = {canonical_name(name) for name in preinstalled}
+        self.log = log or logger.info
+        self.workers = workers
+        self.wheelhouse = wheelhouse
+        self.url_opener = None
+        self.index_options = []
+        if no_index:
+            self.index_options.append("--no-index")
+        if find_links:
+            self.index_options += ["--find-links", find_links]
+
+    def install(self, packages, progress=None):
+        """
+        Install all packages with one resolution. Falls back to a single
+        combined pip install when pip is too old to produce a report.
+        progress(fraction) is called with the overall completion from 0 to 1.
+        """
+        if self.wheelhouse:
+            key = self.wheelhouse.key(packages)
+            files = self.wheelhouse.lookup(key)
+            if files is not None:
+                self.log(f"[INFO] All {len(packages)} requirements found in wheelhouse, installing offline")
+                self.install_files(files, offline=True, progress=progress)
+                return []
+
+        plan = self.resolve(packages, progress=PhaseProgress(progress, 0.0, 0.1))
+        if plan is None:
+            self.log("[WARNING] pip cannot report a resolution, installing in a single pip run")
+            self._pip(["install", "--upgrade"] + self.index_options + list(packages),
+                      parser=PipOutputParser(PhaseProgress(progress, 0.1, 1.0)))
+            return []
+
+        download_progress = PhaseProgress(progress, 0.1, 0.7)
+        install_progress = PhaseProgress(progress, 0.7, 1.0)
+        if self.wheelhouse:
+            download_dir = os.path.join(self.wheelhouse.root, "incoming")
+            files = self.download(plan, download_dir, download_progress)
+            self.install_files(files, progress=install_progress)
+            self.wheelhouse.record(key, plan)
+        else:
+            with tempfile.TemporaryDirectory(prefix="polaris-wheels-") as download_dir:
+                files = self.download(plan, download_dir, download_progress)
+                self.install_files(files, progress=install_progress)
+        return plan
+
+    def resolve(self, packages, progress=None):
+        """
+        Resolve the full dependency graph once and return the install plan
+        as a list of dicts with name, version, url, sha256 and filename.
+        Installed packages are ignored so the plan depends only on the
+        requirements and the index. Returns None when the installed pip
+        does not support --report.
+        """
+        self.log(f"[INFO] Resolving {len(packages)} requirements...")
+        fd, report_path = tempfile.mkstemp(prefix="polaris-report-", suffix=".json")
+        os.close(fd)
+        try:
+            returncode, output = self._run_pip(["install", "--dry-run", "--upgrade", "--ignore-installed",
+                                                "--report", report_path] + self.index_options + list(packages),
+                                               parser=PipOutputParser(progress))
+            if returncode != 0:
+                if any("no such option" in line for line in output):
+                    return None
+                raise InstallError("\n".join(output[-10:]) or "dependency resolution failed")
+
+            with open(report_path, "r") as f:
+                report = json.load(f)
+        finally:
+            os.unlink(report_path)
+
+        plan = []
+        for item in report.get("install", []):
+            download_info = item.get("download_info", {})
+            url = download_info.get("url")
+            if not url or canonical_name(item["metadata"]["name"]) in self.preinstalled:
+                continue
+            hashes = download_info.get("archive_info", {}).get("hashes", {})
+            legacy_hash = download_info.get("archive_info", {}).get("hash", "")
+            sha256 = hashes.get("sha256")
+            if not sha256 and legacy_hash.startswith("sha256="):
+                sha256 = legacy_hash.split("=", 1)[1]
+            plan.append({
+                "name": item["metadata"]["name"],
+                "version": item["metadata"]["version"],
+                "url": url,
+                "sha256": sha256,
+                "filename": urllib.parse.unquote(os.path.basename(urllib.parse.urlparse(url).path)),
+            })
+
+        self.log(f"[INFO] Resolved {len(plan)} packages to install")
+        return plan
+
+    def download(self, plan, download_dir, progress=None):
+        """
+        Download every artifact in the plan concurrently and return the local
+        paths. Progress is weighted by bytes; sizes that are not known yet
+        are estimated from the average of the known ones.
+        """
+        os.makedirs(download_dir, exist_ok=True)
+        if self.url_opener is None:
+            try:
+                self.url_opener = _PipUrlOpener(pip_config(self.python_path))
+            except (OSError, ssl.SSLError) as e:
+                self.log(f"[WARNING] Ignoring pip's certificate settings for direct downloads: {e}")
+                self.url_opener = _PipUrlOpener({})
+        files = {}
+        tracker = _ByteProgress(len(plan), progress)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self._fetch, entry, download_dir, tracker): entry for entry in plan}
+            for done, future in enumerate(as_completed(futures), 1):
+                entry = futures[future]
+                try:
+                    files[entry["filename"]] = future.result()
+                except Exception as e:
+                    for pending in futures:
+                        pending.cancel()
+                    raise InstallError(f"Failed to download {entry['filename']}: {e}")
+                self.log(f"[INFO] Downloaded {entry['name']} {entry['version']} ({done}/{len(plan)})")
+        return [files[entry["filename"]] for entry in plan]
+
+    def install_files(self, files, offline=False, progress=None):
+        """Install already-resolved local artifacts in a single pip run"""
+        self.log(f"[INFO] Installing {len(files)} packages...")
+        self._pip(["install", "--no-deps"] + (["--no-index"] if offline else []) + list(files),
+                  parser=PipOutputParser(progress, files))
+        self.log("[INFO] Dependencies installed")
+
+    def _fetch(self, entry, download_dir, tracker):
+        if self.wheelhouse and entry["sha256"] and self.wheelhouse.has_blob(entry["sha256"], entry["filename"]):
+            path = self.wheelhouse.blob_path(entry["sha256"], entry["filename"])
+            tracker.finished(os.path.getsize(path))
+            return path
+
+        path = os.path.join(download_dir, entry["filename"])
+        if not self.wheelhouse and os.path.exists(path) and _sha256(path) == entry["sha256"]:
+            tracker.finished(os.path.getsize(path))
+            return path
+
+        partial = f"{path}.{threading.get_ident()}.part"
+        try:
+            try:
+                digest = self._fetch_url(entry, partial, tracker)
+            except Exception as e:
+                if not _needs_pip_auth(e):
+                    raise
+                # pip strips index credentials from report URLs and applies its own keyring
+                # and netrc; let it fetch this artifact instead
+                self.log(f"[WARNING] Direct download of {entry['filename']} failed ({e}), retrying through pip")
+                digest = self._fetch_with_pip(entry, partial, tracker)
+                path = os.path.join(download_dir, entry["filename"])
+            if entry["sha256"] and digest != entry["sha256"]:
+                raise InstallError(f"hash mismatch for {entry['filename']}")
+        except BaseException:
+            # Interrupted or rejected downloads must not linger in the wheelhouse's incoming dir
+            try:
+                os.unlink(partial)
+            except OSError:
+                pass
+            raise
+        entry["sha256"] = digest
+
+        if self.wheelhouse:
+            path = self.wheelhouse.blob_path(entry["sha256"], entry["filename"])
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(partial, path)
+        if self.wheelhouse:
+            self.wheelhouse.add_blob(entry["sha256"], path)
+        return path
+
+    def _fetch_url(self, entry, partial, tracker):
+        digest = hashlib.sha256()
+        with span(f"download {entry['filename']}", "download"), \
+                self.url_opener.open(entry["url"], timeout=DOWNLOAD_TIMEOUT) as response, \
+                open(partial, "wb") as f:
+            tracker.started(int(response.headers.get("Content-Length") or 0))
+            while True:
+                chunk = response.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                f.write(chunk)
+                tracker.received(len(chunk))
+        return digest.hexdigest()
+
+    def _fetch_with_pip(self, entry, partial, tracker):
+        """Download one pinned artifact with pip download and move it to partial"""
+        with tempfile.TemporaryDirectory(prefix="polaris-pip-download-") as dest, \
+                span(f"pip download {entry['filename']}", "download"):
+            self._pip(["download", "--no-deps", "--dest", dest] + self.index_options
+                      + [f"{entry['name']}=={entry['version']}"])
+            downloaded = os.listdir(dest)
+            if entry["filename"] in downloaded:
+                filename = entry["filename"]
+            elif len(downloaded) == 1:
+                filename = downloaded[0]
+            else:
+                raise InstallError(f"pip download did not produce {entry['filename']}")
+            shutil.move(os.path.join(dest, filename), partial)
+        if filename != entry["filename"]:
+            # pip picked another artifact for the pin; the reported hash belongs to the original one
+            entry["filename"] = filename
+            entry["sha256"] = None
+        tracker.finished(os.path.getsize(partial))
+        return _sha256(partial)
+
+    def _pip(self, args, parser=None):
+        returncode, output = self._run_pip(args, parser)
+        if returncode != 0:
+            raise InstallError("\n".join(output[-10:]) or f"pip {args[0]} failed")
+
+    def _run_pip(self, args, parser=None):
+        def on_line(line):
+            if line.strip():
+                self.log(f"[PIP] {line}")
+            if parser:
+                parser.feed(line)
+
+        # Every call is a pip subcommand; the progress bar option belongs after it
+        return stream_command([self.python_path, "-m", "pip", "--disable-pip-version-check"] + args[:1]
+                              + ["--progress-bar", "off"] + args[1:], on_line)
+
+
+class _PipUrlOpener:
+    """urllib opener that applies pip's proxy, cert, client-cert and trusted-host settings"""
+
+    def __init__(self, config):
+        handlers = []
+        if config.get("proxy"):
+            handlers.append(urllib.request.ProxyHandler({"http": config["proxy"], "https": config["proxy"]}))
+        verified = ssl.create_default_context(cafile=config.get("cert") or None)
+        unverified = ssl.create_default_context()
+        unverified.check_hostname = False
+        unverified.verify_mode = ssl.CERT_NONE
+        if config.get("client-cert"):
+            for context in (verified, unverified):
+                context.load_cert_chain(config["client-cert"])
+        self.trusted_hosts = set(config.get("trusted-host", "").split())
+        self.verified = urllib.request.build_opener(*handlers, urllib.request.HTTPSHandler(context=verified))
+        self.unverified = urllib.request.build_opener(*handlers, urllib.request.HTTPSHandler(context=unverified))
+
+    def open(self, url, timeout=None):
+        parsed = urllib.parse.urlparse(url)
+        # Like pip, a trusted host matches with or without its port
+        trusted = parsed.hostname in self.trusted_hosts or parsed.netloc.rsplit("@", 1)[-1] in self.trusted_hosts
+        return (self.unverified if trusted else self.verified).open(url, timeout=timeout)
+
+
+class _ByteProgress:
+    """Byte-weighted progress across concurrent downloads"""
+
+    def __init__(self, count, progress):
+        self.count = count
+        self.progress = progress
+        self.lock = threading.Lock()
+        self.known_sizes = []
+        self.done_bytes = 0
+
+    def started(self, size):
+        with self.lock:
+            if size:
+                self.known_sizes.append(size)
+
+    def received(self, size):
+        with self.lock:
+            self.done_bytes += size
+        self._report()
+
+    def finished(self, size):
+        with self.lock:
+            self.known_sizes.append(size)
+            self.done_bytes += size
+        self._report()
+
+    def _report(self):
+        if not self.progress:
+            return
+        with self.lock:
+            if not self.known_sizes:
+                return
+            average = sum(self.known_sizes) / len(self.known_sizes)
+            total = sum(self.known_sizes) + average * (self.count - len(self.known_sizes))
+            fraction = self.done_bytes / total if total else 0.0
+        self.progress(fraction)
+
+
+def canonical_name(requirement):
+    """Normalized distribution name of a requirement string (PEP 503)"""
+    name = re.split(r"[\s<>=!~;\[(@]", requirement.strip(), 1)[0]
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def pip_config(python_path):
+    """
+    Effective pip settings for install, as pip config list reports them for
+    the interpreter: {option: value}, environment variables taking precedence
+    over install-section and then global values
+    """
+    ok, output = run_command([python_path, "-m", "pip", "config", "list"], timeout=PIP_CONFIG_TIMEOUT)
+    if not ok:
+        return {}
+    sections = {}
+    for line in output.splitlines():
+        name, sep, value = line.partition("=")
+        section, _, option = name.rpartition(".")
+        if not sep or section not in PIP_CONFIG_SECTIONS:
+            continue
+        try:
+            sections.setdefault(section, {})[option] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            continue
+    config = {}
+    for section in PIP_CONFIG_SECTIONS:
+        config.update(sections.get(section, {}))
+    return config
+
+
+def _needs_pip_auth(error):
+    """True for failures pip's own index configuration may avoid: auth challenges and TLS errors"""
+    if isinstance(error, urllib.error.HTTPError):
+        return error.code in (401, 403)
+    if isinstance(error, urllib.error.URLError):
+        return isinstance(error.reason, ssl.SSLError)
+    return isinstance(error, ssl.SSLError)
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
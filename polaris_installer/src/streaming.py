@@ -0,0 +1,155 @@
+# src/streaming.py
+"""
+Streaming subprocess output for Polaris Installer
+
+Subprocess output is read line by line through a bounded buffer, pip
+output is parsed into progress fractions, and emission to the UI is
+throttled so a chatty child process cannot flood the event loop.
+"""
+import os
+import queue
+import subprocess
+import threading
+import time
+from collections import deque
+
+from src.timing import span
+
+LINE_BUFFER_SIZE = 1000
+EMIT_INTERVAL = 0.1
+
+
+def stream_command(cmd, on_line, buffer_size=LINE_BUFFER_SIZE, env=None):
+    """
+    Run cmd and call on_line for each line of combined stdout/stderr as it
+    arrives. The reader blocks when buffer_size lines are pending, which
+    applies backpressure to the child instead of growing memory.
+    Returns (returncode, last output lines).
+    """
+    with span(" ".join([os.path.basename(cmd[0])] + list(cmd[1:4])), "subprocess", argv=list(cmd)):
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   text=True, bufsize=1, env=env)
+        lines = queue.Queue(maxsize=buffer_size)
+
+        def reader():
+            for line in process.stdout:
+                lines.put(line.rstrip("\r\n"))
+            lines.put(None)
+
+        threading.Thread(target=reader, daemon=True).start()
+
+        tail = deque(maxlen=50)
+        while True:
+            line = lines.get()
+            if line is None:
+                break
+            tail.append(line)
+            on_line(line)
+
+        process.stdout.close()
+        return process.wait(), list(tail)
+
+
+class ProgressThrottle:
+    """
+    Coalesces log lines and progress updates and forwards them at most
+    once per interval. Progress never moves backwards. While started, a
+    background flusher makes sure buffered lines never wait for the next one.
+    """
+
+    def __init__(self, emit_progress, emit_log, interval=EMIT_INTERVAL):
+        self.emit_progress = emit_progress
+        self.emit_log = emit_log
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.lines = []
+        self.value = 0
+        self.sent_value = 0
+        self.last_emit = 0.0
+        self.stopped = threading.Event()
+        self.flusher = None
+
+    def start(self):
+        self.stopped.clear()
+        self.flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self.flusher.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        if self.flusher:
+            self.flusher.join()
+            self.flusher = None
+        self.flush()
+
+    def _flush_loop(self):
+        while not self.stopped.wait(self.interval):
+            self.flush()
+
+    def progress(self, value):
+        with self.lock:
+            self.value = max(self.value, int(value))
+        self._maybe_flush()
+
+    def log(self, line):
+        with self.lock:
+            self.lines.append(line)
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if time.monotonic() - self.last_emit >= self.interval:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            lines, self.lines = self.lines, []
+            value = self.value if self.value != self.sent_value else None
+            self.sent_value = self.value
+            self.last_emit = time.monotonic()
+        if lines:
+            self.emit_log("\n".join(lines))
+        if value is not None:
+            self.emit_progress(value)
+
+
+class PhaseProgress:
+    """Maps a 0..1 fraction of one phase onto a slice of the overall progress"""
+
+    def __init__(self, report, start, end):
+        self.report = report
+        self.start = start
+        self.end = end
+
+    def __call__(self, fraction):
+        if self.report:
+            self.report(self.start + (self.end - self.start) * min(max(fraction, 0.0), 1.0))
+
+
+class PipOutputParser:
+    """
+    Turns pip output into a progress fraction. When the artifacts being
+    installed are known, progress is weighted by their size in bytes;
+    otherwise it grows with every package pip collects or downloads.
+    """
+
+    def __init__(self, progress, files=None):
+        self.progress = progress or (lambda fraction: None)
+        self.sizes = {os.path.abspath(path): os.path.getsize(path) for path in files or []}
+        self.total_bytes = sum(self.sizes.values()) or 1
+        self.done_bytes = 0
+        self.events = 0
+
+    def feed(self, line):
+        text = line.strip()
+        if text.startswith("Processing "):
+            self.done_bytes += self.sizes.get(os.path.abspath(text[len("Processing "):].strip()), 0)
+            if self.sizes:
+                self.progress(0.8 * self.done_bytes / self.total_bytes)
+                return
+        if text.startswith("Installing collected packages"):
+            self.progress(0.85)
+        elif text.startswith("Successfully installed"):
+            self.progress(1.0)
+        elif text.startswith(("Collecting ", "Downloading ", "Processing ")):
+            self.events += 1
+            self.progress(0.8 * self.events / (self.events + 20))
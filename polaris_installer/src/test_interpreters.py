@@ -0,0 +1,78 @@
+# src/test_interpreters.py
+"""
+Tests for Python interpreter discovery against a fake PATH
+"""
+import os
+import stat
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from src import interpreters, utils
+
+
+def _write_interpreter(directory, name, version):
+    path = os.path.join(directory, name)
+    with open(path, "w") as f:
+        f.write(f"#!/bin/sh\necho 'Python {version}'\n")
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+    return path
+
+
+@unittest.skipIf(os.name == "nt", "fake interpreters are shell scripts")
+class DiscoverInterpretersTest(unittest.TestCase):
+    def setUp(self):
+        self.bin_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.bin_dir.cleanup)
+        self.addCleanup(self.cache_dir.cleanup)
+        for patcher in (mock.patch.dict(os.environ, {"PATH": self.bin_dir.name}),
+                        mock.patch.object(interpreters, "COMMON_PREFIX_PATTERNS", []),
+                        mock.patch.object(utils, "CACHE_DIR", self.cache_dir.name)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_finds_interpreters_and_reports_each_one(self):
+        python311 = _write_interpreter(self.bin_dir.name, "python3.11", "3.11.9")
+        python312 = _write_interpreter(self.bin_dir.name, "python3.12", "3.12.4")
+        _write_interpreter(self.bin_dir.name, "pip3", "0")
+        reported = []
+        found = interpreters.discover_interpreters(on_found=lambda version, path: reported.append(path))
+        self.assertEqual(sorted(found), [("3.11.9", python311), ("3.12.4", python312)])
+        self.assertEqual(sorted(reported), [python311, python312])
+
+    def test_symlinks_to_the_same_binary_are_listed_once(self):
+        python311 = _write_interpreter(self.bin_dir.name, "python3.11", "3.11.9")
+        os.symlink(python311, os.path.join(self.bin_dir.name, "python3"))
+        self.assertEqual(len(interpreters.discover_interpreters()), 1)
+
+    def test_running_interpreter_is_skipped(self):
+        os.symlink(os.path.realpath(sys.executable), os.path.join(self.bin_dir.name, "python3"))
+        self.assertEqual(interpreters.discover_interpreters(), [])
+
+    def test_cached_interpreters_do_not_start_a_subprocess(self):
+        python311 = _write_interpreter(self.bin_dir.name, "python3.11", "3.11.9")
+        interpreters.discover_interpreters()
+        with mock.patch.object(interpreters, "read_version", side_effect=AssertionError("not cached")):
+            self.assertEqual(interpreters.discover_interpreters(), [("3.11.9", python311)])
+
+    def test_changed_binary_is_read_again(self):
+        python311 = _write_interpreter(self.bin_dir.name, "python3.11", "3.11.9")
+        interpreters.discover_interpreters()
+        _write_interpreter(self.bin_dir.name, "python3.11", "3.11.10")
+        mtime = os.stat(python311).st_mtime_ns + 1_000_000_000
+        os.utime(python311, ns=(mtime, mtime))
+        self.assertEqual(interpreters.discover_interpreters(), [("3.11.10", python311)])
+
+    def test_unusable_binaries_are_cached_as_none(self):
+        broken = os.path.join(self.bin_dir.name, "python3.10")
+        with open(broken, "w") as f:
+            f.write("#!/bin/sh\nexit 1\n")
+        os.chmod(broken, 0o755)
+        self.assertEqual(interpreters.discover_interpreters(), [])
+        self.assertEqual(utils.load_json_cache("interpreters")[broken]["version"], None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+# src/test_streaming.py
+"""
+Tests for pip output parsing and throttled progress reporting
+"""
+import os
+import tempfile
+import time
+import unittest
+
+from src.streaming import PipOutputParser, ProgressThrottle
+
+
+class PipOutputParserTest(unittest.TestCase):
+    def setUp(self):
+        self.fractions = []
+
+    def test_unknown_artifacts_grow_with_each_collected_package(self):
+        parser = PipOutputParser(self.fractions.append)
+        for line in ["Collecting requests", "Downloading requests-2.32.3-py3-none-any.whl",
+                     "Collecting idna", "  Using cached idna-3.7-py3-none-any.whl"]:
+            parser.feed(line)
+        self.assertEqual(len(self.fractions), 3)
+        self.assertEqual(self.fractions, sorted(self.fractions))
+        self.assertLess(self.fractions[-1], 0.8)
+
+    def test_install_phase_lines(self):
+        parser = PipOutputParser(self.fractions.append)
+        parser.feed("Installing collected packages: idna, requests")
+        parser.feed("Successfully installed idna-3.7 requests-2.32.3")
+        self.assertEqual(self.fractions, [0.85, 1.0])
+
+    def test_known_artifacts_are_weighted_by_size(self):
+        with tempfile.TemporaryDirectory() as directory:
+            small = os.path.join(directory, "small-1.0-py3-none-any.whl")
+            large = os.path.join(directory, "large-1.0-py3-none-any.whl")
+            with open(small, "wb") as f:
+                f.write(b"x" * 100)
+            with open(large, "wb") as f:
+                f.write(b"x" * 300)
+            parser = PipOutputParser(self.fractions.append, [small, large])
+            parser.feed(f"Processing {small}")
+            parser.feed(f"Processing {large}")
+        self.assertAlmostEqual(self.fractions[0], 0.8 * 100 / 400)
+        self.assertAlmostEqual(self.fractions[1], 0.8)
+
+    def test_unrelated_lines_report_nothing(self):
+        parser = PipOutputParser(self.fractions.append)
+        parser.feed("Requirement already satisfied: pip in ./venv/lib/python3.11/site-packages")
+        parser.feed("")
+        self.assertEqual(self.fractions, [])
+
+    def test_progress_is_optional(self):
+        PipOutputParser(None).feed("Collecting requests")
+
+
+class ProgressThrottleTest(unittest.TestCase):
+    def setUp(self):
+        self.progress = []
+        self.logs = []
+
+    def test_updates_within_the_interval_are_coalesced(self):
+        throttle = ProgressThrottle(self.progress.append, self.logs.append, interval=60)
+        throttle.log("first")
+        throttle.progress(10)
+        throttle.log("second")
+        throttle.progress(20)
+        self.assertEqual(self.logs, ["first"])
+        self.assertEqual(self.progress, [])
+        throttle.flush()
+        self.assertEqual(self.logs, ["first", "second"])
+        self.assertEqual(self.progress, [20])
+
+    def test_progress_never_moves_backwards(self):
+        throttle = ProgressThrottle(self.progress.append, self.logs.append, interval=60)
+        throttle.progress(50)
+        throttle.progress(30)
+        throttle.flush()
+        self.assertEqual(self.progress, [50])
+
+    def test_unchanged_progress_is_not_resent(self):
+        throttle = ProgressThrottle(self.progress.append, self.logs.append, interval=0)
+        throttle.progress(40)
+        throttle.progress(40)
+        throttle.flush()
+        self.assertEqual(self.progress, [40])
+
+    def test_background_flusher_delivers_buffered_lines(self):
+        throttle = ProgressThrottle(self.progress.append, self.logs.append, interval=0.05)
+        throttle.log("first")
+        throttle.log("buffered")
+        throttle.start()
+        try:
+            deadline = time.monotonic() + 2
+            while "buffered" not in self.logs and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            throttle.stop()
+        self.assertEqual(self.logs, ["first", "buffered"])
+
+    def test_stop_flushes_what_is_left(self):
+        throttle = ProgressThrottle(self.progress.append, self.logs.append, interval=60).start()
+        throttle.log("first")
+        throttle.log("last")
+        throttle.progress(100)
+        throttle.stop()
+        self.assertEqual(self.logs, ["first", "last"])
+        self.assertEqual(self.progress, [100])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+# src/timing.py
+"""
+Span-based timing for the installation pipeline
+
+Spans are recorded as Chrome trace "complete" events, so the exported file
+opens directly in chrome://tracing or Perfetto. Library code records into
+the active tracer through span(); with no active tracer it is a no-op.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+TRACE_NAME = "install_trace.json"
+
+_active_tracer = None
+
+
+class Tracer:
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.events = []
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name, category="install", **args):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            finished = time.perf_counter()
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (started - self.origin) * 1e6,
+                "dur": (finished - started) * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+            with self.lock:
+                self.events.append(event)
+
+    def summary(self, category="phase"):
+        """[(name, seconds)] for spans of one category, in start order, merging repeats"""
+        totals = {}
+        with self.lock:
+            events = sorted(self.events, key=lambda e: e["ts"])
+        for event in events:
+            if event["cat"] == category:
+                totals[event["name"]] = totals.get(event["name"], 0.0) + event["dur"] / 1e6
+        return list(totals.items())
+
+    def export_chrome_trace(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self.lock:
+            events = list(self.events)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+def set_tracer(tracer):
+    """Make tracer the target of span(); pass None to disable tracing"""
+    global _active_tracer
+    _active_tracer = tracer
+
+
+def get_tracer():
+    return _active_tracer
+
+
+@contextmanager
+def span(name, category="install", **args):
+    tracer = _active_tracer
+    if tracer is None:
+        yield
+        return
+    with tracer.span(name, category, **args):
+        yield
+
+
+def format_summary(rows):
+    """Plain-text table of (name, seconds) rows with a total line"""
+    width = max([len(name) for name, _ in rows] + [5])
+    lines = [f"{name.ljust(width)}  {seconds:8.2f}s" for name, seconds in rows]
+    lines.append(f"{'Total'.ljust(width)}  {sum(seconds for _, seconds in rows):8.2f}s")
+    return "\n".join(lines)
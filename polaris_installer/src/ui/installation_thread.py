@@ -0,0 +1,35 @@
+# src/ui/installation_thread.py
+from PySide6.QtCore import QThread, Signal
+
+from src.installation import InstallationPipeline
+
+
+class InstallationProcess(QThread):
+    """Runs the Qt-free installation pipeline on a worker thread and relays it as signals"""
+    progress_updated = Signal(int)
+    log_message = Signal(str)
+    installation_complete = Signal()
+    timing_ready = Signal(list)
+
+    def __init__(self, settings=None):
+        super().__init__()
+        self.pipeline = InstallationPipeline(
+            settings,
+            log=self.log_message.emit,
+            progress=self.progress_updated.emit,
+            complete=self.installation_complete.emit,
+            timings=self.timing_ready.emit,
+        )
+        self.settings = self.pipeline.settings
+        self.install_dir = self.pipeline.install_dir
+
+    @property
+    def abort(self):
+        return self.pipeline.abort
+
+    @abort.setter
+    def abort(self, value):
+        self.pipeline.abort = value
+
+    def run(self):
+        self.pipeline.run()
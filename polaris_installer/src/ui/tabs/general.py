@@ -1,10 +1,20 @@
 # src/ui/tabs/general.py
 import os
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QThread, Signal
 from PySide6.QtGui import QPixmap
 from PySide6.QtWidgets import QHBoxLayout, QLabel, QVBoxLayout, QWidget
 
+from src.utils import check_requirements
+
+
+class RequirementsWorker(QThread):
+    """Runs the requirement checks off the UI thread"""
+    results_ready = Signal(list)
+
+    def run(self):
+        self.results_ready.emit(check_requirements())
+
 
 class GeneralTab(QWidget):
     def __init__(self):
@@ -76,5 +86,28 @@ class GeneralTab(QWidget):
         
         self.layout.addLayout(info_layout)
         
+        # System requirements, filled in once the background check finishes
+        requirements_title = QLabel("System Requirements")
+        requirements_title.setStyleSheet("font-weight: bold; font-size: 12px; margin-top: 10px;")
+        self.layout.addWidget(requirements_title)
+        
+        self.requirements_layout = QVBoxLayout()
+        self.requirements_status = QLabel("Checking...")
+        self.requirements_status.setStyleSheet("color: #4B5563; font-size: 12px;")
+        self.requirements_layout.addWidget(self.requirements_status)
+        self.layout.addLayout(self.requirements_layout)
+        
         # Ensure the layout expands properly
-        self.layout.addStretch()
\ No newline at end of file
+        self.layout.addStretch()
+        
+        self.requirements_worker = RequirementsWorker()
+        self.requirements_worker.results_ready.connect(self.show_requirements)
+        self.requirements_worker.start()
+    
+    def show_requirements(self, requirements):
+        """Display the results of the requirement checks"""
+        self.requirements_status.hide()
+        for name, ok in requirements:
+            label = QLabel(f"{'✓' if ok else '✗'}  {name}")
+            label.setStyleSheet(f"color: {'#047857' if ok else '#B91C1C'}; font-size: 12px;")
+            self.requirements_layout.addWidget(label)
\ No newline at end of file
@@ -1,6 +1,7 @@
 # src/ui/tabs/installer.py
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                              QPushButton, QProgressBar, QTextEdit, QFrame)
+                              QPushButton, QProgressBar, QTextEdit, QFrame,
+                              QTableWidget, QTableWidgetItem, QHeaderView)
 from PySide6.QtCore import Qt, QTimer, Signal, Slot
 from PySide6.QtGui import QColor, QTextCursor
 
@@ -8,7 +9,7 @@ import os
 import subprocess
 import sys
 
-from src.installation import InstallationProcess
+from src.ui.installation_thread import InstallationProcess
 
 class InstallerTab(QWidget):
     # Signal to request starting installation
@@ -97,6 +98,21 @@ class InstallerTab(QWidget):
         self.logs_text.setText("Installation logs will appear here when you start the installation process.")
         self.layout.addWidget(self.logs_text)
         
+        # Phase timings, filled in when an installation finishes
+        self.timings_label = QLabel("Installation Timings")
+        self.timings_label.setStyleSheet("font-weight: bold; font-size: 12px; margin-top: 10px;")
+        self.timings_label.setVisible(False)
+        self.layout.addWidget(self.timings_label)
+        
+        self.timings_table = QTableWidget(0, 2)
+        self.timings_table.setHorizontalHeaderLabels(["Phase", "Seconds"])
+        self.timings_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.timings_table.verticalHeader().setVisible(False)
+        self.timings_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.timings_table.setMaximumHeight(160)
+        self.timings_table.setVisible(False)
+        self.layout.addWidget(self.timings_table)
+        
         # Ensure the layout expands properly
         self.layout.addStretch()
         
@@ -135,8 +151,10 @@ class InstallerTab(QWidget):
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
         
-        # Clear logs
+        # Clear logs and previous timings
         self.logs_text.clear()
+        self.timings_label.setVisible(False)
+        self.timings_table.setVisible(False)
         
         # Update status message
         self.status_message.setText("Installing Polaris components...")
@@ -151,6 +169,7 @@ class InstallerTab(QWidget):
         self.installation.progress_updated.connect(self.update_progress)
         self.installation.log_message.connect(self.add_log_message)
         self.installation.installation_complete.connect(self.installation_completed)
+        self.installation.timing_ready.connect(self.show_timings)
         self.installation.finished.connect(self.installation_finished)
         
         # Start the installation process
@@ -170,6 +189,18 @@ class InstallerTab(QWidget):
         cursor.movePosition(QTextCursor.End)
         self.logs_text.setTextCursor(cursor)
     
+    @Slot(list)
+    def show_timings(self, rows):
+        """Show how long each installation phase took"""
+        self.timings_table.setRowCount(len(rows) + 1)
+        for row, (name, seconds) in enumerate(rows):
+            self.timings_table.setItem(row, 0, QTableWidgetItem(name))
+            self.timings_table.setItem(row, 1, QTableWidgetItem(f"{seconds:.2f}"))
+        self.timings_table.setItem(len(rows), 0, QTableWidgetItem("Total"))
+        self.timings_table.setItem(len(rows), 1, QTableWidgetItem(f"{sum(s for _, s in rows):.2f}"))
+        self.timings_label.setVisible(True)
+        self.timings_table.setVisible(True)
+    
     @Slot()
     def installation_completed(self):
         """Handle installation completion"""
@@ -2,10 +2,19 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QLineEdit, QPushButton, QComboBox, QCheckBox,
                              QFileDialog)
-from PySide6.QtCore import Signal
+from PySide6.QtCore import QThread, Signal
 import sys
 import os
-import subprocess
+
+from src.interpreters import discover_interpreters
+
+
+class InterpreterDiscoveryWorker(QThread):
+    """Scans for Python interpreters off the UI thread"""
+    interpreter_found = Signal(str, str)
+
+    def run(self):
+        discover_interpreters(on_found=self.interpreter_found.emit)
 
 class SettingsTab(QWidget):
     # Signals to update installation settings
@@ -119,73 +128,16 @@ class SettingsTab(QWidget):
         py_version = f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
         self.python_combo.addItem(f"Use System Python ({py_version})", "system")
         
-        # Try to find other Python versions (this is platform-specific)
-        try:
-            if os.name == "nt":  # Windows
-                # Check common Python installation locations
-                for version in ["3.7", "3.8", "3.9", "3.10", "3.11", "3.12"]:
-                    for path in [
-                        f"C:\\Python{version.replace('.', '')}\\python.exe",
-                        f"C:\\Program Files\\Python{version.replace('.', '')}\\python.exe",
-                        f"C:\\Users\\{os.getenv('USERNAME')}\\AppData\\Local\\Programs\\Python\\Python{version.replace('.', '')}\\python.exe"
-                    ]:
-                        if os.path.exists(path):
-                            # Get exact version
-                            try:
-                                result = subprocess.run(
-                                    [path, "--version"], 
-                                    capture_output=True, 
-                                    text=True,
-                                    timeout=1
-                                )
-                                if result.stdout:
-                                    version_text = result.stdout.strip()
-                                else:
-                                    version_text = result.stderr.strip()
-                                
-                                if version_text.startswith("Python "):
-                                    exact_version = version_text.split(" ")[1]
-                                    self.python_combo.addItem(f"Python {exact_version} ({path})", path)
-                            except:
-                                # If error, just add with the expected version
-                                self.python_combo.addItem(f"Python {version} ({path})", path)
-            else:  # Unix/Linux/macOS
-                # Check common Python installation locations
-                for version in ["python3.7", "python3.8", "python3.9", "python3.10", "python3.11", "python3.12"]:
-                    try:
-                        # Check if this Python version exists in PATH
-                        result = subprocess.run(
-                            ["which", version], 
-                            capture_output=True, 
-                            text=True,
-                            timeout=1
-                        )
-                        if result.returncode == 0 and result.stdout.strip():
-                            path = result.stdout.strip()
-                            # Get exact version
-                            try:
-                                version_result = subprocess.run(
-                                    [path, "--version"], 
-                                    capture_output=True, 
-                                    text=True,
-                                    timeout=1
-                                )
-                                if version_result.stdout:
-                                    version_text = version_result.stdout.strip()
-                                else:
-                                    version_text = version_result.stderr.strip()
-                                
-                                if version_text.startswith("Python "):
-                                    exact_version = version_text.split(" ")[1]
-                                    self.python_combo.addItem(f"Python {exact_version} ({path})", path)
-                            except:
-                                # If error, just add with the expected version
-                                self.python_combo.addItem(f"{version} ({path})", path)
-                    except:
-                        pass
-        except:
-            # If anything fails, at least we have the system Python option
-            pass
-        
         # Add option to create a new environment
-        self.python_combo.addItem("Create New Environment", "new")
\ No newline at end of file
+        self.python_combo.addItem("Create New Environment", "new")
+        
+        # Other interpreters are inserted as the background scan finds them
+        self.discovery_worker = InterpreterDiscoveryWorker()
+        self.discovery_worker.interpreter_found.connect(self.add_python_version)
+        self.discovery_worker.start()
+    
+    def add_python_version(self, version, path):
+        """Insert a discovered interpreter above the "Create New Environment" option"""
+        if self.python_combo.findData(path) != -1:
+            return
+        self.python_combo.insertItem(self.python_combo.count() - 1, f"Python {version} ({path})", path)
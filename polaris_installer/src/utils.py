@@ -2,11 +2,14 @@
 """
 Utility functions for Polaris Installer
 """
+import json
 import logging
 import os
 import platform
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Configure logging
@@ -20,6 +23,18 @@ logging.basicConfig(
 
 logger = logging.getLogger("polaris_installer")
 
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".polaris", "cache")
+PREFLIGHT_TIMEOUT = 10
+
+# Subprocess probes whose result only depends on the interpreter
+PREFLIGHT_PROBES = {
+    "pip": [sys.executable, "-m", "pip", "--version"],
+    "venv": [sys.executable, "-m", "venv", "--help"],
+}
+
+_preflight_cache = {}
+_last_check_timings = {}
+
 def get_platform_info():
     """
     Get information about the current platform
@@ -66,7 +81,7 @@ def check_disk_space(path, required_mb=500):
         logger.error(f"Error checking disk space: {e}")
         return False, 0
 
-def run_command(command, cwd=None, shell=False):
+def run_command(command, cwd=None, shell=False, timeout=None):
     """
     Run a command and return the output
     """
@@ -77,14 +92,89 @@ def run_command(command, cwd=None, shell=False):
             shell=shell,
             check=True,
             capture_output=True,
-            text=True
+            text=True,
+            timeout=timeout
         )
         return True, result.stdout
     except subprocess.CalledProcessError as e:
         return False, e.stderr
+    except subprocess.TimeoutExpired:
+        return False, f"Timed out after {timeout}s"
     except Exception as e:
         return False, str(e)
 
+def load_json_cache(name):
+    """
+    Load a JSON cache file from the Polaris cache directory
+    """
+    try:
+        with open(os.path.join(CACHE_DIR, f"{name}.json"), "r") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def save_json_cache(name, data):
+    """
+    Atomically write a JSON cache file to the Polaris cache directory
+    """
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        path = os.path.join(CACHE_DIR, f"{name}.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(data, f)
+        os.replace(path + ".tmp", path)
+    except OSError as e:
+        logger.warning(f"Failed to write cache {name}: {e}")
+
+def interpreter_key(python=sys.executable):
+    """
+    Cache key for results that only change when the interpreter changes
+    """
+    real_path = os.path.realpath(python)
+    return f"{real_path}:{os.stat(real_path).st_mtime_ns}"
+
+def run_preflight(timeout=PREFLIGHT_TIMEOUT, refresh=False):
+    """
+    Run the interpreter probes concurrently, each with its own timeout.
+    Results are cached in memory and on disk per interpreter path and mtime.
+    Returns {name: {"ok": bool, "seconds": float, "cached": bool}}
+    """
+    key = interpreter_key()
+    if not refresh and key in _preflight_cache:
+        return {name: dict(result, cached=True) for name, result in _preflight_cache[key].items()}
+
+    disk_cache = load_json_cache("preflight")
+    if not refresh and key in disk_cache:
+        _preflight_cache[key] = disk_cache[key]
+        return {name: dict(result, cached=True) for name, result in disk_cache[key].items()}
+
+    def probe(command):
+        started = time.perf_counter()
+        ok, _ = run_command(command, timeout=timeout)
+        return {"ok": ok, "seconds": time.perf_counter() - started}
+
+    with ThreadPoolExecutor(max_workers=len(PREFLIGHT_PROBES)) as pool:
+        futures = {name: pool.submit(probe, command) for name, command in PREFLIGHT_PROBES.items()}
+        results = {name: future.result() for name, future in futures.items()}
+
+    # Timed-out or failed probes are retried next time instead of being cached
+    if all(result["ok"] for result in results.values()):
+        _preflight_cache[key] = results
+        # Re-read so entries other interpreters wrote meanwhile are kept; older
+        # entries for this interpreter path are dropped since its mtime changed
+        path = key.rsplit(":", 1)[0]
+        disk_cache = {other: entry for other, entry in load_json_cache("preflight").items()
+                      if other.rsplit(":", 1)[0] != path}
+        disk_cache[key] = results
+        save_json_cache("preflight", disk_cache)
+    return {name: dict(result, cached=False) for name, result in results.items()}
+
+def get_requirement_timings():
+    """
+    Seconds spent on each check during the last check_requirements call
+    """
+    return dict(_last_check_timings)
+
 def create_directory(path):
     """
     Create a directory and all parent directories if they don't exist
@@ -102,21 +192,27 @@ def check_requirements():
     Check if the system meets all requirements for installation
     """
     requirements = []
+    timings = {}
     
     # Check Python version
+    started = time.perf_counter()
     python_ok = check_python_version()
     requirements.append(("Python 3.7+", python_ok))
+    timings["python"] = time.perf_counter() - started
     
     # Check disk space
+    started = time.perf_counter()
     space_ok, free_mb = check_disk_space(os.path.expanduser("~"))
     requirements.append((f"Disk Space (>500MB, {free_mb:.1f}MB available)", space_ok))
+    timings["disk"] = time.perf_counter() - started
     
-    # Check if PIP is available
-    pip_ok, _ = run_command([sys.executable, "-m", "pip", "--version"])
-    requirements.append(("PIP Package Manager", pip_ok))
-    
-    # Check if we can create virtual environments
-    venv_ok, _ = run_command([sys.executable, "-m", "venv", "--help"])
-    requirements.append(("Virtual Environment Support", venv_ok))
+    # Check if PIP is available and if we can create virtual environments
+    preflight = run_preflight()
+    requirements.append(("PIP Package Manager", preflight["pip"]["ok"]))
+    requirements.append(("Virtual Environment Support", preflight["venv"]["ok"]))
+    for name, result in preflight.items():
+        timings[name] = 0.0 if result["cached"] else result["seconds"]
     
+    _last_check_timings.clear()
+    _last_check_timings.update(timings)
     return requirements
\ No newline at end of file
@@ -0,0 +1,125 @@
+# src/venv_template.py
+"""
+Prebuilt virtual environment templates for Polaris Installer
+
+A golden venv with up-to-date base packages is built once per interpreter
+and cloned into each installation, with absolute paths in scripts and
+pyvenv.cfg rewritten to the new location.
+"""
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from src.timing import span
+from src.utils import logger
+
+DEFAULT_TEMPLATE_DIR = os.path.join(os.path.expanduser("~"), ".polaris", "venv-templates")
+BASE_PACKAGES = ["pip", "wheel", "setuptools"]
+TEMPLATE_MAX_AGE = 30 * 24 * 3600
+MARKER_NAME = "polaris_template.json"
+# Left in venvs cloned from a template; their base packages are already current
+CLONE_MARKER_NAME = "polaris_template_clone"
+
+
+def _interpreter_identity(python):
+    real_path = os.path.realpath(python)
+    stat = os.stat(real_path)
+    return {"python": real_path, "size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def template_path(root, python=sys.executable):
+    """Location of the template for an interpreter"""
+    real_path = os.path.realpath(python)
+    digest = hashlib.sha256(real_path.encode()).hexdigest()[:12]
+    return os.path.join(os.path.expanduser(root), f"{os.path.basename(real_path)}-{digest}")
+
+
+def _read_marker(path):
+    try:
+        with open(os.path.join(path, MARKER_NAME), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def ensure_template(root=DEFAULT_TEMPLATE_DIR, python=sys.executable, log=None, max_age=TEMPLATE_MAX_AGE):
+    """
+    Return the path of an up-to-date template for the interpreter, building
+    it first if needed. Returns None where cloning is not supported (Windows
+    script launchers embed their interpreter path in the executable).
+    """
+    if os.name == "nt":
+        return None
+    log = log or logger.info
+
+    path = template_path(root, python)
+    identity = _interpreter_identity(python)
+    marker = _read_marker(path)
+    if marker and marker["identity"] == identity and time.time() - marker["built_at"] < max_age:
+        return path
+
+    log("[INFO] Building virtual environment template (one-time)...")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    build_dir = tempfile.mkdtemp(prefix=".build-", dir=os.path.dirname(path))
+    try:
+        with span("python -m venv (template)", "subprocess"):
+            subprocess.run([python, "-m", "venv", build_dir], check=True, capture_output=True)
+        with span("pip upgrade base packages (template)", "subprocess"):
+            subprocess.run([os.path.join(build_dir, "bin", "python"), "-m", "pip", "install", "--upgrade",
+                            "--disable-pip-version-check"] + BASE_PACKAGES, check=True, capture_output=True)
+        with open(os.path.join(build_dir, MARKER_NAME), "w") as f:
+            json.dump({"identity": identity, "built_at": time.time(), "origin": build_dir}, f)
+
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        try:
+            os.rename(build_dir, path)
+        except OSError:
+            # Another installer finished its template first
+            if not _read_marker(path):
+                raise
+    finally:
+        shutil.rmtree(build_dir, ignore_errors=True)
+
+    log(f"[INFO] Virtual environment template ready at {path}")
+    return path
+
+
+def is_template_clone(venv_path):
+    """True when venv_path was cloned from a template"""
+    return os.path.exists(os.path.join(venv_path, CLONE_MARKER_NAME))
+
+
+def clone_venv(template, target, log=None):
+    """Copy a template venv to target and relocate its absolute paths"""
+    log = log or logger.info
+    origin = _read_marker(template)["origin"].encode()
+    with span("clone venv template", "io"):
+        shutil.copytree(template, target, symlinks=True)
+    os.unlink(os.path.join(target, MARKER_NAME))
+    with open(os.path.join(target, CLONE_MARKER_NAME), "w") as f:
+        f.write(template)
+
+    relocated = 0
+    candidates = [os.path.join(target, "pyvenv.cfg")]
+    bin_dir = os.path.join(target, "bin")
+    candidates += [os.path.join(bin_dir, name) for name in os.listdir(bin_dir)]
+    for path in candidates:
+        if os.path.islink(path) or not os.path.isfile(path):
+            continue
+        with open(path, "rb") as f:
+            content = f.read()
+        if origin not in content or b"\0" in content[:1024]:
+            continue
+        mode = os.stat(path).st_mode
+        with open(path, "wb") as f:
+            f.write(content.replace(origin, os.path.abspath(target).encode()))
+        os.chmod(path, mode)
+        relocated += 1
+
+    log(f"[INFO] Cloned virtual environment template ({relocated} files relocated)")
@@ -0,0 +1,133 @@
+# src/wheelhouse.py
+"""
+Persistent, content-addressed wheel cache for Polaris Installer
+
+Artifacts are stored once per sha256 under blobs/, and every resolved
+requirement set is recorded per platform tag so a repeat install can run
+without touching the network. The cache is bounded by size and evicts the
+least recently used artifacts first.
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+import sysconfig
+import time
+
+from src.utils import logger
+
+DEFAULT_WHEELHOUSE_DIR = os.path.join(os.path.expanduser("~"), ".polaris", "wheelhouse")
+DEFAULT_MAX_BYTES = 4 * 1024 ** 3
+ENTRY_MAX_AGE = 7 * 24 * 3600
+
+
+def platform_tag():
+    """
+    Platform tag of the interpreter the installer runs under. The virtual
+    environment is created from the same interpreter, so its wheels match.
+    """
+    return f"cp{sys.version_info.major}{sys.version_info.minor}-{sysconfig.get_platform()}"
+
+
+class Wheelhouse:
+    def __init__(self, root=DEFAULT_WHEELHOUSE_DIR, max_bytes=DEFAULT_MAX_BYTES,
+                 entry_max_age=ENTRY_MAX_AGE):
+        self.root = os.path.expanduser(root)
+        self.max_bytes = max_bytes
+        self.entry_max_age = entry_max_age
+        self.index_path = os.path.join(self.root, "index.json")
+        os.makedirs(os.path.join(self.root, "blobs"), exist_ok=True)
+        self.index = self._load_index()
+
+    @staticmethod
+    def key(requirements, tag=None):
+        """Cache key for a requirement set on a platform"""
+        normalized = sorted(r.strip().lower().replace("_", "-") for r in requirements)
+        return f"{tag or platform_tag()}:" + hashlib.sha256("\n".join(normalized).encode()).hexdigest()[:16]
+
+    def lookup(self, key):
+        """
+        Return local artifact paths for a cached requirement set, or None if
+        the set was never resolved, has expired or lost an artifact to eviction.
+        """
+        entry = self.index["entries"].get(key)
+        if not entry or time.time() - entry["resolved_at"] > self.entry_max_age:
+            return None
+
+        files = []
+        for artifact in entry["artifacts"]:
+            path = self.blob_path(artifact["sha256"], artifact["filename"])
+            if not os.path.exists(path):
+                return None
+            files.append(path)
+
+        now = time.time()
+        entry["last_used"] = now
+        for artifact in entry["artifacts"]:
+            self.index["blobs"][artifact["sha256"]]["last_used"] = now
+        self._save_index()
+        return files
+
+    def blob_path(self, sha256, filename):
+        return os.path.join(self.root, "blobs", sha256[:2], sha256, filename)
+
+    def has_blob(self, sha256, filename):
+        return sha256 in self.index["blobs"] and os.path.exists(self.blob_path(sha256, filename))
+
+    def add_blob(self, sha256, path):
+        """Register an artifact that was written to its blob path"""
+        self.index["blobs"][sha256] = {
+            "filename": os.path.basename(path),
+            "size": os.path.getsize(path),
+            "last_used": time.time(),
+        }
+
+    def record(self, key, plan):
+        """Remember which artifacts a requirement set resolved to"""
+        now = time.time()
+        self.index["entries"][key] = {
+            "resolved_at": now,
+            "last_used": now,
+            "artifacts": [{"sha256": e["sha256"], "filename": e["filename"]} for e in plan],
+        }
+        self.evict()
+        self._save_index()
+
+    def size(self):
+        return sum(blob["size"] for blob in self.index["blobs"].values())
+
+    def evict(self):
+        """Drop least recently used artifacts until the cache fits in max_bytes"""
+        total = self.size()
+        if total <= self.max_bytes:
+            return
+
+        evicted = set()
+        for sha256, blob in sorted(self.index["blobs"].items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(os.path.dirname(self.blob_path(sha256, blob["filename"])), ignore_errors=True)
+            total -= blob["size"]
+            evicted.add(sha256)
+
+        for sha256 in evicted:
+            del self.index["blobs"][sha256]
+        self.index["entries"] = {
+            key: entry for key, entry in self.index["entries"].items()
+            if not any(a["sha256"] in evicted for a in entry["artifacts"])
+        }
+        logger.info(f"Evicted {len(evicted)} artifacts from wheelhouse")
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"entries": {}, "blobs": {}}
+
+    def _save_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.index_path)